@@ -0,0 +1,345 @@
+"""Local stand-in for the nmrXiv API, for offline benchmarks.
+
+Replays the response bodies in benchmarks/fixtures/ and serves synthetic
+ZIP archives, with configurable latency, bandwidth and catalog size:
+
+- GET  /api/v1/list/projects?page=N, /api/v1/list/datasets?page=N,
+  /api/v1/list/studies
+- POST /api/v1/search?page=N, /api/v1/search/{smiles}?page=N
+- GET  /api/v1/{id} (e.g. P5), with a download_url into /files/; datasets
+  (D{n}) have none, like on nmrXiv, and name experiment directory n of
+  their parent project's archive
+- GET/HEAD /files/{name}.zip, with ETag and byte-range support
+
+Listing pages are built from the recorded items: page N repeats them with
+fresh ids and identifiers, so any number of pages can be served.
+
+    python benchmarks/mock_server.py --port 8765 --latency 0.05 --bandwidth 20M
+    NMRXIV_API_URL=http://127.0.0.1:8765/api/v1 nmrxiv list --all --type dataset
+
+    # Refresh the fixtures from the live API
+    python benchmarks/mock_server.py record
+"""
+
+import argparse
+import io
+import json
+import random
+import re
+import threading
+import time
+import zipfile
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+# Body chunk size for throttled writes
+_CHUNK = 64 * 1024
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte count such as '500k' or '10M' (binary units)."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([kmg]?)", value.strip().lower())
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid size: {value!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+def load_fixture(name: str) -> dict:
+    """Recorded response body from benchmarks/fixtures/<name>.json."""
+    return json.loads((FIXTURES / f"{name}.json").read_text())
+
+
+def synthetic_zip(size: int, seed: int = 0) -> bytes:
+    """A Bruker-like project archive of roughly size bytes.
+
+    Each experiment directory holds a text acqus file and an incompressible
+    binary fid, so both inflate paths and plain copies get exercised.
+    """
+    rng = random.Random(seed)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        experiment = 0
+        while buffer.tell() < size:
+            experiment += 1
+            base = f"project/sample/{experiment}"
+            acqus = "".join(f"##$PARAM{i}= {rng.random():.6f}\n" for i in range(400))
+            zf.writestr(f"{base}/acqus", acqus)
+            fid_size = min(256 * 1024, max(1024, size - buffer.tell()))
+            zf.writestr(f"{base}/fid", rng.randbytes(fid_size))
+            zf.writestr(f"{base}/pdata/1/procs", acqus[:4000])
+    return buffer.getvalue()
+
+
+class MockNmrXiv:
+    """Threaded mock server; use as a context manager or call start()/stop().
+
+    Attributes:
+        latency: Seconds to wait before answering each request
+        bandwidth: Bytes per second per response body (None: unlimited)
+        pages: Number of listing and search pages
+        per_page: Items per listing page (search pages hold 24)
+        zip_size: Size in bytes of the archive behind every download_url
+        requests: Requests served so far
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        bandwidth: int | None = None,
+        pages: int = 10,
+        per_page: int = 100,
+        zip_size: int = 8 * 1024**2,
+    ):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.pages = pages
+        self.per_page = per_page
+        self.zip_size = zip_size
+        self.requests = 0
+        self._fixtures = {
+            name: load_fixture(name) for name in ("projects", "datasets", "search", "item")
+        }
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the mock API (use as NMRXIV_API_URL)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    @property
+    def files_url(self) -> str:
+        """Base URL of the archive downloads."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/files"
+
+    def start(self) -> "MockNmrXiv":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockNmrXiv":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @lru_cache(maxsize=256)
+    def listing(self, kind: str, page: int) -> bytes:
+        """Body of one /list/{kind} page, built from the recorded items."""
+        fixture = self._fixtures[kind]
+        templates = fixture["data"]
+        prefix = "P" if kind == "projects" else "D"
+        items = []
+        if 1 <= page <= self.pages:
+            for i in range(self.per_page):
+                item_id = (page - 1) * self.per_page + i + 1
+                item = dict(templates[i % len(templates)], id=item_id)
+                item["identifier"] = f"NMRXIV:{prefix}{item_id}"
+                items.append(item)
+        meta = {
+            "current_page": page,
+            "last_page": self.pages,
+            "per_page": self.per_page,
+            "total": self.pages * self.per_page,
+        }
+        return json.dumps({"data": items, "links": fixture.get("links"), "meta": meta}).encode()
+
+    @lru_cache(maxsize=256)
+    def search(self, page: int) -> bytes:
+        """Body of one /search page; every tenth hit repeats one from the page before."""
+        templates = self._fixtures["search"]["data"]
+        items = []
+        if 1 <= page <= self.pages:
+            for i in range(24):
+                n = (page - 1) * 24 + i + 1
+                if i % 10 == 0 and page > 1:
+                    n -= 24
+                item = dict(templates[i % len(templates)], id=n, identifier=n)
+                item["inchi_key"] = item["standard_inchi_key"] = f"KEY{n:010d}-UHFFFAOYSA-N"
+                items.append(item)
+        body = {
+            "data": items,
+            "current_page": page,
+            "last_page": self.pages,
+            "per_page": 24,
+            "total": self.pages * 24,
+        }
+        return json.dumps(body).encode()
+
+    def item(self, item_id: str) -> bytes:
+        """Body of /{id}: the recorded item, renamed, with a local download URL."""
+        if item_id.startswith("D"):
+            return self.dataset(item_id)
+        data = dict(self._fixtures["item"]["data"])
+        data["identifier"] = f"NMRXIV:{item_id}"
+        data["download_url"] = f"{self.files_url}/{item_id}.zip"
+        return json.dumps({"data": data}).encode()
+
+    def dataset(self, item_id: str) -> bytes:
+        """Body of /D{n}: a recorded dataset naming experiment n of project P1's archive."""
+        data = dict(self._fixtures["datasets"]["data"][0])
+        data.update(id=int(item_id[1:]), identifier=f"NMRXIV:{item_id}", name=item_id[1:])
+        data.pop("slug", None)
+        data["project"] = {
+            "name": "Synthetic project",
+            "identifier": "NMRXIV:P1",
+            "public_url": f"{self.url.rsplit('/api/', 1)[0]}/project/P1",
+        }
+        data["study"] = {"name": "sample"}
+        return json.dumps({"data": data}).encode()
+
+    @lru_cache(maxsize=4)
+    def archive(self, size: int) -> bytes:
+        """The synthetic archive served for every download."""
+        return synthetic_zip(size)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this, Nagle's
+            # algorithm and delayed ACKs stall every small response by ~40 ms
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _begin(self) -> tuple[str, dict]:
+                with mock._lock:
+                    mock.requests += 1
+                if mock.latency:
+                    time.sleep(mock.latency)
+                url = urlparse(self.path)
+                return url.path, parse_qs(url.query)
+
+            def _send(self, status: int, body: bytes, headers: dict | None = None,
+                      head: bool = False) -> None:
+                self.send_response(status)
+                for key, value in {"Content-Type": "application/json", **(headers or {})}.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if head:
+                    return
+                if not mock.bandwidth:
+                    self.wfile.write(body)
+                    return
+                start = time.perf_counter()
+                for offset in range(0, len(body), _CHUNK):
+                    self.wfile.write(body[offset:offset + _CHUNK])
+                    ahead = (offset + _CHUNK) / mock.bandwidth - (time.perf_counter() - start)
+                    if ahead > 0:
+                        time.sleep(ahead)
+
+            def do_POST(self) -> None:
+                path, query = self._begin()
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if not path.startswith("/api/v1/search"):
+                    return self._send(404, b'{"message": "not found"}')
+                self._send(200, mock.search(int(query.get("page", ["1"])[0])))
+
+            def do_HEAD(self) -> None:
+                self.do_GET(head=True)
+
+            def do_GET(self, head: bool = False) -> None:
+                path, query = self._begin()
+                page = int(query.get("page", ["1"])[0])
+                if path in ("/api/v1/list/projects", "/api/v1/list/datasets"):
+                    return self._send(200, mock.listing(path.rsplit("/", 1)[1], page), head=head)
+                if path == "/api/v1/list/studies":
+                    return self._send(200, b'{"data": []}', head=head)
+                if path.startswith("/files/"):
+                    return self._file(head)
+                match = re.fullmatch(r"/api/v1/([A-Z]\d+)", path)
+                if match:
+                    return self._send(200, mock.item(match.group(1)), head=head)
+                self._send(404, b'{"message": "not found"}', head=head)
+
+            def _file(self, head: bool) -> None:
+                data = mock.archive(mock.zip_size)
+                etag = f'"zip-{mock.zip_size}"'
+                headers = {
+                    "Content-Type": "application/zip",
+                    "Accept-Ranges": "bytes",
+                    "ETag": etag,
+                }
+                match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+                if_range = self.headers.get("If-Range")
+                if match and (if_range is None or if_range == etag):
+                    start = int(match.group(1))
+                    end = min(int(match.group(2) or len(data) - 1), len(data) - 1)
+                    if start >= len(data):
+                        headers["Content-Range"] = f"bytes */{len(data)}"
+                        return self._send(416, b"", headers, head)
+                    headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+                    return self._send(206, data[start:end + 1], headers, head)
+                self._send(200, data, headers, head)
+
+        return Handler
+
+
+def record(base_url: str) -> None:
+    """Overwrite the fixtures with the first page of each live endpoint."""
+    import httpx
+
+    with httpx.Client(base_url=base_url, timeout=60, headers={"Accept": "application/json"}) as client:
+        responses = {
+            "projects": client.get("/list/projects?page=1"),
+            "datasets": client.get("/list/datasets?page=1"),
+            "search": client.post("/search?page=1", json={"query": "kaempferol"}),
+            "item": client.get("/P5"),
+        }
+        for name, response in responses.items():
+            response.raise_for_status()
+            (FIXTURES / f"{name}.json").write_text(json.dumps(response.json(), indent=2) + "\n")
+            print(f"recorded {name}.json")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local mock nmrXiv API")
+    parser.add_argument("mode", nargs="?", choices=["serve", "record"], default="serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    parser.add_argument("--bandwidth", type=parse_size, help="Per-response limit, e.g. 20M")
+    parser.add_argument("--pages", type=int, default=10, help="Listing and search pages")
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--zip-size", type=parse_size, default="8M", help="Archive size")
+    parser.add_argument("--api-url", default="https://nmrxiv.org/api/v1", help="For record")
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        record(args.api_url)
+        return
+
+    mock = MockNmrXiv(
+        args.host, args.port, args.latency, args.bandwidth, args.pages, args.per_page, args.zip_size
+    )
+    print(json.dumps({"api_url": mock.url, "files_url": mock.files_url}), flush=True)
+    try:
+        mock._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""Offline benchmark suite, run against the local mock server.
+
+Measures the hot paths of the client without touching nmrxiv.org:
+
+- pagination: listing every dataset page, sequentially and concurrently
+- parse: building Project, Dataset and Molecule pages (models and records)
+  from response bodies
+- download: MB/s of a large archive, single-stream and segmented
+- extract: unpacking that archive
+
+Each case runs --repeat times and the median is reported, together with
+the git commit and Python version, as JSON that can be saved and compared
+across commits:
+
+    python benchmarks/run.py --output before.json
+    git checkout my-branch
+    python benchmarks/run.py --compare before.json
+
+Latency and bandwidth of the mock can be set to mimic a real connection.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mock_server import MockNmrXiv, load_fixture, parse_size  # noqa: E402
+
+# Metric suffixes where larger is better; for all others lower is better
+_HIGHER_IS_BETTER = ("per_s", "mb_s")
+
+
+def _median(fn: Callable[[], dict], repeat: int) -> dict:
+    """Run fn repeat times and take the median of each metric it returns."""
+    runs = [fn() for _ in range(repeat)]
+    return {key: round(statistics.median(r[key] for r in runs), 4) for key in runs[0]}
+
+
+def bench_pagination(mock: MockNmrXiv, concurrency: int) -> Callable[[], dict]:
+    """Every dataset page, one by one (sync) and concurrently (async)."""
+    from nmrxiv_downloader.client import AsyncNmrXivClient, NmrXivClient
+
+    total = mock.pages * mock.per_page
+
+    def run() -> dict:
+        start = time.perf_counter()
+        with NmrXivClient() as client:
+            page, count = 1, 0
+            while True:
+                response = client.list_datasets(page=page)
+                count += len(response.items)
+                if page >= response.last_page:
+                    break
+                page += 1
+        sequential = time.perf_counter() - start
+
+        async def concurrent() -> int:
+            async with AsyncNmrXivClient(concurrency=concurrency) as client:
+                return sum([1 async for _ in client.iter_all_datasets()])
+
+        start = time.perf_counter()
+        count_async = asyncio.run(concurrent())
+        elapsed = time.perf_counter() - start
+        assert count == count_async == total, (count, count_async, total)
+        return {
+            "sequential_s": sequential,
+            "sequential_items_per_s": total / sequential,
+            "concurrent_s": elapsed,
+            "concurrent_items_per_s": total / elapsed,
+            "concurrent_pages_per_s": mock.pages / elapsed,
+        }
+
+    return run
+
+
+def bench_parse(items: int, loops: int = 20) -> Callable[[], dict]:
+    """Microseconds per item to turn decoded response bodies into models."""
+    from nmrxiv_downloader.client import _models, _molecule_page, _paginated
+
+    def body(name: str) -> dict:
+        fixture = load_fixture(name)
+        templates = fixture["data"]
+        return {**fixture, "data": [templates[i % len(templates)] for i in range(items)]}
+
+    models = _models()
+    cases = {
+        "project": lambda data: _paginated(data, models.Project, 1),
+        "dataset": lambda data: _paginated(data, models.Dataset, 1),
+        "molecule": lambda data: _molecule_page(data, 1),
+        "project_record": lambda data: _paginated(data, models.Project, 1, raw=True),
+        "dataset_record": lambda data: _paginated(data, models.Dataset, 1, raw=True),
+        "molecule_record": lambda data: _molecule_page(data, 1, raw=True),
+    }
+    bodies = {"project": body("projects"), "dataset": body("datasets"), "molecule": body("search")}
+    bodies.update({f"{name}_record": data for name, data in bodies.items()})
+
+    for name, parse in cases.items():
+        parse(bodies[name])  # Warm up (pydantic builds validators lazily)
+
+    def run() -> dict:
+        result = {}
+        for name, parse in cases.items():
+            start = time.perf_counter()
+            for _ in range(loops):
+                parse(bodies[name])
+            elapsed = time.perf_counter() - start
+            result[f"{name}_us_per_item"] = elapsed / (items * loops) * 1e6
+        return result
+
+    return run
+
+
+def bench_download(mock: MockNmrXiv, workdir: Path) -> Callable[[], dict]:
+    """Archive download throughput, single-stream and with four segments."""
+    from nmrxiv_downloader.client import NmrXivClient
+
+    url = f"{mock.files_url}/P1.zip"
+    size_mb = mock.zip_size / 1024**2
+    mock.archive(mock.zip_size)  # Build it before timing
+
+    def run() -> dict:
+        result = {}
+        with NmrXivClient() as client:
+            for segments in (1, 4):
+                dest = workdir / f"download-{segments}.zip"
+                dest.unlink(missing_ok=True)
+                start = time.perf_counter()
+                client.download_file(url, dest, resume=False, segments=segments)
+                elapsed = time.perf_counter() - start
+                result[f"segments_{segments}_mb_s"] = size_mb / elapsed
+        return result
+
+    return run
+
+
+def bench_extract(mock: MockNmrXiv, workdir: Path) -> Callable[[], dict]:
+    """Time to extract the synthetic archive."""
+    import shutil
+
+    from nmrxiv_downloader.extract import extract_archive
+
+    archive = workdir / "extract.zip"
+    archive.write_bytes(mock.archive(mock.zip_size))
+
+    def run() -> dict:
+        dest = workdir / "extracted"
+        shutil.rmtree(dest, ignore_errors=True)
+        start = time.perf_counter()
+        names = extract_archive(archive, dest)
+        elapsed = time.perf_counter() - start
+        return {"seconds": elapsed, "files_per_s": len(names) / elapsed}
+
+    return run
+
+
+def git_commit() -> str | None:
+    """Current commit (with '-dirty' for uncommitted changes), if in a git checkout."""
+    try:
+        commit = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit or None
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """Relative change of every metric against a saved report (+ is better)."""
+    changes = {}
+    for case, metrics in report["results"].items():
+        for key, value in metrics.items():
+            old = baseline.get("results", {}).get(case, {}).get(key)
+            if not old:
+                continue
+            change = (value - old) / old
+            if not key.endswith(_HIGHER_IS_BETTER):
+                change = -change
+            changes[f"{case}.{key}"] = round(change * 100, 1)
+    return changes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", default=["pagination", "parse", "download", "extract"])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (median is reported)")
+    parser.add_argument("--pages", type=int, default=20, help="Listing pages served by the mock")
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8, help="Pages in flight (async)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock seconds per request")
+    parser.add_argument("--bandwidth", type=parse_size, help="Mock bytes/s per response, e.g. 50M")
+    parser.add_argument("--zip-size", type=parse_size, default="32M", help="Archive size")
+    parser.add_argument("--output", type=Path, help="Also write the report to this file")
+    parser.add_argument("--compare", type=Path, help="Report to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="nmrxiv-bench-") as tmp, MockNmrXiv(
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        pages=args.pages,
+        per_page=args.per_page,
+        zip_size=args.zip_size,
+    ) as mock:
+        # Before the client is imported: it reads both at import time
+        os.environ["NMRXIV_API_URL"] = mock.url
+        os.environ["NMRXIV_CACHE_DIR"] = str(Path(tmp) / "cache")
+        workdir = Path(tmp)
+        benches = {
+            "pagination": lambda: bench_pagination(mock, args.concurrency),
+            "parse": lambda: bench_parse(args.per_page),
+            "download": lambda: bench_download(mock, workdir),
+            "extract": lambda: bench_extract(mock, workdir),
+        }
+        unknown = set(args.cases) - set(benches)
+        if unknown:
+            parser.error(f"Unknown case(s): {', '.join(sorted(unknown))}")
+        results = {case: _median(benches[case](), args.repeat) for case in args.cases}
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "repeat": args.repeat,
+            "pages": args.pages,
+            "per_page": args.per_page,
+            "concurrency": args.concurrency,
+            "latency": args.latency,
+            "bandwidth": args.bandwidth,
+            "zip_size": args.zip_size,
+        },
+        "results": results,
+    }
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        report["baseline"] = baseline.get("commit")
+        report["change_percent"] = compare(report, baseline)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
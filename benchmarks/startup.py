@@ -0,0 +1,123 @@
+"""Cold-start benchmark for the nmrxiv CLI, with a regression budget.
+
+Runs `nmrxiv --help` and `nmrxiv show P5 --json` as fresh processes (the
+latter against a local stub API, with the cache and daemon disabled) and
+reports median wall times as JSON. Exits 1 if a median exceeds its budget
+or if importing the CLI pulls in a heavy module that only commands need.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 20 --budget-help 0.25 --budget-show 0.45
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported just to load the CLI (and render --help)
+LAZY_MODULES = ("httpx", "pydantic", "sqlite3", "asyncio", "rich.progress", "zipfile")
+
+ITEM = {
+    "data": {
+        "name": "Benchmark project",
+        "identifier": "NMRXIV:P5",
+        "download_url": "http://127.0.0.1/files/P5.zip",
+    }
+}
+
+
+class _StubAPI(BaseHTTPRequestHandler):
+    """Answers every GET with the same item."""
+
+    def do_GET(self) -> None:
+        body = json.dumps(ITEM).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def time_command(args: list[str], env: dict[str, str], runs: int) -> list[float]:
+    """Wall times of running `python -m nmrxiv_downloader <args>` runs times."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "nmrxiv_downloader", *args],
+            env=env,
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def eager_imports(env: dict[str, str]) -> list[str]:
+    """Heavy modules loaded by merely importing the CLI."""
+    # Modules the interpreter itself already loaded (e.g. via .pth files) don't count
+    code = (
+        "import sys; before = set(sys.modules); import nmrxiv_downloader.cli; "
+        f"print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules and m not in before))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return out.stdout.split()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Runs per command")
+    parser.add_argument("--budget-help", type=float, default=0.30, help="Seconds, median")
+    parser.add_argument("--budget-show", type=float, default=0.50, help="Seconds, median")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])),
+        "NMRXIV_API_URL": f"http://127.0.0.1:{server.server_port}/api/v1",
+        "NMRXIV_CACHE": "0",
+        "NMRXIV_NO_DAEMON": "1",
+    }
+    try:
+        results = {
+            "help": time_command(["--help"], env, args.runs),
+            "show": time_command(["show", "P5", "--json"], env, args.runs),
+        }
+    finally:
+        server.shutdown()
+
+    budgets = {"help": args.budget_help, "show": args.budget_show}
+    report = {
+        name: {
+            "median": round(statistics.median(times), 4),
+            "min": round(min(times), 4),
+            "budget": budgets[name],
+        }
+        for name, times in results.items()
+    }
+    report["eager_imports"] = eager_imports(env)
+    over = [name for name in budgets if report[name]["median"] > budgets[name]]
+    report["status"] = "fail" if over or report["eager_imports"] else "ok"
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if report["status"] == "fail" else 0)
+
+
+if __name__ == "__main__":
+    main()
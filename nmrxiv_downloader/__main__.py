@@ -1,6 +1,6 @@
 """Entry point for python -m nmrxiv_downloader."""
 
-from nmrxiv_downloader.cli import app
+from nmrxiv_downloader.daemon import main
 
 if __name__ == "__main__":
-    app()
+    main()
@@ -0,0 +1,263 @@
+"""Persistent on-disk cache for nmrxiv API responses."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Time-to-live in seconds per endpoint, matched by path prefix (first match wins).
+DEFAULT_TTLS: list[tuple[str, int]] = [
+    ("/list/", 600),
+    ("/search", 3600),
+    ("/", 3600),
+]
+
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+# Seconds to wait for another process's write lock before giving up
+BUSY_TIMEOUT = 1.0
+
+# Cache hits whose access time is written back in one batch
+TOUCH_BATCH = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    path TEXT NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+def default_cache_dir() -> Path:
+    """Return the cache directory ($NMRXIV_CACHE_DIR, else XDG cache home)."""
+    if os.environ.get("NMRXIV_CACHE_DIR"):
+        return Path(os.environ["NMRXIV_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "nmrxiv"
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body with its validators."""
+
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry can be served without revalidation."""
+        return time.time() < self.expires_at
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """SQLite-backed response cache with per-endpoint TTLs and LRU eviction.
+
+    The database is shared by every nmrxiv process (WAL mode). The methods
+    used on the request path (get, put, refresh) never raise database
+    errors such as a lock held too long by another process: a failed
+    lookup is a miss, a failed write is skipped.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: list[tuple[str, int]] | None = None,
+    ):
+        """Open (or create) the cache database.
+
+        Args:
+            path: Database file (default: responses.sqlite3 in default_cache_dir())
+            max_bytes: Total body size above which least recently used entries are evicted
+            ttls: (path prefix, seconds) pairs; first matching prefix wins
+        """
+        self.path = path or default_cache_dir() / "responses.sqlite3"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttls = ttls if ttls is not None else DEFAULT_TTLS
+        import sqlite3  # Not needed by commands that never open the cache
+
+        self._error = sqlite3.Error
+        self._lock = threading.Lock()
+        self._touched: dict[str, float] = {}
+        self._db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Write back pending access times and close the database connection."""
+        with self._lock:
+            self._flush_touched()
+        self._db.close()
+
+    @staticmethod
+    def key(method: str, path: str, body: Any = None) -> str:
+        """Cache key for a request (method + path + JSON body)."""
+        payload = json.dumps(body, sort_keys=True) if body is not None else ""
+        raw = f"{method.upper()}\n{path}\n{payload}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def ttl_for(self, path: str) -> int:
+        """TTL in seconds for a request path."""
+        for prefix, ttl in self.ttls:
+            if path.startswith(prefix):
+                return ttl
+        return 0
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Look up an entry (fresh or stale) and mark it as recently used.
+
+        Access times are written back in batches (see _flush_touched).
+        Returns None if the entry is missing or the database is unavailable.
+        """
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+            except self._error:
+                return None
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_BATCH:
+                self._flush_touched()
+        return CacheEntry(*row)
+
+    def _flush_touched(self) -> None:
+        """Record the access times of recent hits (best effort, for LRU eviction)."""
+        if not self._touched:
+            return
+        touched = [(at, key) for key, at in self._touched.items()]
+        self._touched.clear()
+        try:
+            self._db.executemany("UPDATE responses SET accessed_at = ? WHERE key = ?", touched)
+            self._db.commit()
+        except self._error:
+            self._rollback()
+
+    def _rollback(self) -> None:
+        """Abandon a failed write (the connection may be unusable by now)."""
+        try:
+            self._db.rollback()
+        except self._error:
+            pass
+
+    def put(
+        self,
+        key: str,
+        method: str,
+        path: str,
+        body: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Store a response body, then evict LRU entries beyond max_bytes (best effort)."""
+        now = time.time()
+        with self._lock:
+            self._flush_touched()
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        method.upper(),
+                        path,
+                        body,
+                        etag,
+                        last_modified,
+                        now,
+                        now + self.ttl_for(path),
+                        now,
+                        len(body),
+                    ),
+                )
+                self._evict()
+                self._db.commit()
+            except self._error:
+                self._rollback()
+
+    def refresh(self, key: str, path: str) -> None:
+        """Extend an entry's lifetime after a successful revalidation (304, best effort)."""
+        now = time.time()
+        with self._lock:
+            self._touched.pop(key, None)
+            try:
+                self._db.execute(
+                    "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                    (now + self.ttl_for(path), now, key),
+                )
+                self._db.commit()
+            except self._error:
+                self._rollback()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under max_bytes."""
+        (total,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def stats(self) -> dict[str, Any]:
+        """Entry counts and sizes."""
+        now = time.time()
+        with self._lock:
+            entries, size, fresh = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), "
+                "COALESCE(SUM(expires_at > ?), 0) FROM responses",
+                (now,),
+            ).fetchone()
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "fresh": fresh,
+            "stale": entries - fresh,
+            "size": size,
+            "max_size": self.max_bytes,
+        }
+
+    def clear(self) -> int:
+        """Delete all entries. Returns the number of entries removed."""
+        with self._lock:
+            self._touched.clear()
+            removed = self._db.execute("DELETE FROM responses").rowcount
+            self._db.commit()
+            self._db.execute("VACUUM")
+        return removed
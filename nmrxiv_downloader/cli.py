@@ -1,25 +1,239 @@
 """CLI interface for nmrxiv-downloader."""
 
+import sys
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional
 
 import typer
-from rich.progress import (
-    BarColumn,
-    DownloadColumn,
-    Progress,
-    TextColumn,
-    TimeRemainingColumn,
-    TransferSpeedColumn,
+
+from . import telemetry
+from .cache import ResponseCache
+from .errors import NmrXivError
+from .index import KINDS, CatalogIndex, default_index_path, parent_project, short_id
+from .output import (
+    output_error,
+    output_item,
+    output_json,
+    output_ndjson,
+    output_ndjson_items,
+    output_table,
+)
+from .plan import ORDERS
+from .ratelimit import RateLimiter, default_state_dir, parse_size
+from .retry import RetryPolicy
+from .store import (
+    ContentStore,
+    hash_file,
+    manifest_path,
+    read_manifest,
+    verify_manifest,
+    write_files_manifest,
+    write_manifest,
 )
 
-from .client import NmrXivClient, NmrXivError
-from .output import output_error, output_item, output_json, output_table
+if TYPE_CHECKING:
+    # httpx and pydantic are imported by the commands that talk to the API
+    from .client import AsyncNmrXivClient, NmrXivClient
 
 app = typer.Typer(
     help="nmrXiv dataset search and download tool for Claude Code",
     no_args_is_help=True,
 )
+cache_app = typer.Typer(help="Inspect or clear the local response cache.", no_args_is_help=True)
+app.add_typer(cache_app, name="cache")
+index_app = typer.Typer(help="Build and update the local catalog index.", no_args_is_help=True)
+app.add_typer(index_app, name="index")
+
+# Global options set by the app callback, read by _make_client()
+_settings = {
+    "cache": True,
+    "retries": 3,
+    "rate": None,
+    "bandwidth": None,
+    "max_connections": None,
+}
+
+# Connection pool and cache kept open by 'nmrxiv serve' for all commands it runs
+_shared: dict = {}
+
+# Commands forwarded to the daemon share _settings and the console, so they run one at a time
+_forwarded_lock = threading.Lock()
+
+
+def _print_version(value: bool) -> None:
+    """Print the version and exit (--version)."""
+    if value:
+        from . import __version__
+
+        typer.echo(f"nmrxiv-downloader {__version__}")
+        raise typer.Exit()
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    version: bool = typer.Option(
+        False,
+        "--version",
+        callback=_print_version,
+        is_eager=True,
+        help="Show the version and exit",
+    ),
+    cache: bool = typer.Option(
+        True,
+        "--cache/--no-cache",
+        envvar="NMRXIV_CACHE",
+        help="Serve repeated API requests from the local response cache",
+    ),
+    retries: int = typer.Option(
+        3,
+        "--retries",
+        min=0,
+        envvar="NMRXIV_RETRIES",
+        help="Retries for transient network errors and 429/5xx responses",
+    ),
+    rate: Optional[float] = typer.Option(
+        None,
+        "--rate",
+        min=0.01,
+        envvar="NMRXIV_RATE_LIMIT",
+        help="Maximum API requests per second, shared by all nmrxiv processes",
+    ),
+    bandwidth: Optional[str] = typer.Option(
+        None,
+        "--bandwidth",
+        envvar="NMRXIV_BANDWIDTH_LIMIT",
+        help="Maximum download bandwidth per second, e.g. 500k or 10M",
+    ),
+    max_connections: Optional[int] = typer.Option(
+        None,
+        "--max-connections",
+        min=1,
+        envvar="NMRXIV_MAX_CONNECTIONS",
+        help="Maximum concurrent requests and downloads, shared by all nmrxiv processes",
+    ),
+    trace: Optional[Path] = typer.Option(
+        None,
+        "--trace",
+        envvar="NMRXIV_TRACE",
+        help="Write a timeline of the run (Chrome trace JSON) to this file",
+    ),
+    metrics: Optional[Path] = typer.Option(
+        None,
+        "--metrics",
+        envvar="NMRXIV_METRICS",
+        help="Write per-phase timings and counters (Prometheus text format) to this file "
+        "('-' for stderr)",
+    ),
+) -> None:
+    """nmrXiv dataset search and download tool for Claude Code."""
+    _settings["cache"] = cache
+    _settings["retries"] = retries
+    _settings["rate"] = rate
+    _settings["max_connections"] = max_connections
+    try:
+        _settings["bandwidth"] = parse_size(bandwidth) if bandwidth else None
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--bandwidth") from e
+    if trace or metrics:
+        recorder = telemetry.enable(timeline=trace is not None)
+        ctx.call_on_close(lambda: _write_telemetry(recorder, trace, metrics))
+
+
+def _write_telemetry(
+    recorder: telemetry.Telemetry, trace: Optional[Path], metrics: Optional[Path]
+) -> None:
+    """Write the run's trace and metrics files (when the command finishes)."""
+    telemetry.disable()
+    try:
+        if trace:
+            recorder.write_trace(trace)
+        if metrics and str(metrics) == "-":
+            sys.stderr.write(recorder.prometheus())
+        elif metrics:
+            recorder.write_metrics(metrics)
+    except OSError as e:
+        typer.echo(f"Cannot write telemetry: {e}", err=True)
+
+
+def _open_cache() -> ResponseCache | None:
+    """Open the response cache, or None if disabled or unavailable."""
+    if not _settings["cache"]:
+        return None
+    import sqlite3
+
+    try:
+        return ResponseCache()
+    except (OSError, sqlite3.Error):
+        # An unwritable cache directory should never break a command
+        return None
+
+
+def _make_client() -> "NmrXivClient":
+    """Create an API client configured from the global options."""
+    from .client import NmrXivClient
+
+    retry = RetryPolicy(max_attempts=_settings["retries"] + 1)
+    limiter = RateLimiter(
+        requests_per_second=_settings["rate"],
+        bytes_per_second=_settings["bandwidth"],
+        max_connections=_settings["max_connections"],
+        state_dir=default_state_dir(),
+    )
+    if _shared:
+        return NmrXivClient(
+            cache=_shared["cache"] if _settings["cache"] else None,
+            retry=retry,
+            rate_limiter=limiter,
+            http_client=_shared["http"],
+        )
+    return NmrXivClient(cache=_open_cache(), retry=retry, rate_limiter=limiter)
+
+
+def _make_async_client(cached: bool = False, concurrency: int = 8) -> "AsyncNmrXivClient":
+    """Create an async API client configured from the global options.
+
+    Catalog walks (index, sync) always go to the API; item lookups may
+    opt into the response cache with cached=True.
+    """
+    from .client import AsyncNmrXivClient
+
+    retry = RetryPolicy(max_attempts=_settings["retries"] + 1)
+    limiter = RateLimiter(
+        requests_per_second=_settings["rate"],
+        bytes_per_second=_settings["bandwidth"],
+        max_connections=_settings["max_connections"],
+        state_dir=default_state_dir(),
+    )
+    if _settings["max_connections"]:
+        concurrency = min(concurrency, _settings["max_connections"])
+    return AsyncNmrXivClient(
+        concurrency=concurrency,
+        retry=retry,
+        rate_limiter=limiter,
+        cache=_open_cache() if cached else None,
+    )
+
+
+def _report_retries(result: dict, client: "NmrXivClient") -> dict:
+    """Add the client's retry count to a JSON result if any retries happened."""
+    if client.retries:
+        result["retries"] = client.retries
+    return result
+
+
+_FORMATS = ("json", "ndjson", "table")
+
+
+def _output_format(fmt: Optional[str], json_output: bool) -> str:
+    """Resolve --format (json, ndjson, table), falling back to --json/--no-json."""
+    if fmt is None:
+        return "json" if json_output else "table"
+    if fmt not in _FORMATS:
+        output_error(f"Unknown format: {fmt}. Use 'json', 'ndjson' or 'table'.")
+    return fmt
 
 
 @app.command()
@@ -31,49 +245,110 @@ def list(
         help="Type to list: project, dataset",
     ),
     page: int = typer.Option(1, "--page", "-p", help="Page number"),
+    all_pages: bool = typer.Option(
+        False, "--all", help="List every page (fetched concurrently, in completion order)"
+    ),
+    fmt: Optional[str] = typer.Option(
+        None, "--format", help="Output format: json, ndjson, table (overrides --json/--no-json)"
+    ),
     json_output: bool = typer.Option(True, "--json/--no-json", help="Output as JSON"),
 ) -> None:
-    """List items from nmrXiv (projects or datasets)."""
+    """List items from nmrXiv (projects or datasets).
+
+    Examples:
+        nmrxiv list --type dataset --page 2
+        nmrxiv list --type dataset --all --format ndjson | jq -r .identifier
+    """
+    if type not in ("project", "dataset"):
+        output_error(f"Unknown type: {type}. Use 'project' or 'dataset'.")
+        return
+    fmt = _output_format(fmt, json_output)
+
+    if all_pages:
+        _list_all(type, fmt)
+        return
+
     try:
-        with NmrXivClient() as client:
+        with _make_client() as client:
             if type == "project":
-                response = client.list_projects(page=page)
-            elif type == "dataset":
-                response = client.list_datasets(page=page)
+                response = client.list_projects(page=page, raw=True)
             else:
-                output_error(f"Unknown type: {type}. Use 'project' or 'dataset'.")
-                return
+                response = client.list_datasets(page=page, raw=True)
 
-            if json_output:
+            if fmt == "ndjson":
+                output_ndjson_items(response.items)
+            elif fmt == "json":
                 result = {
-                    "items": [item.model_dump() for item in response.items],
+                    "items": response.items,
                     "count": len(response.items),
                     "total": response.total,
                     "page": response.page,
                     "last_page": response.last_page,
                     "type": type,
                 }
-                output_json(result)
+                output_json(_report_retries(result, client))
             else:
-                # Human-readable table output
-                if type == "project":
-                    columns = [
-                        ("name", "Name"),
-                        ("identifier", "ID"),
-                        ("doi", "DOI"),
-                    ]
-                else:
-                    columns = [
-                        ("name", "Name"),
-                        ("type", "Type"),
-                        ("identifier", "ID"),
-                        ("doi", "DOI"),
-                    ]
-                data = [item.model_dump() for item in response.items]
                 footer = f"Showing {len(response.items)} of {response.total} {type}s (page {response.page} of {response.last_page})"
-                output_table(data, columns, title=f"nmrXiv {type.title()}s", footer=footer)
+                _list_table(type, response.items, footer)
+    except NmrXivError as e:
+        output_error(e.message, code=e.status_code or 1)
+
+
+def _list_table(type: str, items: List, footer: str) -> None:
+    """Human-readable table of listed projects or datasets."""
+    if type == "project":
+        columns = [
+            ("name", "Name"),
+            ("identifier", "ID"),
+            ("doi", "DOI"),
+        ]
+    else:
+        columns = [
+            ("name", "Name"),
+            ("type", "Type"),
+            ("identifier", "ID"),
+            ("doi", "DOI"),
+        ]
+    output_table(items, columns, title=f"nmrXiv {type.title()}s", footer=footer)
+
+
+def _list_all(type: str, fmt: str) -> None:
+    """List every page of projects or datasets.
+
+    With NDJSON each page is written as soon as it arrives, so memory stays
+    flat; JSON and table output collect all items first.
+    """
+    import asyncio
+
+    items: List = []
+
+    async def run() -> int:
+        async with _make_async_client() as client:
+            async for response in client.iter_pages(type, raw=True):
+                if fmt == "ndjson":
+                    output_ndjson_items(response.items)
+                else:
+                    items.extend(response.items)
+            return client.retries
+
+    try:
+        retries = asyncio.run(run())
     except NmrXivError as e:
         output_error(e.message, code=e.status_code or 1)
+        return
+
+    if fmt == "json":
+        result = {
+            "items": items,
+            "count": len(items),
+            "total": len(items),
+            "type": type,
+        }
+        if retries:
+            result["retries"] = retries
+        output_json(result)
+    elif fmt == "table":
+        _list_table(type, items, f"Showing all {len(items)} {type}s")
 
 
 @app.command()
@@ -84,42 +359,108 @@ def search(
     smiles: Optional[str] = typer.Option(
         None, "--smiles", "-s", help="Search molecules by SMILES substructure"
     ),
-    experiment_type: Optional[str] = typer.Option(
-        None, "--type", "-t", help="Filter datasets by experiment type (e.g., hsqc, 1d-13c, cosy)"
+    experiment_type: Optional[List[str]] = typer.Option(
+        None,
+        "--type",
+        "-t",
+        help="Filter datasets by experiment type (e.g., hsqc, 1d-13c, cosy; repeatable)",
+    ),
+    type_match: str = typer.Option(
+        "any", "--type-match", help="With several --type: match 'any' of them or 'all'"
+    ),
+    text: Optional[str] = typer.Option(
+        None, "--text", help="Full-text search of the local index (name, description, type)"
+    ),
+    kind: str = typer.Option(
+        "dataset", "--kind", "-k", help="Index item kind for --text/--type: dataset, project, study"
+    ),
+    online: bool = typer.Option(
+        False, "--online", help="Filter --type against the API even if a local index exists"
     ),
     page: int = typer.Option(1, "--page", "-p", help="Page number"),
+    all_pages: bool = typer.Option(
+        False,
+        "--all",
+        help="Fetch every page of a --query/--smiles search, or of the datasets for --type",
+    ),
+    max_results: Optional[int] = typer.Option(
+        None, "--max-results", min=1, help="Stop after this many molecules (implies --all)"
+    ),
+    fmt: Optional[str] = typer.Option(
+        None, "--format", help="Output format: json, ndjson, table (overrides --json/--no-json)"
+    ),
     json_output: bool = typer.Option(True, "--json/--no-json", help="Output as JSON"),
 ) -> None:
     """Search nmrXiv for molecules or datasets.
 
+    --type and --text are answered from the local index (see 'nmrxiv index
+    build') when it exists, with exact totals across the whole catalog.
+
     Examples:
         nmrxiv search --query kaempferol       # Search by compound name
         nmrxiv search --smiles CCO             # Search by SMILES substructure
+        nmrxiv search --smiles c1ccccc1 --all --format ndjson
         nmrxiv search --type hsqc              # Filter datasets by experiment type
         nmrxiv search --type "1d-13c"          # Filter datasets by 1D 13C experiments
+        nmrxiv search --type hsqc --type hmbc  # HSQC or HMBC datasets
+        nmrxiv search --type hsqc --online --all   # Exact count without a local index
+        nmrxiv search --text "sinapigladioside" --kind project
     """
-    if not any([query, smiles, experiment_type]):
+    if not any([query, smiles, experiment_type, text]):
         output_error(
-            "Please provide at least one search criterion: --query, --smiles, or --type"
+            "Please provide at least one search criterion: --query, --smiles, --type, or --text"
         )
         return
+    if kind not in KINDS:
+        output_error(f"Unknown kind: {kind}. Use 'dataset', 'project' or 'study'.")
+        return
+    if type_match not in ("any", "all"):
+        output_error(f"Unknown --type-match: {type_match}. Use 'any' or 'all'.")
+        return
+    match_all = type_match == "all"
+    fmt = _output_format(fmt, json_output)
+
+    if all_pages and experiment_type and not (query or smiles or text or max_results):
+        _search_types_all(experiment_type, match_all, fmt)
+        return
+    if all_pages or max_results:
+        if not (query or smiles) or experiment_type or text:
+            output_error(
+                "--all applies to --query/--smiles searches or a --type filter on its own; "
+                "--max-results to --query/--smiles only"
+            )
+            return
+        _search_molecules_all(query, smiles, max_results, fmt)
+        return
+
+    if text or (experiment_type and not online):
+        index = _open_index(required=bool(text))
+        if index is not None:
+            with index:
+                _search_index(index, kind, text, experiment_type, match_all, page, fmt)
+            return
 
     try:
-        with NmrXivClient() as client:
+        with _make_client() as client:
             if experiment_type:
                 # Dataset filtering by experiment type
-                response = client.filter_datasets(experiment_type, page=page)
-                if json_output:
+                response = client.filter_datasets(
+                    experiment_type, page=page, raw=True, match_all=match_all
+                )
+                type_desc = _type_description(experiment_type, match_all)
+                if fmt == "ndjson":
+                    output_ndjson_items(response.items)
+                elif fmt == "json":
                     result = {
-                        "results": [item.model_dump() for item in response.items],
+                        "results": response.items,
                         "count": len(response.items),
                         "search_type": "dataset",
-                        "query": {"experiment_type": experiment_type},
+                        "query": _type_query(experiment_type, match_all),
                         "page": response.page,
                         "total": response.total,
                         "note": "Total reflects all datasets, not filtered count",
                     }
-                    output_json(result)
+                    output_json(_report_retries(result, client))
                 else:
                     columns = [
                         ("name", "Name"),
@@ -127,15 +468,20 @@ def search(
                         ("identifier", "ID"),
                         ("project", "Project"),
                     ]
-                    data = [item.model_dump() for item in response.items]
-                    footer = f"Found {len(response.items)} {experiment_type} datasets on page {response.page}"
-                    output_table(data, columns, title=f"Datasets: {experiment_type}", footer=footer)
+                    footer = f"Found {len(response.items)} {type_desc} datasets on page {response.page}"
+                    output_table(
+                        response.items, columns, title=f"Datasets: {type_desc}", footer=footer
+                    )
             else:
                 # Molecular search
-                response = client.search_molecules(query=query, smiles=smiles, page=page)
-                if json_output:
+                response = client.search_molecules(
+                    query=query, smiles=smiles, page=page, raw=True
+                )
+                if fmt == "ndjson":
+                    output_ndjson_items(response.items)
+                elif fmt == "json":
                     result = {
-                        "results": [item.model_dump() for item in response.items],
+                        "results": response.items,
                         "count": len(response.items),
                         "search_type": "molecule",
                         "query": {
@@ -144,7 +490,7 @@ def search(
                         "page": response.page,
                         "total": response.total,
                     }
-                    output_json(result)
+                    output_json(_report_retries(result, client))
                 else:
                     columns = [
                         ("iupac_name", "Name"),
@@ -152,37 +498,360 @@ def search(
                         ("molecular_weight", "MW"),
                         ("canonical_smiles", "SMILES"),
                     ]
-                    data = [item.model_dump() for item in response.items]
                     search_desc = query or smiles
                     footer = f"Found {len(response.items)} of {response.total} molecules (page {response.page})"
-                    output_table(data, columns, title=f"Molecules: {search_desc}", footer=footer)
+                    output_table(
+                        response.items, columns, title=f"Molecules: {search_desc}", footer=footer
+                    )
+    except NmrXivError as e:
+        output_error(e.message, code=e.status_code or 1)
+
+
+def _search_molecules_all(
+    query: Optional[str], smiles: Optional[str], max_results: Optional[int], fmt: str
+) -> None:
+    """Molecule search across all result pages, deduplicated by InChIKey.
+
+    With NDJSON, molecules are written as their pages arrive.
+    """
+    import asyncio
+
+    molecules: List = []
+
+    async def run() -> int:
+        async with _make_async_client() as client:
+            async for molecule in client.iter_all_molecules(
+                query=query, smiles=smiles, max_results=max_results, raw=True
+            ):
+                if fmt == "ndjson":
+                    output_ndjson_items([molecule])
+                else:
+                    molecules.append(molecule)
+            return client.retries
+
+    try:
+        retries = asyncio.run(run())
     except NmrXivError as e:
         output_error(e.message, code=e.status_code or 1)
+        return
+
+    if fmt == "json":
+        result = {
+            "results": molecules,
+            "count": len(molecules),
+            "search_type": "molecule",
+            "query": {k: v for k, v in {"query": query, "smiles": smiles}.items() if v},
+            "total": len(molecules),
+        }
+        if retries:
+            result["retries"] = retries
+        output_json(result)
+    elif fmt == "table":
+        columns = [
+            ("iupac_name", "Name"),
+            ("molecular_formula", "Formula"),
+            ("molecular_weight", "MW"),
+            ("canonical_smiles", "SMILES"),
+        ]
+        footer = f"Found {len(molecules)} unique molecules"
+        output_table(molecules, columns, title=f"Molecules: {query or smiles}", footer=footer)
+
+
+def _type_query(experiment_types: List[str], match_all: bool) -> dict:
+    """The 'query' field of a --type search result."""
+    if len(experiment_types) == 1:
+        return {"experiment_type": experiment_types[0]}
+    return {"experiment_type": experiment_types, "type_match": "all" if match_all else "any"}
+
+
+def _type_description(experiment_types: List[str], match_all: bool) -> str:
+    """'hsqc', or 'hsqc or hmbc' / 'hsqc and 13c' for several --type options."""
+    return (" and " if match_all else " or ").join(experiment_types)
+
+
+def _search_types_all(experiment_types: List[str], match_all: bool, fmt: str) -> None:
+    """Filter every dataset of the catalog by experiment type, with an exact count.
+
+    All listing pages are fetched concurrently and indexed by type term
+    once per catalog snapshot (see exptypes.index_types); the types are
+    then index lookups.
+    """
+    import asyncio
+
+    from .exptypes import index_types
+
+    datasets: List = []
+
+    async def run() -> int:
+        async with _make_async_client(cached=True) as client:
+            pages = [response async for response in client.iter_pages("dataset", raw=True)]
+            for response in sorted(pages, key=lambda r: r.page):
+                datasets.extend(response.items)
+            return client.retries
+
+    try:
+        retries = asyncio.run(run())
+    except NmrXivError as e:
+        output_error(e.message, code=e.status_code or 1)
+        return
+
+    with telemetry.span("filter.types", items=len(datasets)):
+        index = index_types(tuple(item["type"] for item in datasets))
+        matches = [datasets[n] for n in sorted(index.match(experiment_types, match_all))]
+
+    type_desc = _type_description(experiment_types, match_all)
+    if fmt == "ndjson":
+        output_ndjson_items(matches)
+    elif fmt == "json":
+        result = {
+            "results": matches,
+            "count": len(matches),
+            "search_type": "dataset",
+            "query": _type_query(experiment_types, match_all),
+            "total": len(matches),
+            "scanned": len(datasets),
+        }
+        if retries:
+            result["retries"] = retries
+        output_json(result)
+    else:
+        columns = [("name", "Name"), ("type", "Type"), ("identifier", "ID")]
+        footer = f"Found {len(matches)} {type_desc} datasets among {len(datasets)}"
+        output_table(matches, columns, title=f"Datasets: {type_desc}", footer=footer)
+
+
+def _open_index(required: bool) -> CatalogIndex | None:
+    """Open the local catalog index if it has been built.
+
+    Exits with an error if required and the index is missing or unusable.
+    """
+    import sqlite3
+
+    path = default_index_path()
+    if path.exists():
+        try:
+            index = CatalogIndex(path)
+            if not index.is_empty:
+                return index
+            index.close()
+        except sqlite3.Error as e:
+            if required:
+                output_error(f"Cannot open index {path}: {e}")
+            return None
+    if required:
+        output_error("No local index found. Run 'nmrxiv index build' first.")
+    return None
+
+
+def _search_index(
+    index: CatalogIndex,
+    kind: str,
+    text: Optional[str],
+    experiment_type: Optional[List[str]],
+    match_all: bool,
+    page: int,
+    fmt: str,
+) -> None:
+    """Answer a --text/--type search from the local index."""
+    import sqlite3
+
+    try:
+        response = index.search(
+            kind,
+            text=text,
+            experiment_type=experiment_type,
+            page=page,
+            match_all=match_all,
+            raw=True,
+        )
+    except sqlite3.OperationalError as e:
+        output_error(f"Invalid search: {e}")
+        return
+
+    query = {"text": text} if text else {}
+    if experiment_type:
+        query.update(_type_query(experiment_type, match_all))
+    if fmt == "ndjson":
+        output_ndjson_items(response.items)
+    elif fmt == "json":
+        result = {
+            "results": response.items,
+            "count": len(response.items),
+            "search_type": kind,
+            "query": query,
+            "page": response.page,
+            "last_page": response.last_page,
+            "total": response.total,
+            "source": "index",
+        }
+        output_json(result)
+    else:
+        columns = [("name", "Name"), ("identifier", "ID")]
+        if kind == "dataset":
+            columns.insert(1, ("type", "Type"))
+        footer = (
+            f"Showing {len(response.items)} of {response.total} {kind}s "
+            f"(page {response.page} of {response.last_page}, local index)"
+        )
+        parts = [text] if text else []
+        if experiment_type:
+            parts.append(_type_description(experiment_type, match_all))
+        title = " ".join(parts)
+        output_table(response.items, columns, title=f"{kind.title()}s: {title}", footer=footer)
 
 
 @app.command()
 def show(
-    item_id: str = typer.Argument(..., help="Item identifier (e.g., P5, D123)"),
+    item_ids: Optional[List[str]] = typer.Argument(
+        None, help="Item identifiers (e.g., P5 D123); '-' reads stdin"
+    ),
+    from_file: Optional[Path] = typer.Option(
+        None, "--from-file", "-f", help="Read identifiers from a file (one per line)"
+    ),
+    jobs: int = typer.Option(8, "--jobs", "-j", min=1, help="Concurrent requests for several items"),
+    fmt: Optional[str] = typer.Option(
+        None, "--format", help="Output format: json, ndjson, table (overrides --json/--no-json)"
+    ),
     json_output: bool = typer.Option(True, "--json/--no-json", help="Output as JSON"),
 ) -> None:
-    """Show detailed metadata for an item."""
+    """Show detailed metadata for one or more items.
+
+    Examples:
+        nmrxiv show P5
+        nmrxiv show P5 P11 D410 --format ndjson
+        nmrxiv show --from-file ids.txt --format ndjson --jobs 16
+    """
+    ids = _read_ids(item_ids, from_file)
+    if not ids:
+        output_error("Please provide at least one item identifier")
+        return
+    fmt = _output_format(fmt, json_output)
+    if len(ids) > 1 or fmt == "ndjson":
+        _show_many(ids, jobs, fmt)
+        return
+
+    item_id = ids[0]
     try:
-        with NmrXivClient() as client:
+        with _make_client() as client:
             item = client.get_item(item_id)
-            if json_output:
+            if fmt == "json":
                 result = {"item": item, "id": item_id}
-                output_json(result)
+                output_json(_report_retries(result, client))
             else:
                 output_item(item, title=item_id)
     except NmrXivError as e:
         output_error(e.message, code=e.status_code or 1)
 
 
+def _show_many(ids: List[str], jobs: int, fmt: str) -> None:
+    """Fetch several items concurrently over one pooled connection.
+
+    NDJSON records are written as each item arrives; JSON and table output
+    keep the input order. Exits 1 if any item could not be fetched.
+    """
+    import asyncio
+
+    results: dict[str, dict] = {}
+    failed: List[str] = []
+
+    async def run() -> int:
+        async with _make_async_client(cached=True, concurrency=jobs) as client:
+            async for item_id, item in client.iter_items(ids):
+                if isinstance(item, NmrXivError):
+                    record = {
+                        "id": item_id,
+                        "error": True,
+                        "message": item.message,
+                        "code": item.status_code or 1,
+                    }
+                else:
+                    record = {"id": item_id, "item": item}
+                if fmt == "ndjson":
+                    output_ndjson(record)
+                else:
+                    results[item_id] = record
+                if record.get("error"):
+                    failed.append(item_id)
+            return client.retries
+
+    retries = asyncio.run(run())
+
+    if fmt == "json":
+        summary = {
+            "status": "success" if not failed else "partial" if len(failed) < len(ids) else "error",
+            "results": [results[item_id] for item_id in ids],
+            "count": len(ids),
+            "succeeded": len(ids) - len(failed),
+            "failed": len(failed),
+        }
+        if retries:
+            summary["retries"] = retries
+        output_json(summary)
+    elif fmt == "table":
+        for item_id in ids:
+            record = results[item_id]
+            if "item" in record:
+                output_item(record["item"], title=item_id)
+            else:
+                output_table(
+                    [record], [("id", "ID"), ("message", "Error")], title=f"{item_id} failed"
+                )
+
+    if failed:
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def download(
-    item_id: str = typer.Argument(..., help="Item identifier to download (e.g., P5)"),
+    item_ids: Optional[List[str]] = typer.Argument(
+        None, help="Item identifiers to download (e.g., P5 P11); '-' reads stdin"
+    ),
+    from_file: Optional[Path] = typer.Option(
+        None, "--from-file", "-f", help="Read identifiers from a file (one per line)"
+    ),
     output_dir: str = typer.Option(".", "--output", "-o", help="Output directory"),
     extract: bool = typer.Option(False, "--extract", "-x", help="Extract ZIP after download"),
+    include: Optional[List[str]] = typer.Option(
+        None,
+        "--include",
+        help="Only extract members matching this glob (repeatable; projects need --extract)",
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None, "--exclude", help="Skip members matching this glob when extracting (repeatable)"
+    ),
+    delete_archive: bool = typer.Option(
+        False, "--delete-archive", help="Delete the ZIP after a successful extraction"
+    ),
+    resume: bool = typer.Option(
+        True, "--resume/--no-resume", help="Continue interrupted downloads from their .part file"
+    ),
+    jobs: int = typer.Option(4, "--jobs", "-j", min=1, help="Concurrent downloads"),
+    segments: int = typer.Option(
+        1, "--segments", min=1, help="Parallel connections per archive (byte ranges)"
+    ),
+    checksum: bool = typer.Option(
+        True, "--checksum/--no-checksum", help="Write a SHA-256 manifest next to each archive or dataset"
+    ),
+    store: bool = typer.Option(
+        False,
+        "--store/--no-store",
+        envvar="NMRXIV_USE_STORE",
+        help="Keep archives in the shared content store and link them into the output directory",
+    ),
+    order: str = typer.Option(
+        "input", "--order", help="Queue order: input, smallest (first results sooner), largest"
+    ),
+    priority: Optional[List[str]] = typer.Option(
+        None, "--priority", help="Download this item before all others (repeatable)"
+    ),
+    space_check: bool = typer.Option(
+        True,
+        "--space-check/--no-space-check",
+        help="With several items, size all archives first and refuse to start if they do not fit",
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Only print the download plan (see 'nmrxiv plan')"
+    ),
     json_output: bool = typer.Option(True, "--json/--no-json", help="Output as JSON"),
 ) -> None:
     """Download dataset files to local directory.
@@ -192,110 +861,1205 @@ def download(
         nmrxiv download P5 --output /data         # Download to /data directory
         nmrxiv download P5 --extract              # Download and extract ZIP
         nmrxiv download P5 --extract --no-json    # Download with progress bar
+        nmrxiv download P5 P11 P23 --jobs 3       # Download several projects in parallel
+        nmrxiv download --from-file ids.txt       # Read identifiers from a file
+        nmrxiv download P5 --segments 8           # Fetch one large archive over 8 connections
+        nmrxiv download P5 -x --include fid --include acqus --delete-archive
+        nmrxiv download P5 --store -o /team/a     # Reuse the stored copy if unchanged
+        nmrxiv download D410                      # Only this dataset's files from its project
+        nmrxiv download D410 --include fid        # ...and only its FIDs
+        nmrxiv download -f ids.txt --order smallest --dry-run
     """
-    import zipfile
+    ids = _read_ids(item_ids, from_file)
+    if not ids:
+        output_error("Please provide at least one item identifier")
+        return
 
-    try:
-        with NmrXivClient() as client:
-            # Get download URL for the item
-            download_url = client.get_download_url(item_id)
-
-            if not download_url:
-                # Check if it's a dataset and suggest parent project
-                item = client.get_item(item_id)
-                project_info = item.get("project", {})
-                if project_info and isinstance(project_info, dict):
-                    # Try to get identifier from different sources
-                    project_id = project_info.get("identifier")
-                    if not project_id and project_info.get("public_url"):
-                        # Extract from URL like https://nmrxiv.org/project/P11
-                        project_id = project_info["public_url"].split("/")[-1]
-                    if project_id:
-                        output_error(
-                            f"No download URL for {item_id}. Try downloading parent project: {project_id}"
-                        )
-                    else:
-                        output_error(f"No download URL available for {item_id}")
-                else:
-                    output_error(f"No download URL available for {item_id}")
-                return
+    # --include/--exclude without --extract are checked per item: datasets
+    # sliced from their project's archive are always extracted
+    if order not in ORDERS:
+        output_error(f"Unknown order: {order}. Use 'input', 'smallest' or 'largest'.")
+        return
 
-            # Prepare output path
-            out_path = Path(output_dir)
-            out_path.mkdir(parents=True, exist_ok=True)
+    options = _DownloadOptions(
+        out_path=Path(output_dir),
+        extract=extract,
+        resume=resume,
+        segments=segments,
+        include=include,
+        exclude=exclude,
+        delete_archive=delete_archive,
+        checksum=checksum,
+        store=ContentStore() if store else None,
+    )
 
-            # Extract filename from URL
-            filename = download_url.split("/")[-1]
-            dest_file = out_path / filename
+    try:
+        with _make_client() as client:
+            # A single archive needs no preflight: its preallocation reports a
+            # full disk before anything is transferred
+            if dry_run or order != "input" or priority or (space_check and len(ids) > 1):
+                plan = _plan(client, ids, options, order, priority)
+                if dry_run:
+                    _output_plan(plan, json_output)
+                    return
+                if space_check and not plan.fits:
+                    at_least = "at least " if plan.lower_bound else ""
+                    output_error(
+                        f"Not enough disk space in {plan.dest}: the downloads need "
+                        f"{at_least}{plan.required_bytes:,} bytes but only {plan.free:,} are free "
+                        "(see --dry-run; --no-space-check skips this check)"
+                    )
+                ids = [entry.id for entry in plan.entries]
+                options.urls = {
+                    entry.id: entry.url
+                    for entry in plan.entries
+                    if entry.url and not entry.slice_of and not entry.error
+                }
 
-            # Download with progress
-            if json_output:
-                # Silent download for JSON output
-                client.download_file(download_url, dest_file)
+            options.out_path.mkdir(parents=True, exist_ok=True)
+            if len(ids) == 1:
+                _download_single(client, ids[0], options, json_output)
             else:
-                # Rich progress bar for human-readable output
-                with Progress(
-                    TextColumn("[bold blue]{task.fields[filename]}", justify="right"),
-                    BarColumn(bar_width=40),
-                    "[progress.percentage]{task.percentage:>3.1f}%",
-                    "•",
-                    DownloadColumn(),
-                    "•",
-                    TransferSpeedColumn(),
-                    "•",
-                    TimeRemainingColumn(),
-                ) as progress:
-                    task_id = progress.add_task(
-                        "download", filename=filename, total=None
+                _download_many(client, ids, options, jobs, json_output)
+    finally:
+        if options.store is not None:
+            options.store.close()
+
+
+def _read_ids(item_ids: Optional[List[str]], from_file: Optional[Path]) -> List[str]:
+    """Collect identifiers from arguments, a file and/or stdin ('-'), without duplicates.
+
+    Files and stdin hold whitespace-separated identifiers; '#' starts a comment.
+    """
+    raw: List[str] = []
+    lines: List[str] = []
+    for item_id in item_ids or []:
+        if item_id == "-":
+            lines.extend(sys.stdin.read().splitlines())
+        else:
+            raw.append(item_id)
+    if from_file is not None:
+        try:
+            lines.extend(from_file.read_text().splitlines())
+        except OSError as e:
+            output_error(f"Cannot read {from_file}: {e}")
+    for line in lines:
+        raw.extend(line.split("#", 1)[0].split())
+    return [*dict.fromkeys(raw)]
+
+
+@dataclass
+class _DownloadOptions:
+    """Per-item download settings shared by single and batch downloads."""
+
+    out_path: Path
+    extract: bool = False
+    resume: bool = True
+    segments: int = 1
+    include: Optional[List[str]] = None
+    exclude: Optional[List[str]] = None
+    delete_archive: bool = False
+    checksum: bool = True
+    store: Optional[ContentStore] = None
+    verify: bool = False
+    # Archive URLs already resolved by the download planner, by identifier
+    urls: dict = field(default_factory=dict)
+
+
+def _download_url(client: "NmrXivClient", item_id: str) -> str:
+    """Archive URL of an item.
+
+    Raises:
+        NmrXivError: If the item has no archive of its own
+    """
+    download_url = client.get_item(item_id).get("download_url")
+    if not download_url:
+        raise NmrXivError(f"No download URL available for {item_id}")
+    return download_url
+
+
+def _open_archive(client: "NmrXivClient", item_id: str, item: Optional[dict] = None):
+    """Open the remote archive holding an item's files, reading its central directory.
+
+    A dataset without an archive of its own (most of them) is served from
+    its parent project's archive: its files are the members below the
+    directory named after the dataset, preferably inside its study's
+    directory.
+
+    Returns:
+        The RemoteZip, the parent project's identifier (None for an item with
+        its own archive) and the path prefix of the item's members ("" for all)
+
+    Raises:
+        NmrXivError: If there is no archive, or the dataset's directory cannot
+            be told apart in its project's archive
+    """
+    from .remotezip import RemoteZip
+
+    if item is None:
+        item = client.get_item(item_id)
+    project_id = parent_project(item)
+    if item.get("download_url"):
+        return RemoteZip(client, item["download_url"]), None, ""
+    if project_id is None:
+        raise NmrXivError(f"No download URL available for {item_id}")
+
+    archive = RemoteZip(client, _download_url(client, project_id))
+    study = item.get("study") if isinstance(item.get("study"), dict) else {}
+    try:
+        prefix = archive.locate(
+            [item.get("name"), item.get("slug")], [study.get("name"), study.get("slug")]
+        )
+    except NmrXivError as e:
+        archive.close()
+        raise NmrXivError(
+            f"Cannot find the files of {item_id} in the archive of {project_id}: {e.message}. "
+            f"List it with 'nmrxiv ls {project_id}' and pick files with "
+            f"'nmrxiv get {project_id} --include ...'"
+        ) from e
+    return archive, project_id, prefix
+
+
+def _download_item(
+    client: "NmrXivClient",
+    item_id: str,
+    options: _DownloadOptions,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    on_start: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """Download (and optionally extract) one item, returning its result record.
+
+    Raises:
+        NmrXivError: If the item has no download URL, the transfer fails or
+            the archive cannot be written or stored
+    """
+    import sqlite3
+    import zipfile
+
+    from .extract import extract_archive
+
+    download_url = options.urls.get(item_id)
+    if download_url is None:
+        item = client.get_item(item_id)
+        download_url = item.get("download_url")
+        if not download_url and parent_project(item):
+            return _download_slice(client, item_id, item, options, progress_callback, on_start)
+        if not download_url:
+            raise NmrXivError(f"No download URL available for {item_id}")
+    if (options.include or options.exclude or options.delete_archive) and not options.extract:
+        raise NmrXivError(
+            f"{item_id} is a project archive: --include, --exclude and --delete-archive "
+            "require --extract"
+        )
+
+    # Extract filename from URL
+    filename = download_url.split("/")[-1]
+    dest_file = options.out_path / filename
+    if on_start:
+        on_start(filename)
+
+    result = {"status": "success", "id": item_id}
+    store = options.store
+    remote = None
+    digest = None
+    if store is not None:
+        try:
+            remote = client.remote_file_info(download_url)
+        except NmrXivError:
+            # No HEAD support: fall back to downloading and storing the result
+            remote = {"etag": None, "size": None}
+        try:
+            digest = store.lookup(download_url, remote["etag"], remote["size"])
+            if digest is not None:
+                result["store"] = "hit"
+                result["link"] = store.link(digest, dest_file)
+                write_manifest(dest_file, digest)
+        except (OSError, sqlite3.Error) as e:
+            raise NmrXivError(f"Cannot link {filename} from the store: {e}") from e
+
+    if digest is None:
+        client.download_file(
+            download_url,
+            dest_file,
+            progress_callback=progress_callback,
+            resume=options.resume,
+            segments=options.segments,
+            checksum=options.checksum or store is not None,
+        )
+        if options.checksum or store is not None:
+            digest = read_manifest(manifest_path(dest_file))[0][0]
+        if store is not None:
+            try:
+                store.add(dest_file, digest, download_url, remote["etag"])
+            except (OSError, sqlite3.Error) as e:
+                raise NmrXivError(f"Cannot add {filename} to the store: {e}") from e
+            result["store"] = "added"
+
+    if options.verify and digest is not None:
+        _verify_download(client, item_id, download_url, dest_file, digest, remote)
+        result["verified"] = True
+
+    result["file"] = str(dest_file.absolute())
+    result["size"] = dest_file.stat().st_size
+    if digest is not None:
+        result["sha256"] = digest
+
+    # Extract if requested
+    if options.extract:
+        extract_dir = options.out_path / item_id
+        extract_dir.mkdir(parents=True, exist_ok=True)
+
+        try:
+            extracted = extract_archive(
+                dest_file, extract_dir, include=options.include, exclude=options.exclude
+            )
+        except (zipfile.BadZipFile, OSError) as e:
+            raise NmrXivError(f"Extraction failed for {item_id}: {e}") from e
+
+        # List top-level contents of extracted directory
+        top_level = [p.name for p in extract_dir.iterdir()]
+        result["extracted_to"] = str(extract_dir.absolute())
+        result["files"] = top_level[:20]  # Limit to first 20 items
+        result["total_files"] = len(extracted)
+
+        if options.delete_archive:
+            # The manifest goes too, or 'nmrxiv verify' would report the archive as missing
+            dest_file.unlink()
+            manifest_path(dest_file).unlink(missing_ok=True)
+            result["archive_deleted"] = True
+
+    return result
+
+
+def _download_slice(
+    client: "NmrXivClient",
+    item_id: str,
+    item: dict,
+    options: _DownloadOptions,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    on_start: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """Extract a dataset's files from its parent project's archive into <out>/<item_id>/.
+
+    Only the central directory and the dataset's members are fetched (HTTP
+    Range requests), not the whole project archive. Members keep their
+    archive paths, as with 'download --extract'; each one is checked
+    against its CRC-32 while it is decompressed. With options.checksum, the
+    extracted files are listed in <out>/<item_id>.sha256 for 'nmrxiv verify'.
+
+    Raises:
+        NmrXivError: If the dataset cannot be located or the transfer fails,
+            or the content store was requested (it holds whole archives only)
+    """
+    if options.store is not None:
+        raise NmrXivError(
+            f"{item_id} is sliced from the archive of {parent_project(item)}; "
+            "the content store only holds whole archives (use --no-store)"
+        )
+    from .extract import safe_member_path
+
+    extract_dir = options.out_path / item_id
+    if on_start:
+        on_start(item_id)
+    with telemetry.span("download.slice", id=item_id):
+        archive, project_id, prefix = _open_archive(client, item_id, item)
+        with archive:
+            members = archive.select(options.include, options.exclude, prefix=prefix)
+            if not members:
+                raise NmrXivError(f"No files of {item_id} match the given patterns")
+            extract_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                extracted = archive.extract(members, extract_dir, progress_callback)
+                if options.checksum:
+                    manifest = write_files_manifest(
+                        manifest_path(extract_dir),
+                        [safe_member_path(extract_dir, name) for name in extracted],
                     )
+            except OSError as e:
+                raise NmrXivError(f"Extraction failed for {item_id}: {e}") from e
+    telemetry.count("download.files")
+    result = {
+        "status": "success",
+        "id": item_id,
+        "project": project_id,
+        "url": archive.url,
+        "path": prefix,
+        "extracted_to": str(extract_dir.absolute()),
+        "files": extracted[:20],
+        "total_files": len(extracted),
+        "size": sum(m.info.file_size for m in members),
+        "archive_size": archive.size,
+        "transferred": archive.transferred,
+    }
+    if options.checksum:
+        result["manifest"] = str(manifest.absolute())
+    return result
+
+
+def _verify_download(
+    client: "NmrXivClient",
+    item_id: str,
+    url: str,
+    dest_file: Path,
+    digest: str,
+    remote: Optional[dict] = None,
+) -> None:
+    """Re-read a downloaded archive and check it against its checksum and the server's size.
+
+    Raises:
+        NmrXivError: If it does not match (the archive and its manifest are deleted)
+    """
+    if remote is None or remote["size"] is None:
+        try:
+            remote = client.remote_file_info(url)
+        except NmrXivError:
+            remote = {"size": None}
+    size = dest_file.stat().st_size
+    if remote["size"] is not None and size != remote["size"]:
+        problem = f"{size:,} bytes on disk, {remote['size']:,} on the server"
+    elif hash_file(dest_file) != digest:
+        problem = "SHA-256 of the file on disk differs from the downloaded bytes"
+    else:
+        return
+    dest_file.unlink(missing_ok=True)
+    manifest_path(dest_file).unlink(missing_ok=True)
+    raise NmrXivError(f"Verification failed for {item_id}: {problem}")
+
+
+def _download_progress():
+    """Rich progress display for downloads."""
+    from rich.progress import (
+        BarColumn,
+        DownloadColumn,
+        Progress,
+        TextColumn,
+        TimeRemainingColumn,
+        TransferSpeedColumn,
+    )
+
+    return Progress(
+        TextColumn("[bold blue]{task.fields[filename]}", justify="right"),
+        BarColumn(bar_width=40),
+        "[progress.percentage]{task.percentage:>3.1f}%",
+        "•",
+        DownloadColumn(),
+        "•",
+        TransferSpeedColumn(),
+        "•",
+        TimeRemainingColumn(),
+    )
+
+
+def _download_single(
+    client: "NmrXivClient", item_id: str, options: _DownloadOptions, json_output: bool
+) -> None:
+    """Download one item with the classic single-result output."""
+    try:
+        if json_output:
+            # Silent download for JSON output
+            result = _download_item(client, item_id, options)
+            output_json(_report_retries(result, client))
+            return
+
+        # Rich progress bar for human-readable output
+        with _download_progress() as progress:
+            task_id = progress.add_task("download", filename=item_id, total=None)
 
-                    def update_progress(downloaded: int, total: int) -> None:
-                        if total > 0:
-                            progress.update(task_id, total=total, completed=downloaded)
+            def update_progress(downloaded: int, total: int) -> None:
+                if total > 0:
+                    progress.update(task_id, total=total, completed=downloaded)
 
-                    client.download_file(download_url, dest_file, progress_callback=update_progress)
+            result = _download_item(
+                client,
+                item_id,
+                options,
+                progress_callback=update_progress,
+                on_start=lambda name: progress.update(task_id, filename=name),
+            )
 
-            # Get file size
-            file_size = dest_file.stat().st_size
+        from rich.console import Console
+        console = Console()
+        if "file" not in result:
+            console.print(
+                f"\n[green]✓[/green] Extracted {result['total_files']} files of "
+                f"{result['project']} to: {result['extracted_to']}"
+            )
+            console.print(
+                f"  Fetched {result['transferred']:,} of {result['archive_size']:,} "
+                "archive bytes"
+            )
+            return
+        if options.extract:
+            console.print(f"\n[green]✓[/green] Extracted to: {result['extracted_to']}")
+            console.print(f"  Files: {result['total_files']} items")
+        console.print(f"\n[green]✓[/green] Downloaded: {result['file']}")
+        console.print(f"  Size: {result['size']:,} bytes")
 
-            result = {
-                "status": "success",
+    except NmrXivError as e:
+        output_error(e.message, code=e.status_code or 1)
+
+
+def _download_stream(
+    client: "NmrXivClient",
+    ids: List[str],
+    options: _DownloadOptions,
+    jobs: int,
+    progress=None,
+) -> Iterator[dict]:
+    """Download items on a bounded thread pool, yielding result records as they finish.
+
+    With a Rich progress display, each active transfer gets its own bar.
+    On Ctrl-C, queued items are dropped and running transfers stop at their
+    next progress report (keeping their .part files for a resumed run).
+    """
+    import threading
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    stop = threading.Event()
+
+    def run(item_id: str) -> dict:
+        task_id = None
+        if progress is not None:
+            task_id = progress.add_task("download", filename=item_id, total=None)
+
+        def callback(downloaded: int, total: int) -> None:
+            if stop.is_set():
+                raise KeyboardInterrupt
+            if task_id is not None and total > 0:
+                progress.update(task_id, total=total, completed=downloaded)
+
+        def on_start(name: str) -> None:
+            if task_id is not None:
+                progress.update(task_id, filename=name)
+
+        try:
+            return _download_item(client, item_id, options, callback, on_start)
+        except NmrXivError as e:
+            return {
+                "status": "error",
                 "id": item_id,
-                "file": str(dest_file.absolute()),
-                "size": file_size,
+                "message": e.message,
+                "code": e.status_code or 1,
             }
+        finally:
+            if progress is not None:
+                progress.remove_task(task_id)
+
+    pool = ThreadPoolExecutor(max_workers=jobs)
+    futures = [pool.submit(run, item_id) for item_id in ids]
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    except KeyboardInterrupt:
+        # Exit promptly instead of waiting for every running transfer
+        stop.set()
+        raise
+    finally:
+        # Stopped early (Ctrl-C, or the caller closed us): don't start queued items
+        pool.shutdown(wait=not stop.is_set(), cancel_futures=True)
+
+
+def _download_many(
+    client: "NmrXivClient",
+    ids: List[str],
+    options: _DownloadOptions,
+    jobs: int,
+    json_output: bool,
+) -> None:
+    """Download several items on a bounded thread pool and print a summary."""
+    results: dict[str, dict] = {}
+
+    if json_output:
+        for result in _download_stream(client, ids, options, jobs):
+            results[result["id"]] = result
+    else:
+        with _download_progress() as progress:
+            for result in _download_stream(client, ids, options, jobs, progress):
+                results[result["id"]] = result
+
+    ordered = [results[item_id] for item_id in ids]
+    failed = [r for r in ordered if r["status"] != "success"]
+    summary = {
+        "status": "success" if not failed else "partial" if len(failed) < len(ids) else "error",
+        "results": ordered,
+        "count": len(ids),
+        "succeeded": len(ids) - len(failed),
+        "failed": len(failed),
+        "size": sum(r.get("size", 0) for r in ordered),
+    }
+    _report_retries(summary, client)
+
+    if json_output:
+        output_json(summary)
+    else:
+        columns = [("id", "ID"), ("status", "Status"), ("size", "Size"), ("file", "File")]
+        rows = [
+            {**r, "file": r.get("file") or r.get("extracted_to") or r.get("message")}
+            for r in ordered
+        ]
+        footer = f"{summary['succeeded']} of {len(ids)} downloads succeeded, {summary['size']:,} bytes"
+        output_table(rows, columns, title="Downloads", footer=footer)
+
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def ls(
+    item_id: str = typer.Argument(..., help="Item identifier (e.g., P5, D410)"),
+    include: Optional[List[str]] = typer.Option(
+        None, "--include", help="Only list members matching this glob (repeatable)"
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None, "--exclude", help="Skip members matching this glob (repeatable)"
+    ),
+    fmt: Optional[str] = typer.Option(
+        None, "--format", help="Output format: json, ndjson, table (overrides --json/--no-json)"
+    ),
+    json_output: bool = typer.Option(True, "--json/--no-json", help="Output as JSON"),
+) -> None:
+    """List the files in an item's archive without downloading it.
 
-            # Extract if requested
-            if extract:
-                extract_dir = out_path / item_id
+    Only the archive's central directory is fetched, with HTTP Range requests.
+
+    Examples:
+        nmrxiv ls P5
+        nmrxiv ls P5 --include acqus --no-json
+        nmrxiv ls P5 --format ndjson | jq -r .name
+    """
+    fmt = _output_format(fmt, json_output)
+    try:
+        with _make_client() as client:
+            archive, project_id, prefix = _open_archive(client, item_id)
+            with archive:
+                members = [m.to_dict() for m in archive.select(include, exclude, prefix=prefix)]
+                url = archive.url
+                transferred = archive.transferred
+                size = archive.size
+    except NmrXivError as e:
+        output_error(e.message, code=e.status_code or 1)
+        return
+
+    if fmt == "ndjson":
+        output_ndjson_items(members)
+    elif fmt == "json":
+        output_json(
+            _report_retries(
+                {
+                    "id": item_id,
+                    **({"project": project_id, "path": prefix} if project_id else {}),
+                    "url": url,
+                    "archive_size": size,
+                    "transferred": transferred,
+                    "count": len(members),
+                    "size": sum(m["size"] for m in members),
+                    "members": members,
+                },
+                client,
+            )
+        )
+    else:
+        columns = [("name", "Name"), ("size", "Size"), ("modified", "Modified")]
+        footer = (
+            f"{len(members)} files, {sum(m['size'] for m in members):,} bytes uncompressed "
+            f"({transferred:,} of {size:,} archive bytes fetched)"
+        )
+        output_table(members, columns, title=f"{item_id}: {url.split('/')[-1]}", footer=footer)
+
+
+@app.command()
+def get(
+    item_id: str = typer.Argument(..., help="Item identifier (e.g., P5, D410)"),
+    include: List[str] = typer.Option(
+        ..., "--include", help="Extract members matching this glob (repeatable)"
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None, "--exclude", help="Skip members matching this glob (repeatable)"
+    ),
+    output_dir: str = typer.Option(".", "--output", "-o", help="Output directory"),
+    json_output: bool = typer.Option(True, "--json/--no-json", help="Output as JSON"),
+) -> None:
+    """Extract selected files from an item's archive without downloading all of it.
+
+    Reads the archive's central directory, then fetches only the byte
+    ranges of matching members and decompresses them locally into
+    <output>/<item_id>/, the same layout as 'download --extract'.
+
+    Examples:
+        nmrxiv get P5 --include '*/pdata/1/1r'
+        nmrxiv get P5 --include acqus --include acqu2s --output ./params
+    """
+    extract_dir = Path(output_dir) / item_id
+    try:
+        with _make_client() as client:
+            archive, _, prefix = _open_archive(client, item_id)
+            with archive:
+                members = archive.select(include, exclude, prefix=prefix)
+                if not members:
+                    output_error(f"No files in {item_id} match the given patterns")
+                    return
                 extract_dir.mkdir(parents=True, exist_ok=True)
+                extracted = archive.extract(members, extract_dir)
+                transferred = archive.transferred
+                size = archive.size
+    except OSError as e:
+        output_error(f"Extraction failed for {item_id}: {e}")
+        return
+    except NmrXivError as e:
+        output_error(e.message, code=e.status_code or 1)
+        return
 
-                with zipfile.ZipFile(dest_file, "r") as zf:
-                    zf.extractall(extract_dir)
-                    total_files = len(zf.namelist())
+    result = {
+        "status": "success",
+        "id": item_id,
+        "extracted_to": str(extract_dir.absolute()),
+        "files": extracted[:20],
+        "total_files": len(extracted),
+        "size": sum(m.info.file_size for m in members),
+        "archive_size": size,
+        "transferred": transferred,
+    }
+    if json_output:
+        output_json(_report_retries(result, client))
+    else:
+        from rich.console import Console
 
-                # List top-level contents of extracted directory
-                top_level = [p.name for p in extract_dir.iterdir()]
-                result["extracted_to"] = str(extract_dir.absolute())
-                result["files"] = top_level[:20]  # Limit to first 20 items
-                result["total_files"] = total_files
+        console = Console()
+        console.print(f"[green]✓[/green] Extracted {len(extracted)} files to: {result['extracted_to']}")
+        console.print(f"  Fetched {transferred:,} of {size:,} archive bytes")
 
-                if not json_output:
-                    from rich.console import Console
-                    console = Console()
-                    console.print(f"\n[green]✓[/green] Extracted to: {extract_dir}")
-                    console.print(f"  Files: {total_files} items")
 
-            if json_output:
-                output_json(result)
-            else:
-                from rich.console import Console
-                console = Console()
-                console.print(f"\n[green]✓[/green] Downloaded: {dest_file}")
-                console.print(f"  Size: {file_size:,} bytes")
+@app.command()
+def plan(
+    item_ids: Optional[List[str]] = typer.Argument(
+        None, help="Item identifiers to plan (e.g., P5 P11); '-' reads stdin"
+    ),
+    from_file: Optional[Path] = typer.Option(
+        None, "--from-file", "-f", help="Read identifiers from a file (one per line)"
+    ),
+    output_dir: str = typer.Option(".", "--output", "-o", help="Output directory"),
+    extract: bool = typer.Option(
+        False, "--extract", "-x", help="Include extraction in the disk-space estimate"
+    ),
+    resume: bool = typer.Option(
+        True, "--resume/--no-resume", help="Count resumable partial downloads as done"
+    ),
+    store: bool = typer.Option(
+        False,
+        "--store/--no-store",
+        envvar="NMRXIV_USE_STORE",
+        help="Count archives already in the content store as done",
+    ),
+    order: str = typer.Option(
+        "input", "--order", help="Queue order: input, smallest (first results sooner), largest"
+    ),
+    priority: Optional[List[str]] = typer.Option(
+        None, "--priority", help="Download this item before all others (repeatable)"
+    ),
+    json_output: bool = typer.Option(True, "--json/--no-json", help="Output as JSON"),
+) -> None:
+    """Size a batch of downloads and check that it fits on disk.
+
+    Resolves every item and sends HEAD requests for all archives
+    concurrently, then reports the download queue with sizes, the total
+    bytes to transfer and the free space at the destination. Nothing is
+    downloaded. Exits with code 1 if the downloads would not fit.
+
+    Examples:
+        nmrxiv plan P5 P11 P23 --output /data
+        nmrxiv plan -f ids.txt --order smallest --extract
+        nmrxiv plan -f ids.txt --priority P11 --no-json
+    """
+    ids = _read_ids(item_ids, from_file)
+    if not ids:
+        output_error("Please provide at least one item identifier")
+        return
+    if order not in ORDERS:
+        output_error(f"Unknown order: {order}. Use 'input', 'smallest' or 'largest'.")
+        return
+
+    options = _DownloadOptions(
+        out_path=Path(output_dir),
+        extract=extract,
+        resume=resume,
+        store=ContentStore() if store else None,
+    )
+    try:
+        with _make_client() as client:
+            _output_plan(_plan(client, ids, options, order, priority), json_output)
+    finally:
+        if options.store is not None:
+            options.store.close()
+
+
+def _plan(
+    client: "NmrXivClient",
+    ids: List[str],
+    options: _DownloadOptions,
+    order: str,
+    priority: Optional[List[str]],
+):
+    """Size and order the download queue for ids (see plan.plan_downloads)."""
+    from .plan import plan_downloads
+
+    return plan_downloads(
+        client,
+        ids,
+        options.out_path,
+        order=order,
+        priority=priority,
+        extract=options.extract,
+        resume=options.resume,
+        store=options.store,
+    )
+
+
+def _output_plan(plan, json_output: bool) -> None:
+    """Print a download plan; exit 1 if it does not fit on disk."""
+    if json_output:
+        output_json(plan.to_dict())
+    else:
+        columns = [
+            ("id", "ID"),
+            ("size", "Size"),
+            ("download_bytes", "To download"),
+            ("note", "Note"),
+            ("file", "File"),
+        ]
+        rows = []
+        for record in plan.to_dict()["queue"]:
+            note = record.get("message") or (
+                "in store" if record.get("store") else
+                "resumable" if record.get("resumable") else
+                f"files from {record['slice_of']}" if record.get("slice_of") else
+                "size unknown" if record.get("size") is None else ""
+            )
+            rows.append({**record, "note": note})
+        verdict = "fits" if plan.fits else "does NOT fit"
+        needed = f"{plan.required_bytes:,} needed"
+        if plan.lower_bound:
+            needed = f"at least {needed} ({len(plan.unknown)} of unknown size)"
+            verdict = f"{verdict} as far as known"
+        footer = (
+            f"{plan.download_bytes:,} bytes to download, {needed}, "
+            f"{plan.free:,} free in {plan.dest}: {verdict}"
+        )
+        output_table(rows, columns, title="Download plan", footer=footer)
+    if not plan.fits:
+        raise typer.Exit(code=1)
+
 
+@app.command()
+def verify(
+    paths: Optional[List[Path]] = typer.Argument(
+        None, help="Archives, .sha256 manifests or directories to search (default: .)"
+    ),
+    json_output: bool = typer.Option(True, "--json/--no-json", help="Output as JSON"),
+) -> None:
+    """Check downloaded archives against their SHA-256 manifests.
+
+    Examples:
+        nmrxiv verify                   # Every manifest below the current directory
+        nmrxiv verify /data/P5.zip      # One archive
+    """
+    manifests: List[Path] = []
+    results: List[dict] = []
+    for path in paths or [Path(".")]:
+        if path.is_dir():
+            manifests.extend(sorted(path.rglob("*.sha256")))
+        elif path.suffix == ".sha256":
+            manifests.append(path)
+        elif manifest_path(path).exists():
+            manifests.append(manifest_path(path))
+        else:
+            results.append({"file": str(path), "status": "missing", "message": "No manifest"})
+    for manifest in manifests:
+        try:
+            results.extend(verify_manifest(manifest))
+        except OSError as e:
+            results.append({"file": str(manifest), "status": "missing", "message": str(e)})
+
+    failed = [r for r in results if r["status"] != "ok"]
+    summary = {
+        "status": "success" if not failed else "error",
+        "results": results,
+        "count": len(results),
+        "ok": len(results) - len(failed),
+        "failed": len(failed),
+    }
+    if json_output:
+        output_json(summary)
+    else:
+        columns = [("file", "File"), ("status", "Status")]
+        footer = f"{summary['ok']} of {len(results)} files verified"
+        output_table(results, columns, title="Verify", footer=footer)
+
+    if failed or not results:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def serve(
+    socket_path: Optional[Path] = typer.Option(
+        None, "--socket", help="Unix socket to listen on (default: $NMRXIV_SOCKET or runtime dir)"
+    ),
+) -> None:
+    """Run a local daemon that answers show, list and search without startup cost.
+
+    While it runs, 'nmrxiv show/list/search' invocations are sent to it and
+    reuse its warm connection pool and open response cache. Stop it with
+    Ctrl-C. Set NMRXIV_NO_DAEMON=1 to bypass it.
+
+    Examples:
+        nmrxiv serve &
+        nmrxiv show P5       # answered by the daemon
+    """
+    from .client import NmrXivClient
+    from .daemon import default_socket_path
+    from .daemon import serve as serve_daemon
+
+    path = socket_path or default_socket_path()
+    _shared["http"] = NmrXivClient.make_http_client()
+    _shared["cache"] = _open_cache()
+    try:
+        serve_daemon(_run_forwarded, path)
+    except OSError as e:
+        output_error(f"Cannot start daemon: {e}")
+    finally:
+        _shared["http"].close()
+        if _shared["cache"] is not None:
+            _shared["cache"].close()
+        _shared.clear()
+
+
+def _run_forwarded(argv: List[str]) -> int:
+    """Run a command line sent to the daemon, returning its exit code.
+
+    The daemon handles each connection on its own thread; commands are
+    serialized here because they share the global settings and the console.
+    """
+    try:
+        with _forwarded_lock:
+            app(args=argv, prog_name="nmrxiv")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    return 0
+
+
+@cache_app.command("stats")
+def cache_stats(
+    json_output: bool = typer.Option(True, "--json/--no-json", help="Output as JSON"),
+) -> None:
+    """Show response cache location, entry counts and size."""
+    import sqlite3
+
+    try:
+        cache = ResponseCache()
+    except (OSError, sqlite3.Error) as e:
+        output_error(f"Cannot open cache: {e}")
+        return
+    stats = cache.stats()
+    cache.close()
+    if json_output:
+        output_json(stats)
+    else:
+        columns = [
+            ("entries", "Entries"),
+            ("fresh", "Fresh"),
+            ("stale", "Stale"),
+            ("size", "Size (bytes)"),
+            ("max_size", "Limit (bytes)"),
+        ]
+        output_table([stats], columns, title="Response cache", footer=stats["path"])
+
+
+@cache_app.command("clear")
+def cache_clear(
+    json_output: bool = typer.Option(True, "--json/--no-json", help="Output as JSON"),
+) -> None:
+    """Delete all cached responses."""
+    import sqlite3
+
+    try:
+        cache = ResponseCache()
+    except (OSError, sqlite3.Error) as e:
+        output_error(f"Cannot open cache: {e}")
+        return
+    removed = cache.clear()
+    cache.close()
+    if json_output:
+        output_json({"status": "success", "removed": removed})
+    else:
+        from rich.console import Console
+        Console().print(f"[green]✓[/green] Removed {removed} cached responses")
+
+
+def _refresh_index(rebuild: bool, json_output: bool) -> None:
+    """Shared implementation of 'index build' and 'index update'."""
+    import asyncio
+    import sqlite3
+
+    async def run(index: CatalogIndex):
+        async with _make_async_client() as client:
+            return await index.refresh(client, rebuild=rebuild), client.retries
+
+    try:
+        with CatalogIndex() as index:
+            changes, retries = asyncio.run(run(index))
+            info = index.info()
+    except sqlite3.Error as e:
+        output_error(f"Index error: {e}")
+        return
     except NmrXivError as e:
         output_error(e.message, code=e.status_code or 1)
+        return
+
+    result = {"status": "success", **info, "changes": changes.summary()}
+    if retries:
+        result["retries"] = retries
+    if json_output:
+        output_json(result)
+    else:
+        rows = [
+            {"kind": kind, "total": info["counts"][kind], **{
+                change: counts[kind] for change, counts in changes.summary().items()
+            }}
+            for kind in KINDS
+        ]
+        columns = [
+            ("kind", "Kind"),
+            ("total", "Indexed"),
+            ("added", "Added"),
+            ("updated", "Updated"),
+            ("removed", "Removed"),
+        ]
+        output_table(rows, columns, title="Catalog index", footer=info["path"])
+
+
+@app.command()
+def sync(
+    download_dir: Optional[Path] = typer.Option(
+        None, "--download", "-d", help="Re-download archives of added/updated projects here"
+    ),
+    extract: bool = typer.Option(False, "--extract", "-x", help="Extract downloaded archives"),
+    jobs: int = typer.Option(4, "--jobs", "-j", min=1, help="Concurrent downloads"),
+) -> None:
+    """Sync the local index and print what changed as NDJSON.
+
+    Emits one line per added, updated or removed item since the previous
+    sync, then a summary line. Sync keeps its own cursor (a snapshot of
+    every item's updated_at), so running 'index update' in between does not
+    hide changes from it. The first sync reports the whole catalog as added.
+
+    The listing API can neither filter nor sort by updated_at, and removed
+    items only show up as missing, so every sync still walks all listing
+    pages (concurrently); the cursor bounds what is reported, not what is
+    fetched.
+
+    Examples:
+        nmrxiv sync                          # Change feed only
+        nmrxiv sync --download /mirror -x    # Also fetch changed project archives
+    """
+    import asyncio
+    import sqlite3
+
+    async def run(index: CatalogIndex):
+        async with _make_async_client() as client:
+            return await index.refresh(client), client.retries
+
+    try:
+        with CatalogIndex() as index:
+            since = index.sync_watermarks()
+            _, retries = asyncio.run(run(index))
+            changes = index.sync_changes()
+            watermarks = index.sync_watermarks()
+    except sqlite3.Error as e:
+        output_error(f"Index error: {e}")
+        return
+    except NmrXivError as e:
+        output_error(e.message, code=e.status_code or 1)
+        return
+
+    for record in changes.records():
+        output_ndjson({"event": "change", **record})
+
+    downloads = {"succeeded": 0, "failed": 0}
+    if download_dir is not None:
+        changed = [
+            short_id(entry["identifier"])
+            for entry in changes.added["project"] + changes.updated["project"]
+            if entry["identifier"]
+        ]
+        options = _DownloadOptions(out_path=download_dir, extract=extract)
+        options.out_path.mkdir(parents=True, exist_ok=True)
+        with _make_client() as client:
+            for result in _download_stream(client, changed, options, jobs):
+                downloads["succeeded" if result["status"] == "success" else "failed"] += 1
+                output_ndjson({"event": "download", **result})
+        retries += client.retries
+
+    summary = {"event": "summary", "since": since, "watermarks": watermarks, **changes.summary()}
+    if download_dir is not None:
+        summary["downloads"] = downloads
+    if retries:
+        summary["retries"] = retries
+    output_ndjson(summary)
+
+
+@app.command()
+def mirror(
+    dest: Path = typer.Argument(
+        ..., help="Mirror directory (archives, manifests and the work queue)"
+    ),
+    extract: bool = typer.Option(
+        False, "--extract", "-x", help="Extract each archive into <dest>/<id>/"
+    ),
+    include: Optional[List[str]] = typer.Option(
+        None, "--include", help="Only extract members matching this glob (repeatable)"
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None, "--exclude", help="Skip members matching this glob when extracting (repeatable)"
+    ),
+    delete_archive: bool = typer.Option(
+        False, "--delete-archive", help="Delete each ZIP after a successful extraction"
+    ),
+    jobs: int = typer.Option(4, "--jobs", "-j", min=1, help="Concurrent downloads"),
+    segments: int = typer.Option(
+        1, "--segments", min=1, help="Parallel connections per archive (byte ranges)"
+    ),
+    refresh: bool = typer.Option(
+        True,
+        "--refresh/--no-refresh",
+        help="Walk the catalog for new and updated projects first; "
+        "--no-refresh only works through the existing queue",
+    ),
+    retry_failed: bool = typer.Option(
+        True, "--retry-failed/--skip-failed", help="Attempt projects that failed in earlier runs"
+    ),
+    limit: Optional[int] = typer.Option(
+        None, "--limit", min=1, help="Mirror at most this many projects in this run"
+    ),
+    json_output: bool = typer.Option(True, "--json/--no-json", help="Output as NDJSON"),
+) -> None:
+    """Mirror every public project archive into a directory.
+
+    Walks the project listing, queues projects that are new or changed
+    since the last run, then downloads, verifies (size and SHA-256 of the
+    file on disk) and optionally extracts each one. The queue is kept in
+    <dest>/.nmrxiv-mirror.sqlite3 and every finished item is committed, so
+    running the same command again after a crash or Ctrl-C carries on where
+    it stopped. Reports one NDJSON line per item with progress, throughput
+    and ETA, then a summary.
+
+    Examples:
+        nmrxiv mirror /archive                  # Mirror (or update) the whole corpus
+        nmrxiv mirror /archive -x -j 8          # Also extract, eight downloads at a time
+        nmrxiv mirror /archive --no-refresh     # Resume without re-walking the catalog
+        nmrxiv verify /archive                  # Re-check every archive later
+    """
+    import asyncio
+    import sqlite3
+
+    from .mirror import MirrorProgress, MirrorQueue
+
+    if (include or exclude or delete_archive) and not extract:
+        output_error("--include, --exclude and --delete-archive require --extract")
+        return
+
+    async def walk() -> List[dict]:
+        async with _make_async_client() as client:
+            projects: List[dict] = []
+            async for page in client.iter_pages("project", raw=True):
+                projects.extend(page.items)
+            return projects
+
+    try:
+        queue = MirrorQueue(dest)
+    except (OSError, sqlite3.Error) as e:
+        output_error(f"Cannot open mirror queue in {dest}: {e}")
+        return
+
+    with queue:
+        if refresh:
+            try:
+                queued = queue.add(asyncio.run(walk()))
+            except NmrXivError as e:
+                output_error(e.message, code=e.status_code or 1)
+                return
+            if json_output:
+                output_ndjson({"event": "walk", **queued})
+        todo = queue.todo(retry_failed)[:limit]
+
+        options = _DownloadOptions(
+            out_path=dest,
+            extract=extract,
+            segments=segments,
+            include=include,
+            exclude=exclude,
+            delete_archive=delete_archive,
+            verify=True,
+        )
+        progress = MirrorProgress(total=len(todo))
+        with _make_client() as client:
+            if json_output:
+                for result in _download_stream(client, todo, options, jobs):
+                    queue.record(result)
+                    progress.add(result)
+                    output_ndjson({"event": "item", **result, "progress": progress.to_dict()})
+            else:
+                with _download_progress() as bars:
+                    for result in _download_stream(client, todo, options, jobs, bars):
+                        queue.record(result)
+                        progress.add(result)
+                        bars.console.print(_mirror_line(result, progress.to_dict()))
+
+        summary = {"event": "summary", "run": progress.to_dict(), "queue": queue.counts()}
+        _report_retries(summary, client)
+
+    if json_output:
+        output_ndjson(summary)
+    else:
+        counts = summary["queue"]
+        typer.echo(
+            f"{progress.done} mirrored, {progress.failed} failed in this run; {counts['done']} "
+            f"of {counts['total']} projects ({counts['bytes']:,} bytes) in {dest}"
+        )
+    if progress.failed:
+        raise typer.Exit(code=1)
+
+
+def _mirror_line(result: dict, progress: dict) -> str:
+    """One console line for a finished mirror item."""
+    eta = progress["eta_s"]
+    status = (
+        f"[green]✓[/green] {result['id']} {result.get('size', 0):,} bytes"
+        if result["status"] == "success"
+        else f"[red]✗[/red] {result['id']} {result['message']}"
+    )
+    return (
+        f"{status}  [dim]({progress['done'] + progress['failed']}/"
+        f"{progress['done'] + progress['failed'] + progress['remaining']}, "
+        f"{progress['mb_s']} MB/s, ETA {'?' if eta is None else f'{eta:.0f}s'})[/dim]"
+    )
+
+
+@index_app.command("build")
+def index_build(
+    json_output: bool = typer.Option(True, "--json/--no-json", help="Output as JSON"),
+) -> None:
+    """Download the full catalog into a fresh local index."""
+    _refresh_index(rebuild=True, json_output=json_output)
+
+
+@index_app.command("update")
+def index_update(
+    json_output: bool = typer.Option(True, "--json/--no-json", help="Output as JSON"),
+) -> None:
+    """Refresh the local index, rewriting only items whose updated_at changed."""
+    _refresh_index(rebuild=False, json_output=json_output)
 
 
 if __name__ == "__main__":
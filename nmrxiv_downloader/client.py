@@ -1,41 +1,466 @@
 """nmrxiv API client."""
 
+from __future__ import annotations
+
+import errno
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterable
+from urllib.parse import quote
 
 import httpx
 
-from .models import Dataset, Molecule, PaginatedResponse, Project, Study
+from . import telemetry
+from .cache import ResponseCache
+from .errors import NmrXivError
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, parse_retry_after
+from .store import hash_file, write_manifest
+
+if TYPE_CHECKING:
+    from .models import Dataset, Molecule, PaginatedResponse, Project, Study
+
+
+def _models():
+    """The pydantic models module, imported on first use.
+
+    Item lookups (show) and downloads work on plain dicts, so they never
+    pay for importing pydantic.
+    """
+    from . import models
+
+    return models
+
+
+def _decode_json(body: bytes | str) -> Any:
+    """Decode a response body (timed as json.decode)."""
+    with telemetry.span("json.decode", bytes=len(body)):
+        return json.loads(body)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type):
+    """Validator for a whole page of items, built once per model."""
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(list[model])
+
+
+@lru_cache(maxsize=None)
+def _record_fields(model: type) -> tuple[str, ...]:
+    return tuple(model.model_fields)
+
+
+def _parse_items(items: list[dict[str, Any]], model: type, raw: bool) -> list[Any]:
+    """Turn the items of a response body into models, or into compact records.
+
+    Models are validated in one call per page rather than one per item.
+    Records (raw=True) skip validation altogether: each is a plain dict of
+    the model's fields with values as the API sent them (timestamps stay
+    ISO 8601 strings), ready to be serialized as-is.
+    """
+    telemetry.count("parse.items", len(items))
+    if raw:
+        with telemetry.span("parse.records", model=model.__name__, items=len(items)):
+            fields = _record_fields(model)
+            return [{field: item.get(field) for field in fields} for item in items]
+    with telemetry.span("parse.models", model=model.__name__, items=len(items)):
+        return _list_adapter(model).validate_python(items)
+
+
+def _paginated(
+    data: dict[str, Any], model: type, page: int, raw: bool = False
+) -> PaginatedResponse:
+    """Build a PaginatedResponse from a /list/* response body."""
+    items = data.get("data", [])
+    meta = data.get("meta", {})
+    return _models().PaginatedResponse(
+        items=_parse_items(items, model, raw),
+        total=meta.get("total", len(items)),
+        page=meta.get("current_page", page),
+        per_page=meta.get("per_page", 100),
+        last_page=meta.get("last_page", 1),
+    )
+
+
+def _molecule_page(data: dict[str, Any], page: int, raw: bool = False) -> PaginatedResponse:
+    """Build a PaginatedResponse from a /search response body."""
+    items = data.get("data", [])
+    models = _models()
+    return models.PaginatedResponse(
+        items=_parse_items(items, models.Molecule, raw),
+        total=data.get("total", len(items)),
+        page=data.get("current_page", page),
+        per_page=data.get("per_page", 24),
+        last_page=data.get("last_page", 1),
+    )
+
+
+def _search_request(
+    query: str | None, smiles: str | None, page: int
+) -> tuple[str, dict[str, Any] | None]:
+    """Path and JSON body of a molecule search request."""
+    # SMILES may contain '#', '/' and '\\', so it is percent-encoded in the path
+    path = f"/search/{quote(smiles, safe='')}" if smiles else "/search"
+    return f"{path}?page={page}", {"query": query} if query else None
+
+
+def _molecule_key(molecule: Molecule | dict[str, Any]) -> str | int:
+    """Identity of a search hit (model or record) for deduplication (InChIKey, else id)."""
+    if isinstance(molecule, dict):
+        return molecule["inchi_key"] or molecule["standard_inchi_key"] or molecule["id"]
+    return molecule.inchi_key or molecule.standard_inchi_key or molecule.id
+
+
+# Segmented downloads never split a file into ranges smaller than this
+MIN_SEGMENT_SIZE = 1024 * 1024
+
+# Response chunks at least this large are written as they are; smaller
+# ones (e.g. single TLS records) are gathered into writes of WRITE_BUFFER
+DIRECT_WRITE = 64 * 1024
+WRITE_BUFFER = 256 * 1024
+
+# Progress callbacks run at most this often (and once at the end)
+PROGRESS_INTERVAL = 0.1
+
+# Seconds between resume checkpoints of a preallocated download (the bytes
+# written so far are synced to disk, then recorded in the .part.json state)
+CHECKPOINT_INTERVAL = 2.0
+
+_O_BINARY = getattr(os, "O_BINARY", 0)
+_seek_lock = threading.Lock()
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _pwrite(fd: int, data: bytes, offset: int) -> None:
+    """Write data at offset without moving other writers' file position."""
+    view = memoryview(data)
+    if hasattr(os, "pwrite"):
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+        return
+    with _seek_lock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        while view:
+            view = view[os.write(fd, view):]
+
+
+class _ChunkWriter:
+    """Write response chunks to fd at increasing offsets, with few system calls.
+
+    Chunks of DIRECT_WRITE bytes or more go straight from the response
+    buffer to the file. Smaller ones are copied into one reused buffer and
+    written (and hashed) from a memoryview of it once it fills. Larger
+    buffers were measured to be slower: the copy then no longer stays in
+    the CPU cache.
+
+    Attributes:
+        position: File offset after the last byte written
+    """
+
+    def __init__(self, fd: int, offset: int, hasher: hashlib._Hash | None = None):
+        self._fd = fd
+        self._hasher = hasher
+        self._buffer = bytearray(WRITE_BUFFER)
+        self._view = memoryview(self._buffer)
+        self._filled = 0
+        self._write_time = 0.0
+        self.position = offset
+
+    def write(self, chunk: bytes) -> None:
+        size = len(chunk)
+        if size >= DIRECT_WRITE:
+            self.flush()
+            self._write(chunk)
+            return
+        if self._filled + size > WRITE_BUFFER:
+            self.flush()
+        self._buffer[self._filled:self._filled + size] = chunk
+        self._filled += size
+
+    @property
+    def accepted(self) -> int:
+        """File offset after the last byte passed to write(), including buffered ones."""
+        return self.position + self._filled
+
+    def flush(self) -> None:
+        if self._filled:
+            filled, self._filled = self._filled, 0
+            self._write(self._view[:filled])
+
+    def _write(self, data: bytes | memoryview) -> None:
+        start = time.perf_counter()
+        _pwrite(self._fd, data, self.position)
+        if self._hasher is not None:
+            self._hasher.update(data)
+        self._write_time += time.perf_counter() - start
+        self.position += len(data)
+
+    def close(self) -> int:
+        """Flush and report the write time to telemetry; returns the end position."""
+        self.flush()
+        self._view.release()
+        telemetry.add_time("disk.write", self._write_time)
+        return self.position
+
+
+def _preallocate(fd: int, offset: int, length: int) -> bool:
+    """Reserve disk space for length bytes from offset (extends the file).
+
+    Returns False where posix_fallocate is unavailable or unsupported by
+    the filesystem.
+
+    Raises:
+        NmrXivError: If the disk is full
+    """
+    if length <= 0 or not hasattr(os, "posix_fallocate"):
+        return False
+    try:
+        os.posix_fallocate(fd, offset, length)
+    except OSError as e:
+        if e.errno == errno.ENOSPC:
+            raise NmrXivError(f"Not enough disk space for {length} bytes") from e
+        return False
+    return True
+
+
+def _throttled(callback: Callable[[int, int], None]) -> Callable[[int, int], None]:
+    """Wrap a progress callback to run at most every PROGRESS_INTERVAL seconds.
+
+    Completion (done == total) is always reported.
+    """
+    last = 0.0
+
+    def report(done: int, total: int) -> None:
+        nonlocal last
+        now = time.monotonic()
+        if now - last >= PROGRESS_INTERVAL or done == total:
+            last = now
+            callback(done, total)
+
+    return report
+
+
+def _download_error(e: httpx.HTTPStatusError) -> NmrXivError:
+    """NmrXivError for a failed download response."""
+    return NmrXivError(
+        f"Download failed: HTTP {e.response.status_code}",
+        status_code=e.response.status_code,
+        retry_after=parse_retry_after(e.response.headers.get("retry-after")),
+    )
+
+
+def _partial_path(dest: Path) -> Path:
+    """Path of the in-progress download for dest."""
+    return dest.with_name(dest.name + ".part")
+
+
+def _partial_state_path(dest: Path) -> Path:
+    """Path of the JSON file recording which remote version a .part file holds."""
+    return dest.with_name(dest.name + ".part.json")
+
+
+def _resume_validator(headers: httpx.Headers) -> str | None:
+    """Validator usable in If-Range, or None if the response cannot be resumed.
+
+    Requires byte-range support and a strong ETag or a Last-Modified date
+    (weak ETags are not allowed in If-Range).
+    """
+    if headers.get("accept-ranges", "").lower() != "bytes":
+        return None
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("last-modified")
+
+
+def _parse_content_range(value: str | None) -> tuple[int, int, int | None] | None:
+    """Parse 'bytes start-end/total' (or 'bytes */total') into (start, end, total)."""
+    if not value or not value.startswith("bytes "):
+        return None
+    spec, _, total = value[6:].partition("/")
+    try:
+        size = None if total in ("", "*") else int(total)
+        if spec == "*":
+            return (-1, -1, size)
+        start, _, end = spec.partition("-")
+        return (int(start), int(end), size)
+    except ValueError:
+        return None
 
 
-class NmrXivError(Exception):
-    """Exception for nmrxiv API errors."""
+def _load_partial(dest: Path, url: str) -> tuple[int, str | None]:
+    """Return (bytes on disk, If-Range validator) for a resumable partial download."""
+    part = _partial_path(dest)
+    try:
+        state = json.loads(_partial_state_path(dest).read_text())
+        size = part.stat().st_size
+    except (OSError, ValueError):
+        return 0, None
+    if state.get("url") != url or not state.get("validator"):
+        return 0, None
+    if state.get("preallocated"):
+        # Interrupted before it was trimmed: the file size says nothing about
+        # how many bytes were written, the last checkpoint does
+        return min(state.get("written", 0), size), state["validator"]
+    return size, state["validator"]
 
-    def __init__(self, message: str, status_code: int | None = None):
-        self.message = message
-        self.status_code = status_code
-        super().__init__(message)
+
+def resumable_bytes(dest: Path, url: str, validators: tuple[str | None, ...]) -> int:
+    """Bytes of an earlier partial download of url to dest that a resume would keep.
+
+    Args:
+        dest: Destination path of the archive
+        url: Archive URL
+        validators: The server's current ETag and Last-Modified; the partial
+            file only counts if it was started from that version of the file
+
+    Returns:
+        Bytes already on disk, or 0 if the download would start over
+    """
+    offset, validator = _load_partial(dest, url)
+    if not offset or validator is None or validator not in validators:
+        return 0
+    return offset
+
+
+def _save_partial(dest: Path, url: str, headers: httpx.Headers) -> None:
+    """Record the remote version of a fresh download so it can be resumed."""
+    state_file = _partial_state_path(dest)
+    validator = _resume_validator(headers)
+    if validator is None:
+        state_file.unlink(missing_ok=True)
+        return
+    state_file.write_text(json.dumps({"url": url, "validator": validator}))
+
+
+def _mark_preallocated(dest: Path, written: int | None) -> None:
+    """Flag a resumable partial download as extended beyond its written bytes.
+
+    written is the checkpoint: bytes known to be on disk (None clears the flag).
+    The state file is replaced atomically, so a crash leaves the old or the
+    new checkpoint, never a torn one.
+    """
+    state_file = _partial_state_path(dest)
+    try:
+        state = json.loads(state_file.read_text())
+    except (OSError, ValueError):
+        return
+    if written is not None:
+        state.update(preallocated=True, written=written)
+    else:
+        state.pop("preallocated", None)
+        state.pop("written", None)
+    tmp = state_file.with_name(state_file.name + ".tmp")
+    tmp.write_text(json.dumps(state))
+    os.replace(tmp, state_file)
+
+
+def _discard_partial(dest: Path) -> None:
+    """Delete any partial download for dest."""
+    _partial_path(dest).unlink(missing_ok=True)
+    _partial_state_path(dest).unlink(missing_ok=True)
+
+
+def http2_available() -> bool:
+    """Whether the optional h2 package is installed (pip install nmrxiv-downloader[http2])."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def _finish_partial(dest: Path) -> Path:
+    """Move a completed partial download into place."""
+    _partial_path(dest).replace(dest)
+    _partial_state_path(dest).unlink(missing_ok=True)
+    return dest
+
+
+def _download_http_client() -> httpx.Client:
+    """A separate client for archive downloads (no base_url, long timeout)."""
+    return httpx.Client(
+        timeout=300.0, follow_redirects=True, event_hooks=telemetry.http_hooks()
+    )
+
+
+async def _bounded(fetch: Callable[[Any], Any], args: Iterable[Any], limit: int) -> AsyncIterator:
+    """Await fetch(arg) for every arg, yielding results in completion order.
+
+    At most `limit` calls are in flight or waiting to be consumed at any
+    time; unfinished calls are cancelled when the consumer stops early.
+    """
+    import asyncio
+
+    args = iter(args)
+    pending: set[asyncio.Task] = set()
+    try:
+        while True:
+            for arg in args:
+                pending.add(asyncio.create_task(fetch(arg)))
+                if len(pending) >= limit:
+                    break
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
 
 
 class NmrXivClient:
     """Client for nmrxiv.org REST API."""
 
-    BASE_URL = "https://nmrxiv.org/api/v1"
+    # $NMRXIV_API_URL points the client at another deployment (or a local mock)
+    BASE_URL = os.environ.get("NMRXIV_API_URL", "https://nmrxiv.org/api/v1")
 
-    def __init__(self, timeout: float = 30.0):
-        """Initialize client with configurable timeout."""
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        cache: ResponseCache | None = None,
+        retry: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        http_client: httpx.Client | None = None,
+    ):
+        """Initialize client with timeout, response cache, retry policy and rate limits.
+
+        An http_client (with base_url set to BASE_URL) lets several clients
+        share one warm connection pool; its owner then also manages the
+        cache's lifetime, and close() leaves both open.
+        """
         self._timeout = timeout
-        self._client: httpx.Client | None = None
+        self._cache = cache
+        self._retry = retry or RetryPolicy()
+        self._limiter = rate_limiter or RateLimiter()
+        self._client: httpx.Client | None = http_client
+        self._shared = http_client is not None
+        self._retries_lock = threading.Lock()
+        self.retries = 0  # Retries performed so far, across requests and downloads
+
+    @classmethod
+    def make_http_client(cls, timeout: float = 30.0) -> httpx.Client:
+        """Create an httpx client for the API (shareable via http_client)."""
+        return httpx.Client(
+            base_url=cls.BASE_URL,
+            timeout=timeout,
+            headers={"Accept": "application/json"},
+            event_hooks=telemetry.http_hooks(),
+        )
 
     @property
     def client(self) -> httpx.Client:
         """Get or create httpx client."""
         if self._client is None:
-            self._client = httpx.Client(
-                base_url=self.BASE_URL,
-                timeout=self._timeout,
-                headers={"Accept": "application/json"},
-            )
+            self._client = self.make_http_client(self._timeout)
         return self._client
 
     def __enter__(self) -> "NmrXivClient":
@@ -47,56 +472,100 @@ class NmrXivClient:
         self.close()
 
     def close(self) -> None:
-        """Close the HTTP client."""
+        """Close the HTTP client and the response cache (unless shared)."""
+        if self._shared:
+            return
         if self._client is not None:
             self._client.close()
             self._client = None
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
 
     def _request(self, method: str, path: str, **kwargs) -> Any:
-        """Make HTTP request with error handling."""
-        try:
-            response = self.client.request(method, path, **kwargs)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise NmrXivError(
-                f"HTTP {e.response.status_code}: {e.response.text}",
-                status_code=e.response.status_code,
-            ) from e
-        except httpx.RequestError as e:
-            raise NmrXivError(f"Request failed: {e}") from e
+        """Make HTTP request with error handling, served from cache when possible."""
+        with telemetry.span("api.request", method=method, path=path):
+            if self._cache is None:
+                return _decode_json(self._send(method, path, **kwargs).content)
+
+            key = self._cache.key(method, path, kwargs.get("json"))
+            entry = self._cache.get(key)
+            if entry is not None and entry.fresh:
+                telemetry.count("cache.hits")
+                return _decode_json(entry.body)
+
+            headers = entry.validators() if entry is not None else {}
+            response = self._send(method, path, headers=headers, **kwargs)
+            if response.status_code == 304 and entry is not None:
+                telemetry.count("cache.revalidated")
+                self._cache.refresh(key, path)
+                return _decode_json(entry.body)
+
+            telemetry.count("cache.misses")
+            self._cache.put(
+                key,
+                method,
+                path,
+                response.content,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
+            return _decode_json(response.content)
+
+    def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send HTTP request, mapping transport and HTTP errors to NmrXivError.
+
+        Transient failures are retried according to the retry policy when the
+        request is safe to repeat. A 304 Not Modified is returned as-is for
+        conditional requests.
+        """
+        retryable = self._retry.allows(method, path)
+        attempt = 1
+        while True:
+            try:
+                with self._limiter.slot():
+                    self._limiter.request()
+                    response = self.client.request(method, path, **kwargs)
+                if response.status_code != 304:
+                    response.raise_for_status()
+                return response
+            except httpx.HTTPStatusError as e:
+                error = NmrXivError(
+                    f"HTTP {e.response.status_code}: {e.response.text}",
+                    status_code=e.response.status_code,
+                    retry_after=parse_retry_after(e.response.headers.get("retry-after")),
+                )
+                cause: Exception = e
+            except httpx.RequestError as e:
+                error = NmrXivError(f"Request failed: {e}")
+                cause = e
+            if not (retryable and self._retry.should_retry(attempt, error.status_code)):
+                raise error from cause
+            self._wait_before_retry(attempt, error)
+            attempt += 1
 
-    def list_projects(self, page: int = 1) -> PaginatedResponse:
-        """List projects with pagination."""
+    def _wait_before_retry(self, attempt: int, error: NmrXivError) -> None:
+        """Count a retry and sleep for the policy's backoff delay."""
+        with self._retries_lock:
+            self.retries += 1
+        telemetry.count("http.retries")
+        time.sleep(self._retry.delay(attempt, error.retry_after))
+
+    def list_projects(self, page: int = 1, raw: bool = False) -> PaginatedResponse:
+        """List projects with pagination (raw=True: compact records instead of models)."""
         data = self._request("GET", f"/list/projects?page={page}")
-        items = data.get("data", [])
-        meta = data.get("meta", {})
-        return PaginatedResponse(
-            items=[Project(**item) for item in items],
-            total=meta.get("total", len(items)),
-            page=meta.get("current_page", page),
-            per_page=meta.get("per_page", 100),
-            last_page=meta.get("last_page", 1),
-        )
+        return _paginated(data, _models().Project, page, raw)
 
     def list_studies(self) -> list[Study]:
         """List all studies."""
         data = self._request("GET", "/list/studies")
         items = data.get("data", data) if isinstance(data, dict) else data
-        return [Study(**item) for item in items]
+        return _list_adapter(_models().Study).validate_python(items)
 
-    def list_datasets(self, page: int = 1) -> PaginatedResponse:
-        """List datasets with pagination."""
+    def list_datasets(self, page: int = 1, raw: bool = False) -> PaginatedResponse:
+        """List datasets with pagination (raw=True: compact records instead of models)."""
         data = self._request("GET", f"/list/datasets?page={page}")
-        items = data.get("data", [])
-        meta = data.get("meta", {})
-        return PaginatedResponse(
-            items=[Dataset(**item) for item in items],
-            total=meta.get("total", len(items)),
-            page=meta.get("current_page", page),
-            per_page=meta.get("per_page", 100),
-            last_page=meta.get("last_page", 1),
-        )
+        return _paginated(data, _models().Dataset, page, raw)
 
     def get_item(self, item_id: str) -> dict[str, Any]:
         """Get item by identifier."""
@@ -104,7 +573,11 @@ class NmrXivClient:
         return data.get("data", data) if isinstance(data, dict) else data
 
     def search_molecules(
-        self, query: str | None = None, smiles: str | None = None, page: int = 1
+        self,
+        query: str | None = None,
+        smiles: str | None = None,
+        page: int = 1,
+        raw: bool = False,
     ) -> PaginatedResponse:
         """Search molecules by name/synonym or SMILES substructure.
 
@@ -112,52 +585,49 @@ class NmrXivClient:
             query: Search by compound name or synonym
             smiles: Search by SMILES substructure
             page: Page number (default 1)
+            raw: Return compact records (unvalidated dicts) instead of models
 
         Returns:
-            PaginatedResponse with Molecule objects
-        """
-        path = f"/search/{smiles}" if smiles else "/search"
-        body = {}
-        if query:
-            body["query"] = query
-
-        data = self._request("POST", path, json=body if body else None)
-        items = data.get("data", [])
-        return PaginatedResponse(
-            items=[Molecule(**item) for item in items],
-            total=data.get("total", len(items)),
-            page=data.get("current_page", page),
-            per_page=data.get("per_page", 24),
-            last_page=data.get("last_page", 1),
-        )
+            PaginatedResponse with Molecule objects (or records)
+        """
+        path, body = _search_request(query, smiles, page)
+        data = self._request("POST", path, json=body)
+        return _molecule_page(data, page, raw)
 
     def filter_datasets(
-        self, experiment_type: str, page: int = 1
+        self,
+        experiment_type: str | list[str],
+        page: int = 1,
+        raw: bool = False,
+        match_all: bool = False,
     ) -> PaginatedResponse:
         """Filter datasets by experiment type (client-side filtering).
 
+        Each snapshot of the page is indexed by type term once (see
+        exptypes.index_types); every experiment type is an index lookup.
+
         Args:
-            experiment_type: Experiment type to filter (e.g., "hsqc", "1d-13c", "cosy")
+            experiment_type: Experiment type(s) to filter (e.g., "hsqc", "1d-13c", "cosy")
             page: Page number to fetch
+            raw: Return compact records (unvalidated dicts) instead of models
+            match_all: Datasets must match every experiment type, not any of them
 
         Returns:
-            PaginatedResponse with filtered Dataset objects.
+            PaginatedResponse with filtered Dataset objects (or records).
             Note: total/last_page reflect the full dataset list, not filtered results.
         """
-        response = self.list_datasets(page=page)
+        from .exptypes import index_types
 
-        def normalize(s: str) -> str:
-            """Normalize string for comparison."""
-            return " ".join(s.lower().replace("-", " ").replace("_", " ").split())
-
-        search_term = normalize(experiment_type)
-        filtered = [
-            item
-            for item in response.items
-            if item.type and search_term in normalize(item.type)
-        ]
+        response = self.list_datasets(page=page, raw=raw)
+        queries = [experiment_type] if isinstance(experiment_type, str) else experiment_type
+        with telemetry.span("filter.types", items=len(response.items)):
+            index = index_types(
+                tuple(item["type"] if raw else item.type for item in response.items)
+            )
+            matches = index.match(queries, match_all=match_all)
+        filtered = [response.items[n] for n in sorted(matches)]
 
-        return PaginatedResponse(
+        return _models().PaginatedResponse(
             items=filtered,
             total=response.total,  # Note: this is total datasets, not filtered
             page=response.page,
@@ -165,6 +635,71 @@ class NmrXivClient:
             last_page=response.last_page,
         )
 
+    def remote_file_info(self, url: str) -> dict[str, Any]:
+        """Fetch size and validators of a remote file with a HEAD request.
+
+        Returns:
+            Dict with size (None if unknown), etag, last_modified and accept_ranges
+        """
+        response = self._send("HEAD", url, follow_redirects=True)
+        length = response.headers.get("content-length")
+        return {
+            "size": int(length) if length and length.isdigit() else None,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "accept_ranges": response.headers.get("accept-ranges", "").lower() == "bytes",
+        }
+
+    def fetch_range(
+        self, url: str, start: int, end: int, validator: str | None = None
+    ) -> bytes:
+        """Fetch bytes start..end (inclusive) of a remote file with a Range request.
+
+        Args:
+            url: File URL
+            start: First byte
+            end: Last byte (clamped by the server to the end of the file)
+            validator: ETag or Last-Modified of the expected version (sent as
+                If-Range, so a changed file is never mixed with an older one)
+
+        Raises:
+            NmrXivError: If the request fails, or the server answers with
+                anything but the requested range (no range support, or the
+                file changed); the body of such a response is not read
+        """
+        headers = {"Range": f"bytes={start}-{end}"}
+        if validator:
+            headers["If-Range"] = validator
+        attempt = 1
+        while True:
+            try:
+                with self._limiter.slot():
+                    self._limiter.request()
+                    with self.client.stream(
+                        "GET", url, headers=headers, follow_redirects=True
+                    ) as response:
+                        response.raise_for_status()
+                        got = _parse_content_range(response.headers.get("content-range"))
+                        if response.status_code != 206 or not got or got[0] != start:
+                            raise NmrXivError(
+                                "Byte range not served: the server does not support "
+                                "ranges or the file changed"
+                            )
+                        data = response.read()
+                self._limiter.consume(len(data))
+                telemetry.count("range.bytes", len(data))
+                return data
+            except httpx.HTTPStatusError as e:
+                error = _download_error(e)
+                cause: Exception = e
+            except httpx.RequestError as e:
+                error = NmrXivError(f"Download failed: {e}")
+                cause = e
+            if not self._retry.should_retry(attempt, error.status_code):
+                raise error from cause
+            self._wait_before_retry(attempt, error)
+            attempt += 1
+
     def get_download_url(self, item_id: str) -> str | None:
         """Get download URL for an item.
 
@@ -182,36 +717,610 @@ class NmrXivClient:
         url: str,
         dest: Path,
         progress_callback: Callable[[int, int], None] | None = None,
+        resume: bool = True,
+        segments: int = 1,
+        checksum: bool = False,
     ) -> Path:
         """Download a file from URL with optional progress callback.
 
+        Bytes are written to ``<dest>.part`` and renamed to ``dest`` when
+        complete. If an earlier attempt left a partial file and the server
+        supports byte ranges, the transfer continues where it stopped. The
+        If-Range validator (ETag or Last-Modified) makes the server send the
+        whole file instead if it changed in between, so bytes from two
+        versions are never spliced together. Transient failures are retried
+        according to the client's retry policy, resuming where possible.
+
         Args:
             url: URL to download from
             dest: Destination path for the file
             progress_callback: Optional callback(downloaded_bytes, total_bytes)
+            resume: Continue from an existing partial file when possible
+            segments: Fetch this many byte ranges in parallel (falls back to a
+                single stream if the server does not support ranges)
+            checksum: Write a SHA-256 manifest (``<dest>.sha256``), hashing the
+                bytes as they stream in (segmented downloads are hashed afterwards)
 
         Returns:
             Path to the downloaded file
+
+        Raises:
+            NmrXivError: If the transfer fails, or the file cannot be written
+                locally (such failures are not retried)
         """
+        with telemetry.span("download", file=dest.name):
+            telemetry.count("download.files")
+            return self._download_with_retries(
+                url, dest, progress_callback, resume, segments, checksum
+            )
+
+    def _download_with_retries(
+        self,
+        url: str,
+        dest: Path,
+        progress_callback: Callable[[int, int], None] | None,
+        resume: bool,
+        segments: int,
+        checksum: bool,
+    ) -> Path:
+        """Download with retries, continuing the partial file (see download_file)."""
+        attempt = 1
+        while True:
+            try:
+                digest = self._download_once(
+                    url, dest, progress_callback, resume, segments, checksum
+                )
+                if digest is not None:
+                    write_manifest(dest, digest)
+                return dest
+            except OSError as e:
+                # Writing locally failed (full disk, permissions); not retried below
+                raise NmrXivError(f"Cannot write {dest}: {e}") from e
+            except NmrXivError as e:
+                # Local failures (such as a full disk) do not go away by retrying
+                local = isinstance(e.__cause__, OSError)
+                if local or not self._retry.should_retry(attempt, e.status_code):
+                    raise
+                self._wait_before_retry(attempt, e)
+                attempt += 1
+                # Later attempts continue this run's own partial file
+                resume = True
+
+    def _download_once(
+        self,
+        url: str,
+        dest: Path,
+        progress_callback: Callable[[int, int], None] | None,
+        resume: bool,
+        segments: int,
+        checksum: bool,
+    ) -> str | None:
+        """Make a single download attempt (see download_file).
+
+        Every connection holds one of the limiter's slots while it is open.
+
+        Returns:
+            SHA-256 hex digest of the file if checksum is set, else None
+        """
+        if segments > 1:
+            result = self._download_segmented(url, dest, segments, progress_callback)
+            if result is not None:
+                return hash_file(result) if checksum else None
+
+        offset, validator = _load_partial(dest, url) if resume else (0, None)
+        if not offset:
+            _discard_partial(dest)
+
+        headers = {}
+        if offset:
+            headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+
         try:
-            # Use a separate client for downloads (no base_url)
-            with httpx.stream("GET", url, timeout=300.0, follow_redirects=True) as response:
-                response.raise_for_status()
-                total = int(response.headers.get("content-length", 0))
-
-                with open(dest, "wb") as f:
-                    downloaded = 0
-                    for chunk in response.iter_bytes(chunk_size=8192):
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if progress_callback:
-                            progress_callback(downloaded, total)
-
-            return dest
+            self._limiter.request()
+            with self._limiter.slot(), _download_http_client() as http, http.stream(
+                "GET", url, headers=headers
+            ) as response:
+                content_range = _parse_content_range(response.headers.get("content-range"))
+                restart = False
+                if offset and response.status_code == 416:
+                    # Nothing left to fetch if the partial file is already complete
+                    if content_range and content_range[2] == offset:
+                        _finish_partial(dest)
+                        return hash_file(dest) if checksum else None
+                    restart = True
+                elif offset and response.status_code == 206:
+                    restart = content_range is None or content_range[0] != offset
+                else:
+                    # A 200 means the file changed or ranges are unsupported
+                    response.raise_for_status()
+                    offset = 0
+
+                if not restart:
+                    hasher = self._write_partial(
+                        response, dest, url, offset, progress_callback, checksum
+                    )
+
+            if restart:
+                # Server answered the range request unexpectedly; start over
+                _discard_partial(dest)
+                return self._download_once(
+                    url, dest, progress_callback, False, segments, checksum
+                )
+
+            _finish_partial(dest)
+            return hasher.hexdigest() if hasher is not None else None
+        except httpx.HTTPStatusError as e:
+            raise _download_error(e) from e
+        except httpx.RequestError as e:
+            raise NmrXivError(f"Download failed: {e}") from e
+
+    def _download_segmented(
+        self,
+        url: str,
+        dest: Path,
+        segments: int,
+        progress_callback: Callable[[int, int], None] | None,
+    ) -> Path | None:
+        """Download url as parallel byte ranges written at their offsets.
+
+        Returns None without touching dest if the server does not support
+        ranges (or the file is too small to split), so the caller can fall
+        back to a single stream. Each segment connection holds its own
+        limiter slot, so under a lower connection limit segments take turns.
+        """
+        try:
+            with _download_http_client() as http:
+                # Probe with a one-byte range to learn the size and validator
+                self._limiter.request()
+                with self._limiter.slot(), http.stream(
+                    "GET", url, headers={"Range": "bytes=0-0"}
+                ) as probe:
+                    probe.raise_for_status()
+                    content_range = _parse_content_range(probe.headers.get("content-range"))
+                    validator = _resume_validator(probe.headers)
+                if probe.status_code != 206 or not content_range or not content_range[2]:
+                    return None
+                total = content_range[2]
+                segments = min(segments, total // MIN_SEGMENT_SIZE)
+                if segments < 2:
+                    return None
+
+                _discard_partial(dest)
+                part = _partial_path(dest)
+                lock = threading.Lock()
+                downloaded = 0
+                report = _throttled(progress_callback) if progress_callback else None
+
+                def fetch(start: int, end: int) -> None:
+                    nonlocal downloaded
+                    headers = {"Range": f"bytes={start}-{end}"}
+                    if validator:
+                        headers["If-Range"] = validator
+                    self._limiter.request()
+                    with self._limiter.slot(), http.stream("GET", url, headers=headers) as response:
+                        response.raise_for_status()
+                        got = _parse_content_range(response.headers.get("content-range"))
+                        if response.status_code != 206 or not got or got[0] != start:
+                            raise NmrXivError("Download failed: file changed during transfer")
+                        writer = _ChunkWriter(fd, start)
+                        try:
+                            for chunk in response.iter_bytes():
+                                self._limiter.consume(len(chunk))
+                                writer.write(chunk)
+                                with lock:
+                                    downloaded += len(chunk)
+                                    if report:
+                                        report(downloaded, total)
+                        finally:
+                            pos = writer.close()
+                        telemetry.count("download.bytes", pos - start)
+                        if pos != end + 1:
+                            raise NmrXivError("Download failed: segment ended early")
+
+                bounds = [total * i // segments for i in range(segments + 1)]
+                fd = os.open(part, os.O_RDWR | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o644)
+                try:
+                    if not _preallocate(fd, 0, total):
+                        os.ftruncate(fd, total)
+                    with ThreadPoolExecutor(max_workers=segments) as pool:
+                        futures = [
+                            pool.submit(fetch, bounds[i], bounds[i + 1] - 1)
+                            for i in range(segments)
+                        ]
+                        for future in futures:
+                            future.result()
+                finally:
+                    os.close(fd)
         except httpx.HTTPStatusError as e:
-            raise NmrXivError(
-                f"Download failed: HTTP {e.response.status_code}",
-                status_code=e.response.status_code,
-            ) from e
+            _discard_partial(dest)
+            raise _download_error(e) from e
         except httpx.RequestError as e:
+            _discard_partial(dest)
             raise NmrXivError(f"Download failed: {e}") from e
+        except NmrXivError:
+            _discard_partial(dest)
+            raise
+
+        return _finish_partial(dest)
+
+    def _write_partial(
+        self,
+        response: httpx.Response,
+        dest: Path,
+        url: str,
+        offset: int,
+        progress_callback: Callable[[int, int], None] | None,
+        checksum: bool = False,
+    ) -> "hashlib._Hash | None":
+        """Stream a response body into dest's .part file, appending after offset bytes.
+
+        When the length is known, the rest of the file is preallocated
+        first. Until the file is trimmed to the bytes actually written
+        (also when the transfer fails), its state is flagged and records a
+        checkpoint every CHECKPOINT_INTERVAL seconds, so a crashed run is
+        resumed from the last synced checkpoint, not the preallocated size.
+
+        Returns:
+            SHA-256 hash object over the whole file if checksum is set, else None
+        """
+        total = int(response.headers.get("content-length", 0))
+        if total:
+            total += offset
+        if not offset:
+            _save_partial(dest, url, response.headers)
+
+        part = _partial_path(dest)
+        if offset:
+            # Drop anything past the checkpoint (e.g. preallocated space)
+            os.truncate(part, offset)
+        hasher = None
+        if checksum:
+            hasher = hashlib.sha256()
+            if offset:
+                # Bytes from the earlier attempt are hashed once before appending
+                with open(part, "rb") as f:
+                    while chunk := f.read(1024 * 1024):
+                        hasher.update(chunk)
+
+        flags = os.O_WRONLY | os.O_CREAT | _O_BINARY | (0 if offset else os.O_TRUNC)
+        fd = os.open(part, flags, 0o644)
+        writer = _ChunkWriter(fd, offset, hasher)
+        report = _throttled(progress_callback) if progress_callback else None
+        preallocated = False
+        try:
+            if total > offset:
+                _mark_preallocated(dest, offset)
+                preallocated = _preallocate(fd, offset, total - offset)
+                if not preallocated:
+                    # The file size is the number of bytes written after all
+                    _mark_preallocated(dest, None)
+            checkpoint = time.monotonic()
+            for chunk in response.iter_bytes():
+                self._limiter.consume(len(chunk))
+                writer.write(chunk)
+                if report:
+                    report(writer.accepted, total)
+                if preallocated and time.monotonic() - checkpoint >= CHECKPOINT_INTERVAL:
+                    with telemetry.span("download.checkpoint"):
+                        writer.flush()
+                        _fdatasync(fd)
+                        _mark_preallocated(dest, writer.position)
+                    checkpoint = time.monotonic()
+        finally:
+            try:
+                # Received bytes are kept for a resumed attempt
+                downloaded = writer.close()
+                if preallocated:
+                    os.ftruncate(fd, downloaded)
+                _mark_preallocated(dest, None)
+            finally:
+                os.close(fd)
+        if progress_callback:
+            progress_callback(downloaded, total)
+        telemetry.count("download.bytes", downloaded - offset)
+        return hasher
+
+
+class AsyncNmrXivClient:
+    """Async client for nmrxiv.org REST API with concurrent pagination."""
+
+    BASE_URL = NmrXivClient.BASE_URL
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        concurrency: int = 8,
+        retry: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        http2: bool | None = None,
+    ):
+        """Initialize client with timeout, concurrency, retry policy, rate limits and cache.
+
+        Every request holds one of the limiter's connection slots, and
+        response bodies count against its bandwidth; concurrency also sizes
+        the connection pool. HTTP/2 (one multiplexed connection) is used
+        when http2 is True, or by default when the h2 package is installed.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self._timeout = timeout
+        self._concurrency = concurrency
+        self._cache = cache
+        self._http2 = http2_available() if http2 is None else http2
+        self._retry = retry or RetryPolicy()
+        self._limiter = rate_limiter or RateLimiter()
+        self._client: httpx.AsyncClient | None = None
+        self.retries = 0  # Retries performed so far
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get or create httpx async client."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                timeout=self._timeout,
+                headers={"Accept": "application/json"},
+                event_hooks=telemetry.http_hooks(asynchronous=True),
+                http2=self._http2,
+                limits=httpx.Limits(
+                    max_connections=self._concurrency,
+                    max_keepalive_connections=self._concurrency,
+                ),
+            )
+        return self._client
+
+    async def __aenter__(self) -> "AsyncNmrXivClient":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Async context manager exit - cleanup client."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the HTTP client and the response cache."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    async def _request(self, method: str, path: str, **kwargs) -> Any:
+        """Make HTTP request with error handling, served from cache when possible."""
+        with telemetry.span("api.request", method=method, path=path):
+            if self._cache is None:
+                return _decode_json((await self._send(method, path, **kwargs)).content)
+
+            key = self._cache.key(method, path, kwargs.get("json"))
+            entry = self._cache.get(key)
+            if entry is not None and entry.fresh:
+                telemetry.count("cache.hits")
+                return _decode_json(entry.body)
+
+            headers = entry.validators() if entry is not None else {}
+            response = await self._send(method, path, headers=headers, **kwargs)
+            if response.status_code == 304 and entry is not None:
+                telemetry.count("cache.revalidated")
+                self._cache.refresh(key, path)
+                return _decode_json(entry.body)
+
+            telemetry.count("cache.misses")
+            self._cache.put(
+                key,
+                method,
+                path,
+                response.content,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
+            return _decode_json(response.content)
+
+    async def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send HTTP request with retries, mapping errors to NmrXivError (see NmrXivClient._send)."""
+        import asyncio
+
+        retryable = self._retry.allows(method, path)
+        attempt = 1
+        while True:
+            try:
+                delay = self._limiter.request_delay()
+                if delay:
+                    await asyncio.sleep(delay)
+                async with self._limiter.async_slot():
+                    response = await self.client.request(method, path, **kwargs)
+                delay = self._limiter.consume_delay(len(response.content))
+                if delay:
+                    await asyncio.sleep(delay)
+                if response.status_code != 304:
+                    response.raise_for_status()
+                return response
+            except httpx.HTTPStatusError as e:
+                error = NmrXivError(
+                    f"HTTP {e.response.status_code}: {e.response.text}",
+                    status_code=e.response.status_code,
+                    retry_after=parse_retry_after(e.response.headers.get("retry-after")),
+                )
+                cause: Exception = e
+            except httpx.RequestError as e:
+                error = NmrXivError(f"Request failed: {e}")
+                cause = e
+            if not (retryable and self._retry.should_retry(attempt, error.status_code)):
+                raise error from cause
+            self.retries += 1
+            telemetry.count("http.retries")
+            await asyncio.sleep(self._retry.delay(attempt, error.retry_after))
+            attempt += 1
+
+    async def list_projects(self, page: int = 1, raw: bool = False) -> PaginatedResponse:
+        """List projects with pagination (raw=True: compact records instead of models)."""
+        data = await self._request("GET", f"/list/projects?page={page}")
+        return _paginated(data, _models().Project, page, raw)
+
+    async def list_studies(self) -> list[Study]:
+        """List all studies."""
+        data = await self._request("GET", "/list/studies")
+        items = data.get("data", data) if isinstance(data, dict) else data
+        return _list_adapter(_models().Study).validate_python(items)
+
+    async def list_datasets(self, page: int = 1, raw: bool = False) -> PaginatedResponse:
+        """List datasets with pagination (raw=True: compact records instead of models)."""
+        data = await self._request("GET", f"/list/datasets?page={page}")
+        return _paginated(data, _models().Dataset, page, raw)
+
+    async def get_item(self, item_id: str) -> dict[str, Any]:
+        """Get item by identifier."""
+        data = await self._request("GET", f"/{item_id}")
+        return data.get("data", data) if isinstance(data, dict) else data
+
+    async def iter_items(
+        self, item_ids: list[str], concurrency: int | None = None
+    ) -> AsyncIterator[tuple[str, dict[str, Any] | NmrXivError]]:
+        """Fetch many items concurrently over the shared connection pool.
+
+        Repeated identifiers are requested once.
+
+        Args:
+            item_ids: Item identifiers (e.g., ["P5", "D410"])
+            concurrency: Maximum number of requests in flight (default: client setting)
+
+        Yields:
+            (item_id, item) pairs in completion order; item is the NmrXivError
+            raised for that identifier if it could not be fetched
+        """
+        limit = concurrency or self._concurrency
+
+        async def fetch(item_id: str) -> tuple[str, dict[str, Any] | NmrXivError]:
+            try:
+                return item_id, await self.get_item(item_id)
+            except NmrXivError as e:
+                return item_id, e
+
+        async with aclosing(_bounded(fetch, dict.fromkeys(item_ids), limit)) as results:
+            async for result in results:
+                yield result
+
+    async def search_molecules(
+        self,
+        query: str | None = None,
+        smiles: str | None = None,
+        page: int = 1,
+        raw: bool = False,
+    ) -> PaginatedResponse:
+        """Search molecules by name/synonym or SMILES substructure (one page)."""
+        path, body = _search_request(query, smiles, page)
+        data = await self._request("POST", path, json=body)
+        return _molecule_page(data, page, raw)
+
+    async def _iter_pages(
+        self, fetch: Callable[[int], Any], concurrency: int | None = None
+    ) -> AsyncIterator[PaginatedResponse]:
+        """Yield page 1, then all remaining pages fetched concurrently.
+
+        Pages after the first are yielded in completion order, not page order.
+        At most `concurrency` pages are requested or waiting to be consumed
+        at any time, so memory stays bounded however many pages there are.
+        """
+        limit = concurrency or self._concurrency
+
+        first = await fetch(1)
+        yield first
+
+        pages = range(2, first.last_page + 1)
+        async with aclosing(_bounded(fetch, pages, limit)) as responses:
+            async for response in responses:
+                yield response
+
+    def iter_pages(
+        self, kind: str, concurrency: int | None = None, raw: bool = False
+    ) -> AsyncIterator[PaginatedResponse]:
+        """Iterate over every listing page of projects or datasets.
+
+        Args:
+            kind: "project" or "dataset"
+            concurrency: Maximum number of pages in flight (default: client setting)
+            raw: Pages hold compact records (unvalidated dicts) instead of models
+
+        Yields:
+            PaginatedResponse objects, page 1 first, then in completion order
+        """
+        list_page = {"project": self.list_projects, "dataset": self.list_datasets}.get(kind)
+        if list_page is None:
+            raise ValueError(f"Unknown kind: {kind}")
+
+        async def fetch(page: int) -> PaginatedResponse:
+            return await list_page(page, raw=raw)
+
+        return self._iter_pages(fetch, concurrency)
+
+    async def iter_all_projects(
+        self, concurrency: int | None = None
+    ) -> AsyncIterator[Project]:
+        """Iterate over every project in the catalog.
+
+        Args:
+            concurrency: Maximum number of pages in flight (default: client setting)
+
+        Yields:
+            Project objects, page by page as each page arrives
+        """
+        async for response in self.iter_pages("project", concurrency):
+            for item in response.items:
+                yield item
+
+    async def iter_all_datasets(
+        self, concurrency: int | None = None
+    ) -> AsyncIterator[Dataset]:
+        """Iterate over every dataset in the catalog.
+
+        Args:
+            concurrency: Maximum number of pages in flight (default: client setting)
+
+        Yields:
+            Dataset objects, page by page as each page arrives
+        """
+        async for response in self.iter_pages("dataset", concurrency):
+            for item in response.items:
+                yield item
+
+    async def iter_all_molecules(
+        self,
+        query: str | None = None,
+        smiles: str | None = None,
+        max_results: int | None = None,
+        concurrency: int | None = None,
+        raw: bool = False,
+    ) -> AsyncIterator[Molecule]:
+        """Iterate over every hit of a molecule search, across all result pages.
+
+        Hits repeated on several pages (same InChIKey) are yielded once.
+
+        Args:
+            query: Search by compound name or synonym
+            smiles: Search by SMILES substructure
+            max_results: Stop after this many unique molecules
+            concurrency: Maximum number of pages in flight (default: client setting)
+            raw: Yield compact records (unvalidated dicts) instead of models
+
+        Yields:
+            Molecule objects (or records), page by page as each page arrives
+        """
+        if max_results is not None and max_results < 1:
+            return
+
+        async def fetch(page: int) -> PaginatedResponse:
+            return await self.search_molecules(query=query, smiles=smiles, page=page, raw=raw)
+
+        seen: set[str | int] = set()
+        # aclosing: stopping at max_results cancels the pages still in flight
+        async with aclosing(self._iter_pages(fetch, concurrency)) as pages:
+            async for response in pages:
+                for molecule in response.items:
+                    key = _molecule_key(molecule)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield molecule
+                    if max_results is not None and len(seen) >= max_results:
+                        return
@@ -0,0 +1,307 @@
+"""Opt-in background server that runs CLI commands in a warm process.
+
+`nmrxiv serve` listens on a Unix socket. The `nmrxiv` entry point checks
+for it before importing anything heavy: read-only commands (show, list,
+search, ls) are sent to the daemon, which runs them with an already imported
+CLI, a shared connection pool and an open response cache, and streams
+their output back. Without a daemon (or for any other command) the CLI
+runs in-process as usual.
+
+This module only uses the standard library so that forwarding stays fast.
+"""
+
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+from pathlib import Path
+from typing import Callable
+
+PROTOCOL_VERSION = 1
+
+# Commands that only read from the API and never touch stdin or local files
+FORWARDED_COMMANDS = frozenset({"show", "list", "search", "ls"})
+
+# Environment the daemon's results depend on; it must match the caller's
+_ENV_PREFIXES = ("NMRXIV_", "XDG_CACHE_HOME", "XDG_DATA_HOME")
+_ENV_IGNORED = frozenset({"NMRXIV_SOCKET", "NMRXIV_NO_DAEMON"})
+
+# Telemetry is process-wide and the shared connection pool was created without
+# its HTTP hooks, so traced commands always run locally
+_TELEMETRY_ENV = ("NMRXIV_TRACE", "NMRXIV_METRICS")
+
+
+def default_socket_path() -> Path:
+    """Daemon socket ($NMRXIV_SOCKET, else in $XDG_RUNTIME_DIR or the cache directory)."""
+    if os.environ.get("NMRXIV_SOCKET"):
+        return Path(os.environ["NMRXIV_SOCKET"])
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return Path(os.environ["XDG_RUNTIME_DIR"]) / "nmrxiv.sock"
+    from .cache import default_cache_dir
+
+    return default_cache_dir() / "daemon.sock"
+
+
+def _relevant_env() -> dict[str, str]:
+    """Environment variables that change what a command does."""
+    return {
+        k: v
+        for k, v in os.environ.items()
+        if k.startswith(_ENV_PREFIXES) and k not in _ENV_IGNORED
+    }
+
+
+def _telemetry_requested(env: dict[str, str]) -> bool:
+    """Whether env asks for a trace or metrics file (NMRXIV_TRACE, NMRXIV_METRICS)."""
+    return any(env.get(name) for name in _TELEMETRY_ENV)
+
+
+def forwardable(argv: list[str]) -> bool:
+    """Whether a command line can be answered by the daemon.
+
+    Global options, stdin ('-') and --from-file are handled locally.
+    """
+    if not argv or argv[0] not in FORWARDED_COMMANDS:
+        return False
+    return not any(
+        arg == "-" or arg in ("-f", "--from-file") or arg.startswith("--from-file=")
+        for arg in argv[1:]
+    )
+
+
+def forward(argv: list[str], socket_path: Path | None = None) -> int | None:
+    """Run a command on the daemon, copying its output to stdout/stderr.
+
+    Returns:
+        The command's exit code, or None if no daemon could take the
+        command (the caller should then run it locally)
+    """
+    path = socket_path or default_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        return None
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(path))
+    except OSError:
+        return None
+
+    request = {
+        "version": PROTOCOL_VERSION,
+        "argv": argv,
+        "env": _relevant_env(),
+        "tty": sys.stdout.isatty(),
+    }
+    with sock, sock.makefile("rwb") as conn:
+        try:
+            conn.write(json.dumps(request).encode() + b"\n")
+            conn.flush()
+            started = False
+            for line in conn:
+                frame = json.loads(line)
+                if "exit" in frame:
+                    return frame["exit"]
+                if frame.get("fallback") and not started:
+                    return None
+                started = True
+                stream = sys.stdout if "out" in frame else sys.stderr
+                try:
+                    stream.write(frame.get("out", frame.get("err", "")))
+                    stream.flush()
+                except BrokenPipeError:
+                    # Reader went away (e.g. `| head`): stop quietly, like the local CLI
+                    os.dup2(os.open(os.devnull, os.O_WRONLY), stream.fileno())
+                    return 0
+        except (OSError, ValueError):
+            if not started:
+                return None
+    # The daemon went away mid-command
+    print(json.dumps({"error": True, "message": "nmrxiv daemon disconnected", "code": 1}),
+          file=sys.stderr)
+    return 1
+
+
+def main() -> None:
+    """Console entry point: use a running daemon when possible, else run the CLI."""
+    argv = sys.argv[1:]
+    if (
+        not os.environ.get("NMRXIV_NO_DAEMON")
+        and not _telemetry_requested(os.environ)
+        and forwardable(argv)
+    ):
+        code = forward(argv)
+        if code is not None:
+            sys.exit(code)
+
+    from .cli import app
+
+    app(prog_name="nmrxiv")
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream sending everything written to it as frames over a connection."""
+
+    def __init__(self, conn, key: str, lock: threading.Lock, tty: bool):
+        self._conn = conn
+        self._key = key
+        self._lock = lock
+        self._tty = tty
+        self._buffer: list[str] = []
+        self._size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self._tty
+
+    def write(self, s: str) -> int:
+        self._buffer.append(s)
+        self._size += len(s)
+        if self._size >= 65536:
+            self.flush()
+        return len(s)
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        data = "".join(self._buffer)
+        self._buffer.clear()
+        self._size = 0
+        _send_frame(self._conn, self._lock, {self._key: data})
+
+
+def _send_frame(conn, lock: threading.Lock, frame: dict) -> None:
+    """Write one JSON frame; a vanished client surfaces as BrokenPipeError."""
+    with lock:
+        try:
+            conn.write(json.dumps(frame).encode() + b"\n")
+            conn.flush()
+        except OSError as e:
+            raise BrokenPipeError(str(e)) from e
+
+
+class _ThreadStream(io.TextIOBase):
+    """Stand-in for sys.stdout/stderr routing writes to the current thread's target."""
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    @property
+    def target(self):
+        return getattr(self._local, "target", None) or self._default
+
+    @target.setter
+    def target(self, stream) -> None:
+        self._local.target = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        return self.target.write(s)
+
+    def flush(self) -> None:
+        self.target.flush()
+
+    def isatty(self) -> bool:
+        return self.target.isatty()
+
+    def fileno(self) -> int:
+        return self.target.fileno()
+
+    @property
+    def encoding(self) -> str:
+        return getattr(self.target, "encoding", None) or "utf-8"
+
+
+def serve(run: Callable[[list[str]], int], socket_path: Path | None = None) -> None:
+    """Serve commands on a Unix socket until interrupted.
+
+    Args:
+        run: Runs one command line in-process and returns its exit code;
+            its output goes to sys.stdout/sys.stderr of the calling thread
+        socket_path: Socket to listen on (default: default_socket_path())
+
+    Raises:
+        OSError: If the socket cannot be created or another daemon is running
+    """
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        raise OSError("nmrxiv serve requires Unix domain sockets")
+    path = socket_path or default_socket_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()  # Stale socket left by a daemon that died
+        else:
+            raise OSError(f"A daemon is already listening on {path}")
+        finally:
+            probe.close()
+
+    env = _relevant_env()
+    original = sys.stdout, sys.stderr
+    stdout = sys.stdout = _ThreadStream(sys.stdout)
+    stderr = sys.stderr = _ThreadStream(sys.stderr)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            lock = threading.Lock()
+            try:
+                request = json.loads(self.rfile.readline())
+            except ValueError:
+                return
+            if (
+                request.get("version") != PROTOCOL_VERSION
+                or request.get("env") != env
+                or _telemetry_requested(env)
+                or not forwardable(request.get("argv") or [])
+            ):
+                _send_frame(self.wfile, lock, {"fallback": True})
+                return
+
+            tty = bool(request.get("tty"))
+            out = _FrameWriter(self.wfile, "out", lock, tty)
+            err = _FrameWriter(self.wfile, "err", lock, tty)
+            stdout.target, stderr.target = out, err
+            try:
+                try:
+                    code = run(request["argv"])
+                except BrokenPipeError:
+                    return
+                except Exception:
+                    traceback.print_exc()
+                    code = 1
+                out.flush()
+                err.flush()
+                _send_frame(self.wfile, lock, {"exit": code})
+            except BrokenPipeError:
+                pass  # Client went away
+            finally:
+                stdout.target = stderr.target = None
+
+    old_umask = os.umask(0o077)  # Socket usable by this user only
+    try:
+        server = socketserver.ThreadingUnixStreamServer(str(path), Handler)
+    finally:
+        os.umask(old_umask)
+    server.daemon_threads = True
+    if threading.current_thread() is threading.main_thread():
+        # Stop cleanly (removing the socket) on SIGTERM as well as Ctrl-C
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(json.dumps({"status": "listening", "socket": str(path)}), file=original[1], flush=True)
+    try:
+        with server:
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        path.unlink(missing_ok=True)
+        sys.stdout, sys.stderr = original
@@ -0,0 +1,16 @@
+"""Exceptions shared by the nmrxiv client and CLI."""
+
+
+class NmrXivError(Exception):
+    """Exception for nmrxiv API errors."""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: int | None = None,
+        retry_after: float | None = None,
+    ):
+        self.message = message
+        self.status_code = status_code
+        self.retry_after = retry_after
+        super().__init__(message)
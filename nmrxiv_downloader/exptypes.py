@@ -0,0 +1,156 @@
+"""Experiment-type vocabulary and an inverted index from type terms to items.
+
+Experiment types are free text ("2D 1H-13C HSQC", "13C", "1d_13c dept").
+Each distinct type is broken into terms once: words after normalization
+('1H-13C' -> '1h', '13c'), with spelling variants mapped to one form
+('c13' -> '13c') and shorthand types expanded to the full type they stand
+for ('HSQC' -> '2d 1h 13c hsqc', '13C' -> '1d 13c'). A query matches a
+type that has all of its terms; the last one may be a prefix ('hsq').
+
+TypeIndex maps every term to the items that have it, so a query is a set
+intersection of posting lists and several queries combine by union or
+intersection. index_types() builds one per snapshot of a listing and
+reuses it while the listing is unchanged.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from functools import lru_cache
+from typing import Hashable, Iterable
+
+# Terms written in more than one way
+TERM_SYNONYMS = {
+    "h1": "1h",
+    "proton": "1h",
+    "c13": "13c",
+    "carbon": "13c",
+    "n15": "15n",
+    "f19": "19f",
+    "p31": "31p",
+    "hh": "1h 1h",
+}
+
+# Shorthand types and the full type they stand for (keys and values normalized)
+TYPE_ALIASES = {
+    "1h": "1d 1h",
+    "13c": "1d 13c",
+    "15n": "1d 15n",
+    "19f": "1d 19f",
+    "31p": "1d 31p",
+    "dept": "1d 13c dept",
+    "dept 90": "1d 13c dept 90",
+    "dept 135": "1d 13c dept 135",
+    "apt": "1d 13c apt",
+    "cosy": "2d 1h 1h cosy",
+    "tocsy": "2d 1h 1h tocsy",
+    "noesy": "2d 1h 1h noesy",
+    "roesy": "2d 1h 1h roesy",
+    "hsqc": "2d 1h 13c hsqc",
+    "hmqc": "2d 1h 13c hmqc",
+    "hmbc": "2d 1h 13c hmbc",
+    "h2bc": "2d 1h 13c h2bc",
+    "hsqc tocsy": "2d 1h 13c hsqc tocsy",
+}
+
+_SEPARATORS = re.compile(r"[\s\-_,;/()\[\]]+")
+
+
+def normalize_type(value: str) -> str:
+    """Normalize an experiment type for comparison ('1D-13C' -> '1d 13c')."""
+    words = _SEPARATORS.split(value.lower())
+    return " ".join(TERM_SYNONYMS.get(w, w) for w in words if w)
+
+
+@lru_cache(maxsize=4096)
+def type_terms(value: str) -> frozenset[str]:
+    """Index terms of an experiment type (computed once per distinct type)."""
+    normalized = normalize_type(value)
+    return frozenset(normalized.split()) | frozenset(TYPE_ALIASES.get(normalized, "").split())
+
+
+def query_terms(value: str) -> list[str]:
+    """Terms a type query requires, in query order (the last one may be a prefix)."""
+    return [*dict.fromkeys(normalize_type(value).split())]
+
+
+@lru_cache(maxsize=16)
+def index_types(types: tuple[str | None, ...]) -> "TypeIndex":
+    """Shared index of a listing's experiment types, keyed by position.
+
+    The tuple of types identifies the snapshot: filtering the same page (or
+    the whole catalog) again reuses its index. Callers must not add() to it.
+    """
+    return TypeIndex.from_items(enumerate(types))
+
+
+class TypeIndex:
+    """Inverted index from type term to the keys of items of that type.
+
+    Build one per catalog snapshot (e.g. a listing page, or every dataset)
+    with add() or from_items(); lookups then only touch matching items.
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, set[Hashable]] = {}
+        self._vocabulary: list[str] | None = None
+
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[Hashable, str | None]]) -> "TypeIndex":
+        """Index (key, experiment type) pairs; items without a type are skipped."""
+        index = cls()
+        for key, item_type in items:
+            if item_type:
+                index.add(key, item_type)
+        return index
+
+    def add(self, key: Hashable, item_type: str) -> None:
+        for term in type_terms(item_type):
+            self._postings.setdefault(term, set()).add(key)
+        self._vocabulary = None
+
+    @property
+    def vocabulary(self) -> list[str]:
+        """All indexed terms, sorted."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        return self._vocabulary
+
+    def _prefixed(self, prefix: str) -> set[Hashable]:
+        """Keys of items with a term starting with prefix."""
+        vocabulary = self.vocabulary
+        keys: set[Hashable] = set()
+        for i in range(bisect.bisect_left(vocabulary, prefix), len(vocabulary)):
+            if not vocabulary[i].startswith(prefix):
+                break
+            keys |= self._postings[vocabulary[i]]
+        return keys
+
+    def lookup(self, query: str) -> set[Hashable]:
+        """Keys of items whose type matches query (all terms, the last as a prefix)."""
+        terms = query_terms(query)
+        if not terms:
+            return set()
+        # Rarest exact term first, so the intersection never grows
+        exact = sorted((self._postings.get(t, set()) for t in terms[:-1]), key=len)
+        sets = [*exact, self._prefixed(terms[-1])]
+        keys = set(sets[0])
+        for other in sets[1:]:
+            keys &= other
+            if not keys:
+                break
+        return keys
+
+    def match(self, queries: Iterable[str], match_all: bool = False) -> set[Hashable]:
+        """Keys matching any of the queries (or, with match_all, every one of them)."""
+        result: set[Hashable] | None = None
+        for query in queries:
+            keys = self.lookup(query)
+            if result is None:
+                result = keys
+            elif match_all:
+                result &= keys
+            else:
+                result |= keys
+        return result or set()
@@ -0,0 +1,479 @@
+"""Local SQLite catalog of nmrxiv projects, studies and datasets with full-text search."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .cache import default_cache_dir
+from .errors import NmrXivError
+from .exptypes import normalize_type, query_terms, type_terms
+
+if TYPE_CHECKING:
+    from .client import AsyncNmrXivClient
+    from .models import NmrXivBase, PaginatedResponse
+
+KINDS = ("project", "study", "dataset")
+
+# Version of the type-term vocabulary (exptypes); indexes built with another
+# version get their type_terms table rebuilt when opened
+TYPE_TERMS_VERSION = "1"
+
+
+def _model(kind: str) -> type[NmrXivBase]:
+    """Model class for an item kind (pydantic is imported on first use)."""
+    from .models import Dataset, Project, Study
+
+    return {"project": Project, "study": Study, "dataset": Dataset}[kind]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    kind TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    identifier TEXT,
+    name TEXT,
+    description TEXT,
+    type TEXT,
+    type_norm TEXT,
+    parent_id INTEGER,
+    updated_at TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, id)
+);
+CREATE INDEX IF NOT EXISTS items_identifier ON items (identifier);
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    name, description, type, content='items', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts (rowid, name, description, type)
+    VALUES (new.rowid, new.name, new.description, new.type);
+END;
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, name, description, type)
+    VALUES ('delete', old.rowid, old.name, old.description, old.type);
+END;
+CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, name, description, type)
+    VALUES ('delete', old.rowid, old.name, old.description, old.type);
+    INSERT INTO items_fts (rowid, name, description, type)
+    VALUES (new.rowid, new.name, new.description, new.type);
+END;
+CREATE TABLE IF NOT EXISTS type_terms (
+    term TEXT NOT NULL,
+    item INTEGER NOT NULL,
+    PRIMARY KEY (term, item)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sync_state (
+    kind TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    identifier TEXT,
+    updated_at TEXT,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (kind, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def default_index_path() -> Path:
+    """Return the catalog database path ($NMRXIV_INDEX, else in the cache directory)."""
+    if os.environ.get("NMRXIV_INDEX"):
+        return Path(os.environ["NMRXIV_INDEX"])
+    return default_cache_dir() / "catalog.sqlite3"
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching all words (prefix match on the last)."""
+    words = [w.replace('"', '""') for w in text.split()]
+    terms = [f'"{w}"' for w in words]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def short_id(identifier: str) -> str:
+    """Strip the repository prefix from an identifier ('NMRXIV:P5' -> 'P5')."""
+    return identifier.rsplit(":", 1)[-1]
+
+
+def _type_subquery(query: str) -> tuple[str, list[str]]:
+    """SQL selecting the type_terms items of one type query, and its parameters.
+
+    Every term must match; the last one as a prefix (like fts_query).
+    """
+    terms = query_terms(query)
+    if not terms:
+        return "SELECT NULL AS item WHERE 0", []
+    parts = ["SELECT item FROM type_terms WHERE term = ?"] * (len(terms) - 1)
+    parts.append("SELECT item FROM type_terms WHERE term >= ? AND term < ?")
+    last = terms[-1]
+    return " INTERSECT ".join(parts), [*terms[:-1], last, last[:-1] + chr(ord(last[-1]) + 1)]
+
+
+def parent_project(item: dict) -> str | None:
+    """Identifier of the project an item belongs to ('P11'), if the record names one."""
+    project = item.get("project")
+    if not isinstance(project, dict):
+        return None
+    if project.get("identifier"):
+        return short_id(project["identifier"])
+    if project.get("public_url"):
+        # e.g. https://nmrxiv.org/project/P11
+        return project["public_url"].rstrip("/").split("/")[-1]
+    return None
+
+
+@dataclass
+class IndexChanges:
+    """Items added, updated and removed by an index refresh, per kind.
+
+    Each change is a dict with the item's id, identifier and updated_at.
+    """
+
+    added: dict[str, list[dict]] = field(default_factory=lambda: {k: [] for k in KINDS})
+    updated: dict[str, list[dict]] = field(default_factory=lambda: {k: [] for k in KINDS})
+    removed: dict[str, list[dict]] = field(default_factory=lambda: {k: [] for k in KINDS})
+    unchanged: dict[str, int] = field(default_factory=lambda: {k: 0 for k in KINDS})
+
+    def records(self) -> list[dict]:
+        """Flat change feed: one record per added, updated or removed item."""
+        return [
+            {"change": change, "kind": kind, **entry}
+            for change, by_kind in (
+                ("added", self.added),
+                ("updated", self.updated),
+                ("removed", self.removed),
+            )
+            for kind in KINDS
+            for entry in by_kind[kind]
+        ]
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        """Counts per change type and kind."""
+        return {
+            "added": {k: len(v) for k, v in self.added.items()},
+            "updated": {k: len(v) for k, v in self.updated.items()},
+            "removed": {k: len(v) for k, v in self.removed.items()},
+            "unchanged": dict(self.unchanged),
+        }
+
+
+class CatalogIndex:
+    """SQLite catalog with FTS5 over name, description and type."""
+
+    def __init__(self, path: Path | None = None):
+        """Open (or create) the catalog database.
+
+        Raises:
+            sqlite3.OperationalError: If SQLite was built without FTS5
+        """
+        import sqlite3
+
+        self.path = path or default_index_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript(_SCHEMA)
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'type_terms'").fetchone()
+        if row is None or row[0] != TYPE_TERMS_VERSION:
+            with self._db:
+                self._index_types()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+    def __enter__(self) -> "CatalogIndex":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit - close database."""
+        self.close()
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the index has never been populated."""
+        return self._db.execute("SELECT 1 FROM items LIMIT 1").fetchone() is None
+
+    def info(self) -> dict[str, Any]:
+        """Item counts per kind and refresh timestamps."""
+        counts = dict.fromkeys(KINDS, 0)
+        counts.update(self._db.execute("SELECT kind, COUNT(*) FROM items GROUP BY kind"))
+        meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        return {
+            "path": str(self.path),
+            "counts": counts,
+            "built_at": meta.get("built_at"),
+            "refreshed_at": meta.get("refreshed_at"),
+            "watermarks": self.watermarks(),
+        }
+
+    def watermarks(self) -> dict[str, str | None]:
+        """Highest updated_at recorded per kind by the last refresh."""
+        meta = dict(self._db.execute("SELECT key, value FROM meta WHERE key LIKE 'watermark:%'"))
+        return {kind: meta.get(f"watermark:{kind}") for kind in KINDS}
+
+    def sync_watermarks(self) -> dict[str, str | None]:
+        """Highest updated_at recorded per kind by the last sync_changes()."""
+        meta = dict(self._db.execute("SELECT key, value FROM meta WHERE key LIKE 'sync:%'"))
+        return {kind: meta.get(f"sync:{kind}") for kind in KINDS}
+
+    def sync_changes(self) -> IndexChanges:
+        """Changes to the indexed items since the previous call, then advance the cursor.
+
+        The sync cursor is its own snapshot of every item (updated_at and a
+        digest of the stored record), separate from the state refresh()
+        compares against. Index updates run between two syncs therefore
+        don't hide their changes from the next sync. The first call reports
+        every item as added.
+        """
+        import hashlib
+
+        previous = {
+            (kind, item_id): (identifier, updated_at, digest)
+            for kind, item_id, identifier, updated_at, digest in self._db.execute(
+                "SELECT kind, id, identifier, updated_at, digest FROM sync_state"
+            )
+        }
+        changes = IndexChanges()
+        snapshot = []
+        for kind, item_id, identifier, updated_at, data in self._db.execute(
+            "SELECT kind, id, identifier, updated_at, data FROM items ORDER BY kind, id"
+        ):
+            digest = hashlib.sha256(data.encode()).hexdigest()
+            snapshot.append((kind, item_id, identifier, updated_at, digest))
+            entry = {"id": item_id, "identifier": identifier, "updated_at": updated_at}
+            before = previous.pop((kind, item_id), None)
+            if before is None:
+                changes.added[kind].append(entry)
+            elif before[2] != digest:
+                changes.updated[kind].append(entry)
+            else:
+                changes.unchanged[kind] += 1
+        for (kind, item_id), (identifier, updated_at, _) in previous.items():
+            changes.removed[kind].append(
+                {"id": item_id, "identifier": identifier, "updated_at": updated_at}
+            )
+
+        with self._db:
+            self._db.execute("DELETE FROM sync_state")
+            self._db.executemany("INSERT INTO sync_state VALUES (?, ?, ?, ?, ?)", snapshot)
+            self._db.execute("DELETE FROM meta WHERE key LIKE 'sync:%'")
+            self._db.execute(
+                "INSERT INTO meta SELECT 'sync:' || kind, MAX(updated_at) "
+                "FROM items WHERE updated_at IS NOT NULL GROUP BY kind"
+            )
+        return changes
+
+    async def refresh(self, client: AsyncNmrXivClient, rebuild: bool = False) -> IndexChanges:
+        """Pull the full catalog and bring the index up to date.
+
+        Items whose updated_at is unchanged are left untouched, so an update
+        only rewrites rows (and full-text entries) that actually changed.
+        Items no longer listed by the API are removed. Afterwards the
+        high-water mark (highest updated_at) of each kind is recorded.
+
+        The refresh runs in one transaction: if the walk fails, the index
+        keeps its previous contents (also when rebuilding).
+
+        Args:
+            client: Async client used to walk every listing page concurrently
+            rebuild: Replace the existing contents instead of updating them
+
+        Returns:
+            The changes applied to the index
+        """
+        known: dict[tuple[str, int], str | None] = {}
+        identifiers: dict[tuple[str, int], str | None] = {}
+        if not rebuild:
+            for kind, item_id, updated_at, identifier in self._db.execute(
+                "SELECT kind, id, updated_at, identifier FROM items"
+            ):
+                known[(kind, item_id)] = updated_at
+                identifiers[(kind, item_id)] = identifier
+        seen: set[tuple[str, int]] = set()
+        changes = IndexChanges()
+
+        def apply(kind: str, item: NmrXivBase) -> None:
+            key = (kind, item.id)
+            seen.add(key)
+            row = self._row(kind, item)
+            updated_at = row["updated_at"]
+            entry = {"id": item.id, "identifier": row["identifier"], "updated_at": updated_at}
+            if key not in known:
+                changes.added[kind].append(entry)
+            elif known[key] != updated_at or (
+                updated_at is None and self._stored_data(key) != row["data"]
+            ):
+                changes.updated[kind].append(entry)
+            else:
+                changes.unchanged[kind] += 1
+                return
+            self._db.execute(
+                "INSERT INTO items VALUES (:kind, :id, :identifier, :name, :description, "
+                ":type, :type_norm, :parent_id, :updated_at, :data) "
+                "ON CONFLICT (kind, id) DO UPDATE SET identifier = excluded.identifier, "
+                "name = excluded.name, description = excluded.description, "
+                "type = excluded.type, type_norm = excluded.type_norm, "
+                "parent_id = excluded.parent_id, updated_at = excluded.updated_at, "
+                "data = excluded.data",
+                row,
+            )
+
+        with self._db:
+            if rebuild:
+                self._db.execute("DELETE FROM items")
+                self._db.execute("DELETE FROM type_terms")
+                self._db.execute("DELETE FROM meta WHERE key LIKE 'watermark:%'")
+            async for project in client.iter_all_projects():
+                apply("project", project)
+            try:
+                for study in await client.list_studies():
+                    apply("study", study)
+                studies_listed = True
+            except NmrXivError:
+                # The studies listing is not publicly available on every deployment
+                studies_listed = False
+            async for dataset in client.iter_all_datasets():
+                apply("dataset", dataset)
+
+            for key in set(known) - seen:
+                kind, item_id = key
+                if kind == "study" and not studies_listed:
+                    continue
+                changes.removed[kind].append(
+                    {"id": item_id, "identifier": identifiers[key], "updated_at": known[key]}
+                )
+                self._db.execute("DELETE FROM items WHERE kind = ? AND id = ?", key)
+
+            if any(changes.added[k] or changes.updated[k] or changes.removed[k] for k in KINDS):
+                self._index_types()
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta SELECT 'watermark:' || kind, MAX(updated_at) "
+                "FROM items WHERE updated_at IS NOT NULL GROUP BY kind"
+            )
+            now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('refreshed_at', ?)", (now,))
+            if rebuild or not known:
+                self._db.execute("INSERT OR REPLACE INTO meta VALUES ('built_at', ?)", (now,))
+        return changes
+
+    def _index_types(self) -> None:
+        """Rebuild the inverted index from type term to item (once per catalog snapshot).
+
+        Items of the same type share their terms, so each distinct type is
+        only broken into terms once.
+        """
+        self._db.execute("DELETE FROM type_terms")
+        self._db.executemany(
+            "INSERT INTO type_terms VALUES (?, ?)",
+            (
+                (term, rowid)
+                for rowid, item_type in self._db.execute(
+                    "SELECT rowid, type FROM items WHERE type IS NOT NULL"
+                ).fetchall()
+                for term in type_terms(item_type)
+            ),
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('type_terms', ?)", (TYPE_TERMS_VERSION,)
+        )
+
+    def _stored_data(self, key: tuple[str, int]) -> str | None:
+        """Stored JSON for an item (used when it has no updated_at to compare)."""
+        row = self._db.execute("SELECT data FROM items WHERE kind = ? AND id = ?", key).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _row(kind: str, item: NmrXivBase) -> dict[str, Any]:
+        """Database row for a catalog item."""
+        data = item.model_dump(mode="json")
+        item_type = data.get("type")
+        return {
+            "kind": kind,
+            "id": item.id,
+            "identifier": data.get("identifier"),
+            "name": data.get("name"),
+            "description": data.get("description"),
+            "type": item_type,
+            "type_norm": normalize_type(item_type) if item_type else None,
+            "parent_id": data.get("study_id") or data.get("project_id"),
+            "updated_at": data.get("updated_at"),
+            "data": json.dumps(data),
+        }
+
+    def search(
+        self,
+        kind: str = "dataset",
+        text: str | None = None,
+        experiment_type: str | list[str] | None = None,
+        page: int = 1,
+        per_page: int = 100,
+        match_all: bool = False,
+        raw: bool = False,
+    ) -> PaginatedResponse:
+        """Search the index with exact totals and pagination.
+
+        Args:
+            kind: Item kind to search (project, study or dataset)
+            text: Full-text query over name, description and type
+            experiment_type: Experiment type(s) (e.g., "hsqc", "1d-13c"; see
+                exptypes), answered from the type_terms index
+            page: Page number
+            per_page: Items per page
+            match_all: Items must match every experiment type, not any of them
+            raw: Return the stored records (JSON-ready dicts of the model's
+                fields) without building models
+
+        Returns:
+            PaginatedResponse with model objects (or records) of the requested kind
+        """
+        where = ["items.kind = ?"]
+        params: list[Any] = [kind]
+        join = ""
+        order = "items.id"
+        if text:
+            join = "JOIN items_fts ON items_fts.rowid = items.rowid"
+            where.append("items_fts MATCH ?")
+            params.append(fts_query(text))
+            order = "items_fts.rank, items.id"
+        if experiment_type:
+            queries = [experiment_type] if isinstance(experiment_type, str) else experiment_type
+            subqueries = []
+            for query in queries:
+                sql, query_params = _type_subquery(query)
+                subqueries.append(f"SELECT item FROM ({sql})")
+                params.extend(query_params)
+            operator = " INTERSECT " if match_all else " UNION "
+            where.append(f"items.rowid IN ({operator.join(subqueries)})")
+        clause = " AND ".join(where)
+
+        (total,) = self._db.execute(
+            f"SELECT COUNT(*) FROM items {join} WHERE {clause}", params
+        ).fetchone()
+        rows = self._db.execute(
+            f"SELECT items.data FROM items {join} WHERE {clause} "
+            f"ORDER BY {order} LIMIT ? OFFSET ?",
+            [*params, per_page, (page - 1) * per_page],
+        ).fetchall()
+
+        from .models import PaginatedResponse
+
+        records = [json.loads(data) for (data,) in rows]
+        if not raw:
+            model = _model(kind)
+            records = [model(**record) for record in records]
+        return PaginatedResponse(
+            items=records,
+            total=total,
+            page=page,
+            per_page=per_page,
+            last_page=max(1, -(-total // per_page)),
+        )
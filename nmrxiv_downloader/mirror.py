@@ -0,0 +1,174 @@
+"""Checkpointed work queue for mirroring every nmrxiv project archive.
+
+The queue lives in the mirror directory itself (MIRROR_DB), one row per
+project. A catalog walk queues projects that are new or whose updated_at
+changed since they were mirrored; each finished download is committed at
+once, so a killed mirror run picks up where it stopped (and continues
+interrupted transfers from their .part files).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from .index import short_id
+
+MIRROR_DB = ".nmrxiv-mirror.sqlite3"
+
+# Queue states; failed items are attempted again by the next run
+STATUSES = ("pending", "done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    updated_at TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    file TEXT,
+    size INTEGER,
+    sha256 TEXT,
+    error TEXT,
+    mirrored_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+"""
+
+
+class MirrorQueue:
+    """Projects to mirror and the outcome of each, kept in SQLite."""
+
+    def __init__(self, root: Path):
+        """Open (or create) the queue of the mirror directory root."""
+        root.mkdir(parents=True, exist_ok=True)
+        self.path = root / MIRROR_DB
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+    def __enter__(self) -> "MirrorQueue":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit - close database."""
+        self.close()
+
+    def add(self, projects: Iterable[dict[str, Any]]) -> dict[str, int]:
+        """Queue projects from a catalog walk (records with identifier, name, updated_at).
+
+        New projects are queued, mirrored ones only if their updated_at
+        changed; everything else keeps its state.
+
+        Returns:
+            Counts of added, updated and unchanged projects
+        """
+        counts = {"added": 0, "updated": 0, "unchanged": 0}
+        with self._db:
+            for project in projects:
+                if not project.get("identifier"):
+                    continue
+                item_id = short_id(project["identifier"])
+                row = self._db.execute(
+                    "SELECT updated_at FROM jobs WHERE id = ?", (item_id,)
+                ).fetchone()
+                if row is None:
+                    self._db.execute(
+                        "INSERT INTO jobs (id, name, updated_at) VALUES (?, ?, ?)",
+                        (item_id, project.get("name"), project.get("updated_at")),
+                    )
+                    counts["added"] += 1
+                elif row[0] != project.get("updated_at"):
+                    self._db.execute(
+                        "UPDATE jobs SET name = ?, updated_at = ?, status = 'pending', "
+                        "attempts = 0, error = NULL WHERE id = ?",
+                        (project.get("name"), project.get("updated_at"), item_id),
+                    )
+                    counts["updated"] += 1
+                else:
+                    counts["unchanged"] += 1
+        return counts
+
+    def todo(self, retry_failed: bool = True) -> list[str]:
+        """Identifiers still to mirror, in catalog order."""
+        statuses = ("pending", "failed") if retry_failed else ("pending",)
+        rows = self._db.execute(
+            f"SELECT id FROM jobs WHERE status IN ({','.join('?' * len(statuses))}) "
+            "ORDER BY rowid",
+            statuses,
+        )
+        return [row[0] for row in rows]
+
+    def record(self, result: dict[str, Any]) -> None:
+        """Commit the outcome of one item (a download result record)."""
+        if result["status"] == "success":
+            self._db.execute(
+                "UPDATE jobs SET status = 'done', attempts = attempts + 1, file = ?, "
+                "size = ?, sha256 = ?, error = NULL, mirrored_at = ? WHERE id = ?",
+                (result.get("file"), result.get("size"), result.get("sha256"), time.time(),
+                 result["id"]),
+            )
+        else:
+            self._db.execute(
+                "UPDATE jobs SET status = 'failed', attempts = attempts + 1, error = ? "
+                "WHERE id = ?",
+                (result.get("message"), result["id"]),
+            )
+        self._db.commit()
+
+    def counts(self) -> dict[str, int]:
+        """Number of projects per status, plus the mirrored bytes."""
+        counts = {status: 0 for status in STATUSES}
+        for status, n in self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            counts[status] = n
+        counts["total"] = sum(counts[s] for s in STATUSES)
+        counts["bytes"] = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM jobs WHERE status = 'done'"
+        ).fetchone()[0]
+        return counts
+
+
+@dataclass
+class MirrorProgress:
+    """Throughput and ETA of a mirror run, from the items finished so far.
+
+    The ETA assumes the remaining items take as long on average as the
+    finished ones (archive sizes are not known before each download).
+    """
+
+    total: int
+    done: int = 0
+    failed: int = 0
+    bytes: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    def add(self, result: dict[str, Any]) -> None:
+        if result["status"] == "success":
+            self.done += 1
+            self.bytes += result.get("size") or 0
+        else:
+            self.failed += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        finished = self.done + self.failed
+        remaining = self.total - finished
+        eta = elapsed / finished * remaining if finished else None
+        return {
+            "done": self.done,
+            "failed": self.failed,
+            "remaining": remaining,
+            "bytes": self.bytes,
+            "elapsed_s": round(elapsed, 1),
+            "mb_s": round(self.bytes / elapsed / 1e6, 2) if elapsed else 0.0,
+            "eta_s": round(eta, 1) if eta is not None else None,
+        }
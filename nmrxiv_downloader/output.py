@@ -1,15 +1,23 @@
 """Output formatting for nmrxiv-downloader."""
 
 import json
+import os
 import sys
-from typing import Any
+from typing import Any, Iterable
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
-console = Console()
+_console = None
+
+
+def get_console():
+    """Shared rich Console, created on first use (rich is only imported for tables and panels)."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
 
 
 def output_json(data: Any, pretty: bool = True) -> None:
@@ -18,6 +26,36 @@ def output_json(data: Any, pretty: bool = True) -> None:
     print(json.dumps(data, indent=indent, default=str))
 
 
+def output_ndjson(record: Any) -> None:
+    """Output one compact JSON object per line, flushed immediately."""
+    output_ndjson_items([record])
+
+
+def output_ndjson_items(records: Iterable[Any]) -> None:
+    """Output a batch of records (e.g. one page) as NDJSON with a single write.
+
+    Pydantic models are serialized directly with model_dump_json. If the
+    reader goes away (e.g. `| head`), exits quietly instead of failing.
+    """
+    lines = [
+        r.model_dump_json() if hasattr(r, "model_dump_json")
+        else json.dumps(r, separators=(",", ":"), default=str)
+        for r in records
+    ]
+    if not lines:
+        return
+    try:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Point stdout at devnull so the interpreter's final flush doesn't fail too
+        try:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        except (OSError, ValueError):
+            pass  # Not backed by a file descriptor (e.g. a daemon connection)
+        raise typer.Exit(code=0)
+
+
 def output_error(message: str, code: int = 1) -> None:
     """Output error as JSON to stderr and exit."""
     error = {"error": True, "message": message, "code": code}
@@ -45,6 +83,8 @@ def output_table(
         title: Optional table title
         footer: Optional footer text
     """
+    from rich.table import Table
+
     table = Table(title=title, show_header=True, header_style="bold cyan")
 
     for key, header in columns:
@@ -60,6 +100,7 @@ def output_table(
             values.append(truncate(value))
         table.add_row(*values)
 
+    console = get_console()
     console.print(table)
     if footer:
         console.print(f"[dim]{footer}[/dim]")
@@ -154,5 +195,7 @@ def output_item(data: dict, title: str | None = None) -> None:
         lines.append(f"[bold]NMRium Available:[/bold] {'Yes' if data['has_nmrium'] else 'No'}")
 
     content = "\n".join(line for line in lines if line or lines.index(line) > 0)
+    from rich.panel import Panel
+
     panel = Panel(content, title=title or data.get("name", "Item"), border_style="cyan")
-    console.print(panel)
+    get_console().print(panel)
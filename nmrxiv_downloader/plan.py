@@ -0,0 +1,278 @@
+"""Download planning: size preflight, disk-space check and queue ordering.
+
+Before any archive is transferred, each requested item is resolved to its
+download URL and sized with a HEAD request (all concurrently). The plan
+knows how many bytes will actually be written (partial downloads that can
+be resumed and content-store hits need less or nothing), compares that
+with the free space at the destination, and orders the queue.
+"""
+
+from __future__ import annotations
+
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from . import telemetry
+from .errors import NmrXivError
+
+if TYPE_CHECKING:
+    from .client import NmrXivClient
+    from .store import ContentStore
+
+ORDERS = ("input", "smallest", "largest")
+
+# HEAD requests in flight while planning
+PLAN_CONCURRENCY = 16
+
+
+@dataclass
+class PlannedDownload:
+    """One item of a download plan.
+
+    Attributes:
+        id: Item identifier
+        url: Archive URL (None if the item could not be resolved)
+        file: Destination path of the archive
+        size: Archive size from the HEAD response (None if unknown)
+        resumable: Bytes of a partial download that a resumed transfer keeps
+        store_hit: The content store holds this exact archive (linked, not downloaded)
+        slice_of: Parent project of a dataset whose files are fetched from the
+            project archive (url is that archive, file the extraction directory)
+        error: Why the item cannot be downloaded
+    """
+
+    id: str
+    url: str | None = None
+    file: Path | None = None
+    size: int | None = None
+    resumable: int = 0
+    store_hit: bool = False
+    slice_of: str | None = None
+    error: str | None = None
+
+    @property
+    def download_bytes(self) -> int | None:
+        """Bytes still to transfer (None if the size is unknown)."""
+        if self.error or self.store_hit:
+            return 0
+        if self.size is None or self.slice_of:
+            return None
+        return max(self.size - self.resumable, 0)
+
+    def to_dict(self) -> dict[str, Any]:
+        record: dict[str, Any] = {"id": self.id}
+        if self.error:
+            record.update(status="error", message=self.error)
+            return record
+        record.update(
+            file=str(self.file.absolute()),
+            size=self.size,
+            download_bytes=self.download_bytes,
+        )
+        if self.resumable:
+            record["resumable"] = self.resumable
+        if self.store_hit:
+            record["store"] = "hit"
+        if self.slice_of:
+            record["slice_of"] = self.slice_of
+        return record
+
+
+@dataclass
+class DownloadPlan:
+    """Sized and ordered download queue for one destination directory.
+
+    Attributes:
+        entries: Items in the order they will be downloaded
+        dest: Destination directory
+        free: Free bytes at the destination
+        extract: Archives will be extracted next to them
+        order: How the queue was ordered (see ORDERS)
+        priority: Identifiers moved to the front of the queue
+    """
+
+    entries: list[PlannedDownload]
+    dest: Path
+    free: int
+    extract: bool = False
+    order: str = "input"
+    priority: list[str] = field(default_factory=list)
+
+    @property
+    def total_bytes(self) -> int:
+        """Combined size of all archives with a known size."""
+        return sum(e.size or 0 for e in self.entries if not e.error)
+
+    @property
+    def download_bytes(self) -> int:
+        """Bytes still to transfer (known sizes only)."""
+        return sum(e.download_bytes or 0 for e in self.entries)
+
+    @property
+    def required_bytes(self) -> int:
+        """Estimated disk space the whole queue needs at the destination.
+
+        Extraction is estimated at one archive size per archive (a lower
+        bound for typical NMR data, whose binary FIDs barely compress).
+        Items in unknown (including every dataset slice) count as nothing,
+        so whenever there are any, this is a lower bound too.
+        """
+        required = self.download_bytes
+        if self.extract:
+            required += sum(e.size or 0 for e in self.entries if not e.error)
+        return required
+
+    @property
+    def unknown(self) -> list[str]:
+        """Items whose archive size the server did not report."""
+        return [e.id for e in self.entries if e.download_bytes is None]
+
+    @property
+    def lower_bound(self) -> bool:
+        """Whether required_bytes leaves out items of unknown size."""
+        return bool(self.unknown)
+
+    @property
+    def fits(self) -> bool:
+        """Whether the queue fits into the free space at the destination.
+
+        Judged on the known sizes only; see lower_bound.
+        """
+        return self.required_bytes <= self.free
+
+    def to_dict(self) -> dict[str, Any]:
+        result = {
+            "status": "ok" if self.fits else "insufficient_space",
+            "destination": str(self.dest.absolute()),
+            "count": len(self.entries),
+            "total_bytes": self.total_bytes,
+            "download_bytes": self.download_bytes,
+            "required_bytes": self.required_bytes,
+        }
+        if self.lower_bound:
+            result["lower_bound"] = True
+        result.update(
+            free_bytes=self.free,
+            order=self.order,
+            queue=[e.to_dict() for e in self.entries],
+        )
+        if self.priority:
+            result["priority"] = self.priority
+        if self.unknown:
+            result["unknown_size"] = self.unknown
+        errors = [e.id for e in self.entries if e.error]
+        if errors:
+            result["errors"] = errors
+        return result
+
+
+def _plan_item(
+    client: NmrXivClient,
+    item_id: str,
+    dest: Path,
+    resume: bool,
+    store: ContentStore | None,
+) -> PlannedDownload:
+    """Resolve and size one item (the item lookup is served from the response cache)."""
+    from .client import resumable_bytes
+    from .index import parent_project
+
+    entry = PlannedDownload(item_id)
+    try:
+        item = client.get_item(item_id)
+        url = item.get("download_url")
+        if not url and parent_project(item):
+            # Sliced out of the project archive; its size is only known once
+            # the archive's central directory has been read
+            entry.slice_of = parent_project(item)
+            entry.url = client.get_item(entry.slice_of).get("download_url")
+            entry.file = dest / item_id
+            return entry
+    except NmrXivError as e:
+        entry.error = e.message
+        return entry
+    if not url:
+        entry.error = f"No download URL available for {item_id}"
+        return entry
+    entry.url = url
+    entry.file = dest / url.split("/")[-1]
+
+    try:
+        info = client.remote_file_info(url)
+    except NmrXivError:
+        return entry  # No HEAD support: size unknown, the download will still be tried
+    entry.size = info["size"]
+    if store is not None and store.lookup(url, info["etag"], info["size"]) is not None:
+        entry.store_hit = True
+        return entry
+    if resume:
+        entry.resumable = resumable_bytes(entry.file, url, (info["etag"], info["last_modified"]))
+    return entry
+
+
+def plan_downloads(
+    client: NmrXivClient,
+    ids: list[str],
+    dest: Path,
+    order: str = "input",
+    priority: list[str] | None = None,
+    extract: bool = False,
+    resume: bool = True,
+    store: ContentStore | None = None,
+    concurrency: int = PLAN_CONCURRENCY,
+) -> DownloadPlan:
+    """Size every requested archive concurrently and order the download queue.
+
+    Args:
+        client: API client (its rate limits apply to the HEAD requests)
+        ids: Item identifiers
+        dest: Destination directory (used for the free-space check)
+        order: "input" (as given), "smallest" first (earliest first results)
+            or "largest" first; items of unknown size go last
+        priority: Identifiers to download before all others, in this order
+        extract: Include extraction in the disk-space estimate
+        resume: Count resumable partial downloads as already on disk
+        store: Content store whose hits need no download
+        concurrency: HEAD requests in flight
+
+    Returns:
+        The plan; check plan.fits before starting
+
+    Raises:
+        ValueError: If order is unknown
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if order not in ORDERS:
+        raise ValueError(f"Unknown order: {order}")
+
+    with telemetry.span("plan", items=len(ids)), ThreadPoolExecutor(
+        max_workers=max(1, min(concurrency, len(ids)))
+    ) as pool:
+        entries = [*pool.map(lambda i: _plan_item(client, i, dest, resume, store), ids)]
+
+    if order != "input":
+        sign = 1 if order == "smallest" else -1
+        entries.sort(key=lambda e: (e.size is None, sign * (e.size or 0)))
+    if priority:
+        rank = {item_id: n for n, item_id in enumerate(priority)}
+        entries.sort(key=lambda e: rank.get(e.id, len(rank)))  # Stable: keeps the order above
+
+    return DownloadPlan(
+        entries=entries,
+        dest=dest,
+        free=shutil.disk_usage(_existing_parent(dest)).free,
+        extract=extract,
+        order=order,
+        priority=list(priority or []),
+    )
+
+
+def _existing_parent(path: Path) -> Path:
+    """Nearest existing directory at or above path (for disk_usage)."""
+    path = path.absolute()
+    while not path.exists() and path != path.parent:
+        path = path.parent
+    return path
@@ -0,0 +1,272 @@
+"""Client-side rate limiting shared between threads and processes on one host."""
+
+import json
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import IO, AsyncIterator, Iterator
+
+from .cache import default_cache_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows: limits apply per process only
+    fcntl = None
+
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte count such as '500k', '10M' or '1.5G' (binary units)."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([kmg]?)i?b?\s*", value, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size: {value!r}")
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit.lower()])
+
+
+@contextmanager
+def _locked(path: Path | None, thread_lock: threading.Lock) -> Iterator[None]:
+    """Hold the thread lock and, when possible, an exclusive lock on path."""
+    with thread_lock:
+        if path is None or fcntl is None:
+            yield
+            return
+        with open(path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class TokenBucket:
+    """Token bucket refilled at a fixed rate, optionally shared through a state file.
+
+    Callers reserve tokens and sleep off any deficit, so concurrent callers
+    queue up fairly instead of all waking at once. With a state_file, every
+    process using the same file draws from one budget.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None, state_file: Path | None = None):
+        """Create a bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (default: one second's worth)
+            state_file: JSON file holding the shared bucket state
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.time()
+        if state_file is not None:
+            state_file.parent.mkdir(parents=True, exist_ok=True)
+
+    def _load(self) -> None:
+        """Read the shared state, if any (caller holds the lock)."""
+        if self.state_file is None or fcntl is None:
+            return
+        try:
+            state = json.loads(self.state_file.read_text() or "{}")
+            self._tokens = float(state["tokens"])
+            self._updated = float(state["updated"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self._tokens, self._updated = self.capacity, time.time()
+
+    def _store(self) -> None:
+        """Write the shared state, if any (caller holds the lock)."""
+        if self.state_file is None or fcntl is None:
+            return
+        self.state_file.write_text(json.dumps({"tokens": self._tokens, "updated": self._updated}))
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Take amount tokens and return how many seconds the caller must wait."""
+        lock_path = self.state_file.with_suffix(".lock") if self.state_file else None
+        with _locked(lock_path, self._lock):
+            self._load()
+            now = time.time()
+            elapsed = max(0.0, now - self._updated)
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate) - amount
+            self._updated = now
+            self._store()
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, amount: float = 1.0) -> None:
+        """Take amount tokens, sleeping until they are available."""
+        delay = self.reserve(amount)
+        if delay:
+            time.sleep(delay)
+
+
+class ConcurrencyGovernor:
+    """Host-wide cap on concurrent transfers using one lock file per slot."""
+
+    def __init__(self, slots: int, lock_dir: Path | None = None, poll_interval: float = 0.05):
+        """Create a governor.
+
+        Args:
+            slots: Maximum number of transfers in flight
+            lock_dir: Directory for slot lock files (None: this process only)
+            poll_interval: Seconds between attempts when all slots are busy
+        """
+        if slots < 1:
+            raise ValueError("slots must be at least 1")
+        self.slots = slots
+        self.lock_dir = lock_dir if fcntl is not None else None
+        self.poll_interval = poll_interval
+        self._semaphore = threading.BoundedSemaphore(slots)
+        if self.lock_dir is not None:
+            self.lock_dir.mkdir(parents=True, exist_ok=True)
+
+    def _try_slot(self) -> IO | None:
+        """Lock a free slot file, returning its handle, or None if all are busy."""
+        for i in range(self.slots):
+            f = open(self.lock_dir / f"slot-{i}.lock", "a")
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return f
+            except BlockingIOError:
+                f.close()
+        return None
+
+    def try_acquire(self) -> IO | bool | None:
+        """Take a free slot without waiting.
+
+        Returns:
+            Token to pass to release(), or None if all slots are busy
+        """
+        if not self._semaphore.acquire(blocking=False):
+            return None
+        if self.lock_dir is None:
+            return True
+        handle = self._try_slot()
+        if handle is None:
+            self._semaphore.release()
+        return handle
+
+    def release(self, token: IO | bool) -> None:
+        """Give back a slot taken with try_acquire()."""
+        if token is not True:
+            fcntl.flock(token, fcntl.LOCK_UN)
+            token.close()
+        self._semaphore.release()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one transfer slot for the duration of the block."""
+        with self._semaphore:
+            if self.lock_dir is None:
+                yield
+                return
+            handle = self._try_slot()
+            while handle is None:
+                time.sleep(self.poll_interval)
+                handle = self._try_slot()
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+                handle.close()
+
+
+class RateLimiter:
+    """Request rate, bandwidth and concurrency limits applied by the API client."""
+
+    def __init__(
+        self,
+        requests_per_second: float | None = None,
+        bytes_per_second: int | None = None,
+        max_connections: int | None = None,
+        state_dir: Path | None = None,
+    ):
+        """Create a limiter; any limit left as None is not enforced.
+
+        Args:
+            requests_per_second: Sustained request rate (bursts up to one second's worth)
+            bytes_per_second: Sustained download bandwidth
+            max_connections: Maximum concurrent requests and downloads
+            state_dir: Directory for state shared with other processes
+                (None: limits apply to this process only)
+        """
+        self._requests = (
+            TokenBucket(
+                requests_per_second,
+                capacity=max(1.0, requests_per_second),
+                state_file=state_dir / "requests.json" if state_dir else None,
+            )
+            if requests_per_second
+            else None
+        )
+        self._bytes = (
+            TokenBucket(
+                bytes_per_second,
+                state_file=state_dir / "bytes.json" if state_dir else None,
+            )
+            if bytes_per_second
+            else None
+        )
+        self._governor = (
+            ConcurrencyGovernor(
+                max_connections, lock_dir=state_dir / "slots" if state_dir else None
+            )
+            if max_connections
+            else None
+        )
+
+    def request(self) -> None:
+        """Wait until another request may be sent."""
+        if self._requests is not None:
+            self._requests.acquire()
+
+    def request_delay(self) -> float:
+        """Reserve a request and return the wait in seconds (for async callers)."""
+        return self._requests.reserve() if self._requests is not None else 0.0
+
+    def consume(self, nbytes: int) -> None:
+        """Account for nbytes received, waiting if over the bandwidth budget."""
+        if self._bytes is not None and nbytes:
+            self._bytes.acquire(nbytes)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a concurrency slot (no-op without a connection limit)."""
+        if self._governor is None:
+            yield
+            return
+        with self._governor.slot():
+            yield
+
+    def consume_delay(self, nbytes: int) -> float:
+        """Account for nbytes received and return the wait in seconds (for async callers)."""
+        if self._bytes is None or not nbytes:
+            return 0.0
+        return self._bytes.reserve(nbytes)
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[None]:
+        """Hold a concurrency slot without blocking the event loop."""
+        if self._governor is None:
+            yield
+            return
+        import asyncio
+
+        token = self._governor.try_acquire()
+        while token is None:
+            await asyncio.sleep(self._governor.poll_interval)
+            token = self._governor.try_acquire()
+        try:
+            yield
+        finally:
+            self._governor.release(token)
+
+
+def default_state_dir() -> Path:
+    """Directory holding the shared rate limiter state."""
+    return default_cache_dir() / "ratelimit"
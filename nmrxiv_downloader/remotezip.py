@@ -0,0 +1,303 @@
+"""Browse and extract members of remote ZIP archives with HTTP Range requests.
+
+Listing an archive fetches only its tail (end of central directory record,
+plus the ZIP64 records if present) and the central directory. Extraction
+fetches only the byte spans of the selected members; spans close to each
+other are fetched in one request. Parsing and decompression are done by
+the standard zipfile module reading from a RemoteFile.
+"""
+
+from __future__ import annotations
+
+import io
+import shutil
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from . import telemetry
+from .errors import NmrXivError
+from .extract import member_matches, safe_member_path
+
+if TYPE_CHECKING:
+    from .client import NmrXivClient
+
+# Bytes fetched from the end of the archive when opening it: the end of
+# central directory record with the longest possible comment, plus the
+# ZIP64 locator and record
+TAIL_SIZE = 65536 + 22 + 20 + 56
+
+# Member spans closer than this are fetched in one request
+MERGE_GAP = 256 * 1024
+
+# Largest single request; bigger spans are streamed in windows of this size
+MAX_FETCH = 8 * 1024 * 1024
+
+
+class RemoteFile(io.RawIOBase):
+    """Seekable, read-only view of a remote file, fetched in byte ranges.
+
+    Reads are served from the archive tail (fetched up front) or from the
+    current window. A miss fetches a new window: within a span announced
+    with expect() it extends to the end of that span (at most MAX_FETCH),
+    otherwise exactly the requested bytes.
+
+    Attributes:
+        size: File size in bytes
+        transferred: Bytes fetched so far
+        requests: Range requests made so far
+    """
+
+    def __init__(self, client: NmrXivClient, url: str, size: int, validator: str | None = None):
+        self._client = client
+        self._url = url
+        self._validator = validator
+        self.size = size
+        self._pos = 0
+        self._span: tuple[int, int] | None = None
+        self.transferred = 0
+        self.requests = 0
+        tail_start = max(0, size - TAIL_SIZE)
+        self._tail = (tail_start, self._fetch(tail_start, size))
+        self._window = (0, b"")
+
+    def _fetch(self, start: int, end: int) -> bytes:
+        """Fetch bytes [start, end)."""
+        if start >= end:
+            return b""
+        with telemetry.span("range.fetch", start=start, bytes=end - start):
+            data = self._client.fetch_range(self._url, start, end - 1, self._validator)
+        self.transferred += len(data)
+        self.requests += 1
+        return data
+
+    def expect(self, start: int, end: int) -> None:
+        """Announce that bytes [start, end) will be read next, in order."""
+        self._span = (start, end)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._pos = offset
+        return self._pos
+
+    def read(self, n: int = -1) -> bytes:
+        end = self.size if n is None or n < 0 else min(self._pos + n, self.size)
+        if self._pos >= end:
+            return b""
+        for start, data in (self._window, self._tail):
+            if start <= self._pos and end <= start + len(data):
+                chunk = data[self._pos - start:end - start]
+                self._pos = end
+                return chunk
+
+        fetch_end = end
+        if self._span and self._span[0] <= self._pos < self._span[1]:
+            fetch_end = max(end, min(self._span[1], self._pos + MAX_FETCH))
+        data = self._fetch(self._pos, fetch_end)
+        self._window = (self._pos, data)
+        chunk = data[:end - self._pos]
+        self._pos += len(chunk)
+        return chunk
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _name_key(name: str) -> str:
+    """Loose form of a directory or item name ('Sample_1-HSQC' -> 'sample 1 hsqc')."""
+    return " ".join(name.casefold().replace("_", " ").replace("-", " ").split())
+
+
+@dataclass
+class RemoteMember:
+    """An archive member, with the byte span of its local record."""
+
+    info: zipfile.ZipInfo
+    start: int
+    end: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.info.filename,
+            "size": self.info.file_size,
+            "compressed_size": self.info.compress_size,
+            "modified": datetime(*self.info.date_time).isoformat(),
+        }
+
+
+class RemoteZip:
+    """A remote ZIP archive whose central directory has been read.
+
+    Usable as a context manager.
+
+    Raises:
+        NmrXivError: If the server does not support byte ranges, or the
+            file is not a ZIP archive
+    """
+
+    def __init__(self, client: NmrXivClient, url: str):
+        info = client.remote_file_info(url)
+        if not info["accept_ranges"] or not info["size"]:
+            raise NmrXivError(
+                "The server does not support byte ranges for this archive; "
+                "use 'nmrxiv download' instead"
+            )
+        etag = info["etag"]
+        validator = etag if etag and not etag.startswith("W/") else info["last_modified"]
+        self.url = url
+        self.file = RemoteFile(client, url, info["size"], validator)
+        try:
+            self._zip = zipfile.ZipFile(self.file)
+        except zipfile.BadZipFile as e:
+            raise NmrXivError(f"Not a valid ZIP archive: {url} ({e})") from e
+
+        # A member's local record runs up to the next one (or the central directory)
+        infos = sorted(self._zip.infolist(), key=lambda i: i.header_offset)
+        ends = [i.header_offset for i in infos[1:]] + [self._zip.start_dir]
+        self.members = [
+            RemoteMember(info, info.header_offset, end) for info, end in zip(infos, ends)
+        ]
+
+    def __enter__(self) -> RemoteZip:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    @property
+    def size(self) -> int:
+        """Archive size in bytes."""
+        return self.file.size
+
+    @property
+    def transferred(self) -> int:
+        """Bytes fetched from the server so far."""
+        return self.file.transferred
+
+    def select(
+        self,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        prefix: str = "",
+    ) -> list[RemoteMember]:
+        """File members below prefix matching the include/exclude globs (see member_matches)."""
+        return [
+            m
+            for m in self.members
+            if not m.info.is_dir()
+            and m.info.filename.startswith(prefix)
+            and member_matches(m.info.filename, include, exclude)
+        ]
+
+    def directories(self) -> set[str]:
+        """Every directory in the archive, as 'a/b/' paths (including implied ones)."""
+        found = set()
+        for member in self.members:
+            parts = member.info.filename.split("/")[:-1]
+            for depth in range(1, len(parts) + 1):
+                found.add("/".join(parts[:depth]) + "/")
+        return found
+
+    def locate(self, names: list[str], parents: list[str] | None = None) -> str:
+        """Directory of an item that is known only by name (e.g. a dataset).
+
+        Candidates are directories whose own name matches one of names
+        (ignoring case, '-', '_' and spacing). Candidates below a directory
+        matching one of parents are preferred; of those, the shallowest
+        wins.
+
+        Returns:
+            The directory as an 'a/b/' prefix of its members' names
+
+        Raises:
+            NmrXivError: If no directory, or several equally good ones, match
+        """
+        names = [n for n in names if n]
+        keys = {_name_key(n) for n in names}
+        parent_keys = {_name_key(n) for n in parents or [] if n}
+        candidates = [
+            d for d in self.directories() if _name_key(d.rstrip("/").rsplit("/", 1)[-1]) in keys
+        ]
+        below_parent = [
+            d for d in candidates
+            if any(_name_key(part) in parent_keys for part in d.split("/")[:-2])
+        ]
+        candidates = below_parent or candidates
+        if not candidates or not names:
+            raise NmrXivError(f"No directory named {' or '.join(map(repr, names))} in the archive")
+        depth = min(d.count("/") for d in candidates)
+        best = sorted(d for d in candidates if d.count("/") == depth)
+        if len(best) > 1:
+            raise NmrXivError(
+                f"Several directories match {names[0]!r} in the archive: {', '.join(best[:5])}"
+            )
+        return best[0]
+
+    def extract(
+        self,
+        members: list[RemoteMember],
+        dest: Path,
+        progress_callback: Callable[[int, int], None] | None = None,
+    ) -> list[str]:
+        """Fetch and decompress members into dest, keeping their archive paths.
+
+        Members are read in archive order; neighbouring spans (gaps up to
+        MERGE_GAP) are fetched together, large ones in MAX_FETCH windows.
+        progress_callback gets (bytes_done, total_bytes) of the compressed
+        member data after each member.
+
+        Returns:
+            Names of the extracted members
+
+        Raises:
+            NmrXivError: If fetching fails, or a member is corrupt
+        """
+        extracted = []
+        done = 0
+        total = sum(m.end - m.start for m in members)
+        groups: list[list[RemoteMember]] = []
+        for member in sorted(members, key=lambda m: m.start):
+            if groups and member.start - groups[-1][-1].end <= MERGE_GAP:
+                groups[-1].append(member)
+            else:
+                groups.append([member])
+
+        for group in groups:
+            self.file.expect(group[0].start, group[-1].end)
+            for member in group:
+                path = safe_member_path(dest, member.info.filename)
+                if path is None:
+                    continue
+                path.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    with telemetry.span("extract.member", size=member.info.file_size):
+                        with self._zip.open(member.info) as src, open(path, "wb") as dst:
+                            shutil.copyfileobj(src, dst, 1024 * 1024)
+                except zipfile.BadZipFile as e:
+                    raise NmrXivError(f"Corrupt member {member.info.filename}: {e}") from e
+                extracted.append(member.info.filename)
+                done += member.end - member.start
+                if progress_callback:
+                    progress_callback(done, total)
+        return extracted
@@ -0,0 +1,73 @@
+"""Retry policy for transient nmrxiv API and download failures."""
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Status codes worth retrying: timeouts, throttling and gateway/server hiccups
+RETRY_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delay in seconds or an HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class RetryPolicy:
+    """When and how long to wait before retrying a failed request.
+
+    Attributes:
+        max_attempts: Total attempts per request, including the first (1 disables retries)
+        backoff: Base delay in seconds, doubled after every failed attempt
+        max_backoff: Upper bound for the computed backoff delay
+        max_retry_after: Upper bound for delays requested by the server via Retry-After
+        safe_post_paths: Path prefixes of POST endpoints that are safe to repeat
+    """
+
+    max_attempts: int = 4
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    max_retry_after: float = 120.0
+    safe_post_paths: tuple[str, ...] = ("/search",)
+
+    def allows(self, method: str, path: str) -> bool:
+        """Whether a request may be repeated without side effects."""
+        method = method.upper()
+        if method in IDEMPOTENT_METHODS:
+            return True
+        return method == "POST" and path.startswith(self.safe_post_paths)
+
+    def should_retry(self, attempt: int, status_code: int | None = None) -> bool:
+        """Whether to retry after a failed attempt (1-based).
+
+        A status_code of None means the request failed at the transport level.
+        """
+        if attempt >= self.max_attempts:
+            return False
+        return status_code is None or status_code in RETRY_STATUS_CODES
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to wait after a failed attempt (1-based).
+
+        Uses the server's Retry-After when given, otherwise exponential
+        backoff with full jitter.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        ceiling = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
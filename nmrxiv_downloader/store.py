@@ -0,0 +1,189 @@
+"""Content-addressed local store for downloaded archives, with checksum manifests."""
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from . import telemetry
+
+try:
+    import fcntl
+except ImportError:  # Windows: no reflinks
+    fcntl = None
+
+# FICLONE ioctl (Linux): share extents copy-on-write between two files
+_FICLONE = 0x40049409
+
+_HASH_BUFFER = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS remotes (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    size INTEGER,
+    sha256 TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+"""
+
+
+def default_store_dir() -> Path:
+    """Return the store directory ($NMRXIV_STORE_DIR, else XDG data home)."""
+    if os.environ.get("NMRXIV_STORE_DIR"):
+        return Path(os.environ["NMRXIV_STORE_DIR"])
+    base = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(base) / "nmrxiv" / "store"
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with telemetry.span("hash", file=path.name), open(path, "rb") as f:
+        while chunk := f.read(_HASH_BUFFER):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_path(path: Path) -> Path:
+    """Checksum manifest written next to an archive."""
+    return path.with_name(path.name + ".sha256")
+
+
+def write_manifest(path: Path, digest: str) -> Path:
+    """Write a sha256sum-compatible manifest for path."""
+    manifest = manifest_path(path)
+    manifest.write_text(f"{digest}  {path.name}\n")
+    return manifest
+
+
+def write_files_manifest(manifest: Path, files: list[Path]) -> Path:
+    """Write a sha256sum-compatible manifest for files below the manifest's directory."""
+    lines = [f"{hash_file(f)}  {f.relative_to(manifest.parent).as_posix()}\n" for f in files]
+    manifest.write_text("".join(lines))
+    return manifest
+
+
+def read_manifest(manifest: Path) -> list[tuple[str, Path]]:
+    """Parse a sha256sum-style manifest into (digest, file path) pairs."""
+    entries = []
+    for line in manifest.read_text().splitlines():
+        digest, _, name = line.strip().partition(" ")
+        if digest and name:
+            entries.append((digest.lower(), manifest.parent / name.lstrip(" *")))
+    return entries
+
+
+def verify_manifest(manifest: Path) -> list[dict]:
+    """Check every file listed in a manifest, returning one result per file."""
+    results = []
+    for expected, path in read_manifest(manifest):
+        result = {"file": str(path), "manifest": str(manifest), "expected": expected}
+        try:
+            actual = hash_file(path)
+        except OSError as e:
+            result.update(status="missing", message=str(e))
+        else:
+            result.update(status="ok" if actual == expected else "mismatch", actual=actual)
+        results.append(result)
+    return results
+
+
+def _reflink(src: Path, dest: Path) -> bool:
+    """Try a copy-on-write clone of src at dest."""
+    if fcntl is None:
+        return False
+    try:
+        with open(src, "rb") as s, open(dest, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        return True
+    except OSError:
+        dest.unlink(missing_ok=True)
+        return False
+
+
+class ContentStore:
+    """Archives stored once under their SHA-256, linked into output directories."""
+
+    def __init__(self, root: Path | None = None):
+        """Open (or create) a store rooted at root (default: default_store_dir())."""
+        self.root = root or default_store_dir()
+        (self.root / "sha256").mkdir(parents=True, exist_ok=True)
+        import sqlite3
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.root / "index.sqlite3", check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the store index."""
+        self._db.close()
+
+    def object_path(self, digest: str) -> Path:
+        """Location of the object with this digest."""
+        return self.root / "sha256" / digest[:2] / digest
+
+    def lookup(self, url: str, etag: str | None, size: int | None) -> str | None:
+        """Digest of a stored copy of url if the remote still matches it.
+
+        A match needs the recorded ETag to equal the current one, or, when the
+        server sends no ETag, the recorded size to equal the current size.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, size, sha256 FROM remotes WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        stored_etag, stored_size, digest = row
+        if etag or stored_etag:
+            matches = etag == stored_etag
+        else:
+            matches = size is not None and size == stored_size
+        if not matches or not self.object_path(digest).exists():
+            return None
+        return digest
+
+    def add(self, path: Path, digest: str, url: str, etag: str | None = None) -> Path:
+        """Move a downloaded file into the store and link it back in place.
+
+        Returns:
+            Path of the stored object
+        """
+        obj = self.object_path(digest)
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        if obj.exists():
+            path.unlink()
+        else:
+            try:
+                path.replace(obj)
+            except OSError:
+                # Different filesystem: copy, then drop the original
+                tmp = obj.with_name(obj.name + ".tmp")
+                shutil.copyfile(path, tmp)
+                tmp.replace(obj)
+                path.unlink()
+            obj.chmod(0o444)
+        self.link(digest, path)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO remotes VALUES (?, ?, ?, ?, ?)",
+                (url, etag, obj.stat().st_size, digest, time.time()),
+            )
+            self._db.commit()
+        return obj
+
+    def link(self, digest: str, dest: Path) -> str:
+        """Materialize an object at dest, returning how: reflink, hardlink or copy."""
+        obj = self.object_path(digest)
+        dest.unlink(missing_ok=True)
+        if _reflink(obj, dest):
+            return "reflink"
+        try:
+            os.link(obj, dest)
+            return "hardlink"
+        except OSError:
+            shutil.copyfile(obj, dest)
+            return "copy"
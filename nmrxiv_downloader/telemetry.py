@@ -0,0 +1,295 @@
+"""Opt-in timing telemetry for the client's hot paths.
+
+When enabled (--trace / --metrics, or enable() from library code), the
+client records how long each phase of a run takes and counts what it
+moved:
+
+- spans: api.request, json.decode, parse, download, extract, ... with
+  HTTP requests split by the transport into http.connect (DNS and TCP),
+  http.tls, http.send, http.wait (server time until the response headers)
+  and http.body
+- counters: http.requests, http.retries, cache.hits, cache.misses,
+  cache.revalidated, download.bytes, ...
+
+The result can be written as a Chrome trace (open it in chrome://tracing
+or https://ui.perfetto.dev) or in the Prometheus text format. Disabled, every
+hook is a single global lookup, so the client pays nothing for it.
+
+This module only uses the standard library.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Iterator
+
+# Timeline events kept for --trace; aggregates keep counting beyond this
+MAX_EVENTS = 500_000
+
+# httpcore trace steps (without their "http11."/"connection." prefix) and the phase they time
+_HTTP_PHASES = {
+    "connect_tcp": "http.connect",
+    "connect_unix_socket": "http.connect",
+    "start_tls": "http.tls",
+    "send_request_headers": "http.send",
+    "send_request_body": "http.send",
+    "receive_response_headers": "http.wait",
+    "receive_response_body": "http.body",
+}
+
+_NULL = nullcontext()
+
+
+class Telemetry:
+    """Per-phase timers, counters and (optionally) a timeline of spans.
+
+    Safe to use from several threads and from asyncio tasks.
+
+    Attributes:
+        timeline: Whether individual spans are kept for a Chrome trace
+    """
+
+    def __init__(self, timeline: bool = False):
+        self.timeline = timeline
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._started_at = time.time()
+        self._timers: dict[str, list[float]] = {}  # name -> [calls, seconds]
+        self._counters: dict[str, int] = {}
+        self._events: list[dict[str, Any]] = []
+        self._dropped = 0
+        self._lanes: dict[int, int] = {}
+
+    def _lane(self) -> int:
+        """Timeline row of the caller: its asyncio task, else its thread.
+
+        Concurrent tasks share a thread but not a row, so their spans
+        don't overlap in the viewer.
+        """
+        asyncio = sys.modules.get("asyncio")
+        task = None
+        if asyncio is not None:
+            try:
+                task = asyncio.current_task()
+            except RuntimeError:
+                pass
+        key = id(task) if task is not None else threading.get_ident()
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = len(self._lanes) + 1
+        return lane
+
+    def record(
+        self, name: str, start: float, end: float, args: dict[str, Any] | None = None
+    ) -> None:
+        """Add a finished span (perf_counter timestamps)."""
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = [0, 0.0]
+            timer[0] += 1
+            timer[1] += end - start
+            if not self.timeline:
+                return
+            if len(self._events) >= MAX_EVENTS:
+                self._dropped += 1
+                return
+            event = {
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": round((start - self._start) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": self._lane(),
+            }
+            if args:
+                event["args"] = args
+            self._events.append(event)
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        """Time the enclosed block as one span of phase name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter(), args)
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        """Add to a phase's totals without a timeline entry (for per-chunk work)."""
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = [0, 0.0]
+            timer[0] += calls
+            timer[1] += seconds
+
+    def summary(self) -> dict[str, Any]:
+        """Totals per phase and counter, slowest phase first."""
+        with self._lock:
+            timers = sorted(self._timers.items(), key=lambda t: t[1][1], reverse=True)
+            result: dict[str, Any] = {
+                "wall_seconds": round(time.perf_counter() - self._start, 6),
+                "phases": {
+                    name: {"calls": int(calls), "seconds": round(seconds, 6)}
+                    for name, (calls, seconds) in timers
+                },
+                "counters": dict(sorted(self._counters.items())),
+            }
+            if self._dropped:
+                result["dropped_events"] = self._dropped
+        return result
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """The timeline in the Chrome trace event format, with the summary as otherData."""
+        with self._lock:
+            events = [*self._events]
+        meta = {"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "nmrxiv"}}
+        return {
+            "traceEvents": [meta, *events],
+            "displayTimeUnit": "ms",
+            "otherData": {"started_at": self._started_at, **self.summary()},
+        }
+
+    def prometheus(self) -> str:
+        """Totals in the Prometheus text format (e.g. for node_exporter's textfile collector)."""
+        summary = self.summary()
+        lines = [
+            "# HELP nmrxiv_phase_seconds_total Time spent per phase.",
+            "# TYPE nmrxiv_phase_seconds_total counter",
+        ]
+        for name, phase in summary["phases"].items():
+            lines.append(f'nmrxiv_phase_seconds_total{{phase="{name}"}} {phase["seconds"]}')
+        lines += [
+            "# HELP nmrxiv_phase_calls_total Spans recorded per phase.",
+            "# TYPE nmrxiv_phase_calls_total counter",
+        ]
+        for name, phase in summary["phases"].items():
+            lines.append(f'nmrxiv_phase_calls_total{{phase="{name}"}} {phase["calls"]}')
+        for name, value in summary["counters"].items():
+            metric = "nmrxiv_" + name.replace(".", "_").replace("-", "_") + "_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        lines += [
+            "# HELP nmrxiv_run_seconds Wall time of the run.",
+            "# TYPE nmrxiv_run_seconds gauge",
+            f"nmrxiv_run_seconds {summary['wall_seconds']}",
+            "# HELP nmrxiv_run_timestamp_seconds When the run started.",
+            "# TYPE nmrxiv_run_timestamp_seconds gauge",
+            f"nmrxiv_run_timestamp_seconds {round(self._started_at, 3)}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write_trace(self, path: Path) -> None:
+        _write_atomic(path, json.dumps(self.chrome_trace()))
+
+    def write_metrics(self, path: Path) -> None:
+        _write_atomic(path, self.prometheus())
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Replace path with text, so collectors never read a half-written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+_active: Telemetry | None = None
+
+
+def enable(timeline: bool = False) -> Telemetry:
+    """Start recording (timeline=True also keeps every span for a Chrome trace).
+
+    Clients pick up the HTTP hooks when they create their connection pool,
+    so enable telemetry before the first request.
+    """
+    global _active
+    _active = Telemetry(timeline)
+    return _active
+
+
+def disable() -> None:
+    global _active
+    _active = None
+
+
+def active() -> Telemetry | None:
+    """The current recorder, or None if telemetry is off."""
+    return _active
+
+
+def span(name: str, **args: Any):
+    """Time the enclosed block as a span of phase name (no-op when disabled)."""
+    if _active is None:
+        return _NULL
+    return _active.span(name, **args)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Increase counter name by n (no-op when disabled)."""
+    if _active is not None:
+        _active.count(name, n)
+
+
+def add_time(name: str, seconds: float, calls: int = 1) -> None:
+    """Add seconds to phase name without a timeline entry (no-op when disabled)."""
+    if _active is not None:
+        _active.add_time(name, seconds, calls)
+
+
+def _trace_step(recorder: Telemetry, starts: dict[str, float], name: str) -> None:
+    """Turn an httpcore trace callback into http.* spans."""
+    step, _, state = name.rpartition(".")
+    if state == "started":
+        starts[step] = time.perf_counter()
+        return
+    start = starts.pop(step, None)
+    phase = _HTTP_PHASES.get(step.partition(".")[2])
+    if start is not None and phase is not None:
+        recorder.record(phase, start, time.perf_counter())
+
+
+def http_hooks(asynchronous: bool = False) -> dict[str, list]:
+    """httpx event hooks that time and count every request of a client.
+
+    Each request gets an httpcore "trace" extension that splits it into
+    connect/tls/send/wait/body spans. Returns no hooks when telemetry is off.
+    """
+    recorder = _active
+    if recorder is None:
+        return {}
+
+    def on_request(request) -> None:
+        recorder.count("http.requests")
+        starts: dict[str, float] = {}
+        if asynchronous:
+            async def trace(name: str, info: dict) -> None:
+                _trace_step(recorder, starts, name)
+        else:
+            def trace(name: str, info: dict) -> None:
+                _trace_step(recorder, starts, name)
+        request.extensions["trace"] = trace
+
+    def on_response(response) -> None:
+        recorder.count(f"http.status.{response.status_code // 100}xx")
+
+    if asynchronous:
+        async def on_request_async(request) -> None:
+            on_request(request)
+
+        async def on_response_async(response) -> None:
+            on_response(response)
+
+        return {"request": [on_request_async], "response": [on_response_async]}
+    return {"request": [on_request], "response": [on_response]}
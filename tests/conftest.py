@@ -0,0 +1,101 @@
+"""Shared fixtures: an in-memory file server, the mock API and an in-process CLI."""
+
+import os
+import re
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from mock_server import MockNmrXiv  # noqa: E402
+
+
+class RangeServer:
+    """Serves one file over httpx.MockTransport, with ETag and byte-range support.
+
+    Attributes:
+        data: File contents (replace to simulate a changed file)
+        etag: Strong ETag of the current contents
+        accept_ranges: Whether Range requests are honoured
+        requests: Every request received, in order
+    """
+
+    def __init__(self, data: bytes, etag: str = '"v1"'):
+        self.data = data
+        self.etag = etag
+        self.accept_ranges = True
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {"ETag": self.etag}
+        match = None
+        if self.accept_ranges:
+            headers["Accept-Ranges"] = "bytes"
+            match = re.fullmatch(r"bytes=(\d+)-(\d*)", request.headers.get("range", ""))
+        if_range = request.headers.get("if-range")
+        if match and (if_range is None or if_range == self.etag):
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(self.data) - 1), len(self.data) - 1)
+            if start >= len(self.data):
+                headers["Content-Range"] = f"bytes */{len(self.data)}"
+                return httpx.Response(416, headers=headers)
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(self.data)}"
+            body = self.data[start:end + 1]
+            status = 206
+        else:
+            body = self.data
+            status = 200
+        headers["Content-Length"] = str(len(body))
+        if request.method == "HEAD":
+            body = b""
+        return httpx.Response(status, headers=headers, content=body)
+
+    def client(self, **kwargs) -> httpx.Client:
+        """An httpx client whose requests are answered by this server."""
+        return httpx.Client(transport=httpx.MockTransport(self), **kwargs)
+
+
+@pytest.fixture
+def range_server() -> RangeServer:
+    """A file server for 1 MiB of patterned bytes."""
+    return RangeServer(bytes(range(256)) * 4096)
+
+
+@pytest.fixture(scope="session")
+def mock_api():
+    """The benchmark mock nmrXiv API, served on a free local port."""
+    with MockNmrXiv(pages=1, per_page=5, zip_size=64 * 1024) as mock:
+        yield mock
+
+
+@pytest.fixture
+def nmrxiv(mock_api, tmp_path, monkeypatch):
+    """Run the CLI in-process against mock_api, with state under tmp_path.
+
+    Returns a function taking the command line arguments and returning the
+    click Result (stdout in .stdout, stderr in .stderr).
+    """
+    from typer.testing import CliRunner
+
+    from nmrxiv_downloader.cli import app
+    from nmrxiv_downloader.client import AsyncNmrXivClient, NmrXivClient
+
+    monkeypatch.setattr(NmrXivClient, "BASE_URL", mock_api.url)
+    monkeypatch.setattr(AsyncNmrXivClient, "BASE_URL", mock_api.url)
+    for name in [*os.environ]:
+        if name.startswith("NMRXIV_"):
+            monkeypatch.delenv(name)
+    monkeypatch.setenv("NMRXIV_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("NMRXIV_STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setenv("NMRXIV_INDEX", str(tmp_path / "catalog.sqlite3"))
+    runner = CliRunner()
+
+    def run(*args: str):
+        return runner.invoke(app, [*args], catch_exceptions=False)
+
+    return run
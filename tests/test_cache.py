@@ -0,0 +1,153 @@
+import asyncio
+import sqlite3
+import types
+
+import httpx
+import pytest
+
+from nmrxiv_downloader import cache as cache_module
+from nmrxiv_downloader.cache import ResponseCache
+from nmrxiv_downloader.client import AsyncNmrXivClient, NmrXivClient
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the cache module."""
+    now = types.SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(cache_module, "time", types.SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def open_cache(tmp_path, **kwargs) -> ResponseCache:
+    ttls = [("/list/", 60), ("/P", 3600)]
+    return ResponseCache(tmp_path / "responses.sqlite3", ttls=ttls, **kwargs)
+
+
+def test_key_depends_on_method_path_and_body():
+    key = ResponseCache.key
+    assert key("get", "/P5") == key("GET", "/P5")
+    assert key("POST", "/search", {"a": 1, "b": 2}) == key("POST", "/search", {"b": 2, "a": 1})
+    assert key("POST", "/search", {"a": 1}) != key("POST", "/search", {"a": 2})
+    assert key("GET", "/P5") != key("GET", "/P6")
+
+
+def test_ttl_for_first_matching_prefix(tmp_path):
+    cache = open_cache(tmp_path)
+    assert cache.ttl_for("/list/projects?page=2") == 60
+    assert cache.ttl_for("/P5") == 3600
+    assert cache.ttl_for("/search") == 0
+
+
+def test_entries_go_stale_and_refresh(tmp_path, clock):
+    cache = open_cache(tmp_path)
+    key = cache.key("GET", "/list/projects")
+    cache.put(key, "GET", "/list/projects", b"{}", etag='"e1"')
+    entry = cache.get(key)
+    assert entry.fresh
+    assert entry.body == b"{}"
+    assert entry.validators() == {"If-None-Match": '"e1"'}
+
+    clock.value += 61
+    assert not cache.get(key).fresh
+    assert cache.stats()["stale"] == 1
+
+    cache.refresh(key, "/list/projects")
+    assert cache.get(key).fresh
+
+
+def test_uncached_paths_are_stale_immediately(tmp_path, clock):
+    cache = open_cache(tmp_path)
+    key = cache.key("POST", "/search", {"query": "x"})
+    cache.put(key, "POST", "/search", b"[]", last_modified="Wed, 21 Oct 2015 07:28:00 GMT")
+    entry = cache.get(key)
+    assert not entry.fresh
+    assert entry.validators() == {"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = open_cache(tmp_path, max_bytes=25)
+    keys = [cache.key("GET", f"/P{i}") for i in range(3)]
+    for i, key in enumerate(keys[:2]):
+        clock.value += 1
+        cache.put(key, "GET", f"/P{i}", b"x" * 10)
+    clock.value += 1
+    cache.get(keys[0])  # /P0 is now more recent than /P1
+
+    clock.value += 1
+    cache.put(keys[2], "GET", "/P2", b"x" * 10)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+    assert cache.stats()["size"] == 20
+
+
+def test_clear(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put(cache.key("GET", "/P1"), "GET", "/P1", b"{}")
+    assert cache.clear() == 1
+    assert cache.stats()["entries"] == 0
+
+
+def accessed_at(cache: ResponseCache, key: str) -> float:
+    return sqlite3.connect(cache.path).execute(
+        "SELECT accessed_at FROM responses WHERE key = ?", (key,)
+    ).fetchone()[0]
+
+
+def test_hits_are_written_back_in_batches(tmp_path, clock):
+    cache = open_cache(tmp_path)
+    key = cache.key("GET", "/P1")
+    cache.put(key, "GET", "/P1", b"{}")
+    clock.value += 10
+    cache.get(key)
+    assert accessed_at(cache, key) == 1000.0
+    cache.close()
+    assert accessed_at(cache, key) == 1010.0
+
+
+def test_locked_database_still_serves_hits(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, "BUSY_TIMEOUT", 0.05)
+    cache = open_cache(tmp_path)
+    key = cache.key("GET", "/P5")
+    cache.put(key, "GET", "/P5", b"{}")
+    other = sqlite3.connect(cache.path, isolation_level=None)
+    other.execute("BEGIN EXCLUSIVE")  # e.g. another process writing
+
+    assert cache.get(key).body == b"{}"
+    cache.put(cache.key("GET", "/P6"), "GET", "/P6", b"{}")
+    cache.refresh(key, "/P5")
+    other.execute("ROLLBACK")
+    assert cache.get(cache.key("GET", "/P6")) is None
+
+
+@pytest.fixture
+def broken(tmp_path):
+    """A cache holding an entry for /P5 whose database has become unusable."""
+    cache = open_cache(tmp_path)
+    cache.put(cache.key("GET", "/P5"), "GET", "/P5", b'{"data": {"name": "cached"}}')
+    cache._db.close()
+    return cache
+
+
+def api(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"data": {"name": "live"}})
+
+
+def test_client_falls_back_to_the_network(broken):
+    http = httpx.Client(base_url="http://api.test", transport=httpx.MockTransport(api))
+    with NmrXivClient(cache=broken, http_client=http) as client:
+        assert client.get_item("P5") == {"name": "live"}
+
+
+def test_async_client_falls_back_to_the_network(broken):
+    async def run():
+        client = AsyncNmrXivClient(cache=broken)
+        client._client = httpx.AsyncClient(
+            base_url="http://api.test", transport=httpx.MockTransport(api)
+        )
+        try:
+            return await client.get_item("P5")
+        finally:
+            await client._client.aclose()
+
+    assert asyncio.run(run()) == {"name": "live"}
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+
+import httpx
+import pytest
+
+from nmrxiv_downloader import client as client_module
+from nmrxiv_downloader.client import (
+    DIRECT_WRITE,
+    WRITE_BUFFER,
+    NmrXivClient,
+    _ChunkWriter,
+    _parse_content_range,
+    _partial_path,
+    _partial_state_path,
+    _resume_validator,
+)
+from nmrxiv_downloader.errors import NmrXivError
+from nmrxiv_downloader.retry import RetryPolicy
+
+URL = "http://files.test/P1.zip"
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("bytes 0-99/200", (0, 99, 200)),
+        ("bytes 100-199/*", (100, 199, None)),
+        ("bytes */200", (-1, -1, 200)),
+        ("bytes a-b/200", None),
+        ("items 0-9/10", None),
+        (None, None),
+    ],
+)
+def test_parse_content_range(value, expected):
+    assert _parse_content_range(value) == expected
+
+
+def test_resume_validator():
+    assert _resume_validator(httpx.Headers({"ETag": '"v1"'})) is None
+    ranges = {"Accept-Ranges": "bytes"}
+    assert _resume_validator(httpx.Headers({**ranges, "ETag": '"v1"'})) == '"v1"'
+    modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+    weak = {**ranges, "ETag": 'W/"v1"', "Last-Modified": modified}
+    assert _resume_validator(httpx.Headers(weak)) == modified
+
+
+@pytest.fixture
+def client(range_server, monkeypatch):
+    """A client whose downloads are served by range_server (one attempt each)."""
+    monkeypatch.setattr(client_module, "_download_http_client", range_server.client)
+    with NmrXivClient(retry=RetryPolicy(max_attempts=1)) as client:
+        yield client
+
+
+def leave_partial(dest, data: bytes, validator: str, **state) -> None:
+    """Simulate an interrupted earlier run."""
+    _partial_path(dest).write_bytes(data)
+    state = {"url": URL, "validator": validator, **state}
+    _partial_state_path(dest).write_text(json.dumps(state))
+
+
+def test_fresh_download(client, range_server, tmp_path):
+    dest = tmp_path / "P1.zip"
+    client.download_file(URL, dest, checksum=True)
+    assert dest.read_bytes() == range_server.data
+    digest = hashlib.sha256(range_server.data).hexdigest()
+    assert (tmp_path / "P1.zip.sha256").read_text().split()[0] == digest
+    assert not _partial_path(dest).exists()
+    assert not _partial_state_path(dest).exists()
+
+
+def test_resume_sends_range_and_if_range(client, range_server, tmp_path):
+    dest = tmp_path / "P1.zip"
+    leave_partial(dest, range_server.data[:300_000], '"v1"')
+    client.download_file(URL, dest, checksum=True)
+
+    request = range_server.requests[-1]
+    assert request.headers["range"] == "bytes=300000-"
+    assert request.headers["if-range"] == '"v1"'
+    assert dest.read_bytes() == range_server.data
+    digest = hashlib.sha256(range_server.data).hexdigest()
+    assert (tmp_path / "P1.zip.sha256").read_text().split()[0] == digest
+
+
+def test_changed_file_is_downloaded_again(client, range_server, tmp_path):
+    dest = tmp_path / "P1.zip"
+    leave_partial(dest, b"x" * 300_000, '"v0"')
+    client.download_file(URL, dest)
+    assert range_server.requests[-1].headers["if-range"] == '"v0"'
+    assert dest.read_bytes() == range_server.data
+
+
+def test_resume_from_checkpoint_of_preallocated_file(client, range_server, tmp_path):
+    dest = tmp_path / "P1.zip"
+    # Killed while preallocated: the tail is zeros, only the checkpoint is trusted
+    written = range_server.data[:200_000] + bytes(len(range_server.data) - 200_000)
+    leave_partial(dest, written, '"v1"', preallocated=True, written=200_000)
+    client.download_file(URL, dest)
+    assert range_server.requests[-1].headers["range"] == "bytes=200000-"
+    assert dest.read_bytes() == range_server.data
+
+
+def test_local_write_failure_is_not_retried(range_server, monkeypatch, tmp_path):
+    monkeypatch.setattr(client_module, "_download_http_client", range_server.client)
+    dest = tmp_path / "missing" / "P1.zip"
+    with NmrXivClient(retry=RetryPolicy(max_attempts=3, backoff=0)) as client:
+        with pytest.raises(NmrXivError, match="Cannot write"):
+            client.download_file(URL, dest)
+    assert len(range_server.requests) == 1
+
+
+def test_chunk_writer_buffers_small_chunks(tmp_path):
+    chunks = [b"a" * 1000] * (2 * WRITE_BUFFER // 1000) + [b"b" * DIRECT_WRITE, b"c" * 10]
+    path = tmp_path / "out"
+    hasher = hashlib.sha256()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT)
+    try:
+        writer = _ChunkWriter(fd, 5, hasher)
+        for chunk in chunks:
+            writer.write(chunk)
+        assert writer.accepted == 5 + sum(map(len, chunks))
+        assert writer.close() == writer.accepted
+    finally:
+        os.close(fd)
+    data = b"".join(chunks)
+    assert path.read_bytes() == bytes(5) + data
+    assert hasher.hexdigest() == hashlib.sha256(data).hexdigest()
+
+
+def test_complete_partial_file_is_finished(client, range_server, tmp_path):
+    dest = tmp_path / "P1.zip"
+    leave_partial(dest, range_server.data, '"v1"')
+    client.download_file(URL, dest)
+    assert dest.read_bytes() == range_server.data
+    assert not _partial_path(dest).exists()
+
+
+def test_no_resume_starts_over(client, range_server, tmp_path):
+    dest = tmp_path / "P1.zip"
+    leave_partial(dest, range_server.data[:1000], '"v1"')
+    client.download_file(URL, dest, resume=False)
+    assert "range" not in range_server.requests[-1].headers
+    assert dest.read_bytes() == range_server.data
+
+
+def ranges_requested(server) -> list[str]:
+    return sorted(r.headers["range"] for r in server.requests if "range" in r.headers)
+
+
+def test_segmented_download(client, range_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(client_module, "MIN_SEGMENT_SIZE", 256 * 1024)
+    dest = tmp_path / "P1.zip"
+    client.download_file(URL, dest, segments=4, checksum=True)
+    assert dest.read_bytes() == range_server.data
+    assert ranges_requested(range_server) == [
+        "bytes=0-0",  # Probe
+        "bytes=0-262143",
+        "bytes=262144-524287",
+        "bytes=524288-786431",
+        "bytes=786432-1048575",
+    ]
+    digest = hashlib.sha256(range_server.data).hexdigest()
+    assert (tmp_path / "P1.zip.sha256").read_text().split()[0] == digest
+
+
+def test_segments_are_limited_by_file_size(client, range_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(client_module, "MIN_SEGMENT_SIZE", 400 * 1024)
+    dest = tmp_path / "P1.zip"
+    client.download_file(URL, dest, segments=8)
+    assert dest.read_bytes() == range_server.data
+    assert len(ranges_requested(range_server)) == 1 + 2
+
+
+def test_segmented_falls_back_without_ranges(client, range_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(client_module, "MIN_SEGMENT_SIZE", 256 * 1024)
+    range_server.accept_ranges = False
+    dest = tmp_path / "P1.zip"
+    client.download_file(URL, dest, segments=4)
+    assert dest.read_bytes() == range_server.data
+    # The probe, then one plain stream
+    assert len(range_server.requests) == 2
+
+
+def test_file_changing_mid_download_fails_cleanly(client, range_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(client_module, "MIN_SEGMENT_SIZE", 256 * 1024)
+
+    def changed_after_probe(request):
+        if range_server.requests:
+            range_server.etag = '"v2"'
+        return range_server(request)
+
+    transport = httpx.MockTransport(changed_after_probe)
+    monkeypatch.setattr(
+        client_module, "_download_http_client", lambda: httpx.Client(transport=transport)
+    )
+    dest = tmp_path / "P1.zip"
+    with pytest.raises(NmrXivError, match="changed"):
+        client.download_file(URL, dest, segments=4)
+    assert not _partial_path(dest).exists()
+    assert not dest.exists()
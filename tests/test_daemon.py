@@ -0,0 +1,102 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import ROOT
+from nmrxiv_downloader.daemon import PROTOCOL_VERSION, forwardable
+
+
+def test_forwardable():
+    assert forwardable(["show", "P5"])
+    assert forwardable(["search", "--query", "x", "--format", "ndjson"])
+    assert not forwardable(["--no-cache", "show", "P5"])
+    assert not forwardable(["download", "P5"])
+    assert not forwardable(["show", "-"])
+    assert not forwardable(["show", "--from-file=ids.txt"])
+    assert not forwardable([])
+
+
+@pytest.fixture
+def daemon(mock_api, tmp_path):
+    """A running 'nmrxiv serve'; returns a function sending it one command."""
+    path = tmp_path / "nmrxiv.sock"
+    env = {
+        "NMRXIV_API_URL": mock_api.url,
+        "NMRXIV_CACHE_DIR": str(tmp_path / "cache"),
+        "NMRXIV_SOCKET": str(path),
+    }
+    base = {k: v for k, v in os.environ.items() if not k.startswith(("NMRXIV_", "XDG_"))}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "nmrxiv_downloader", "serve"],
+        env={**base, **env},
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    deadline = time.monotonic() + 30
+    while not path.exists():
+        assert process.poll() is None and time.monotonic() < deadline, process.stderr.read()
+        time.sleep(0.05)
+
+    def ask(*argv: str) -> tuple[int, str, str]:
+        """Send a command as the nmrxiv client would; returns (exit code, stdout, stderr)."""
+        request = {
+            "version": PROTOCOL_VERSION,
+            "argv": [*argv],
+            "env": {k: v for k, v in env.items() if k != "NMRXIV_SOCKET"},
+            "tty": False,
+        }
+        out, err = [], []
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(path))
+            conn = sock.makefile("rwb")
+            conn.write(json.dumps(request).encode() + b"\n")
+            conn.flush()
+            for line in conn:
+                frame = json.loads(line)
+                if "exit" in frame:
+                    return frame["exit"], "".join(out), "".join(err)
+                assert "fallback" not in frame
+                (out if "out" in frame else err).append(frame.get("out", frame.get("err")))
+        raise AssertionError("daemon disconnected")
+
+    yield ask
+    process.terminate()
+    process.wait(timeout=10)
+    assert not path.exists()
+
+
+def test_concurrent_commands_get_their_own_options_and_output(daemon):
+    commands = [
+        ("show", "P1", "--format", "ndjson"),
+        ("show", "P2", "--json"),
+        ("show", "P3", "--no-json"),
+        ("list", "--format", "ndjson"),
+        ("show", "nope"),
+    ] * 3
+    with ThreadPoolExecutor(max_workers=len(commands)) as pool:
+        results = [*pool.map(lambda argv: daemon(*argv), commands)]
+
+    for argv, (code, out, err) in zip(commands, results):
+        if argv[1] == "P1":
+            assert code == 0
+            assert json.loads(out)["item"]["identifier"] == "NMRXIV:P1"
+        elif argv[1] == "P2":
+            assert code == 0
+            assert json.loads(out)["item"]["identifier"] == "NMRXIV:P2"
+        elif argv[1] == "P3":
+            assert code == 0
+            assert "P3" in out and not out.lstrip().startswith("{")
+        elif argv[0] == "list":
+            assert code == 0
+            assert all(json.loads(line)["identifier"] for line in out.splitlines())
+        else:
+            assert code == 404
+            assert json.loads(err)["code"] == 404
+            assert out == ""
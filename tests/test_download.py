@@ -0,0 +1,70 @@
+import json
+import threading
+import time
+
+import pytest
+
+from nmrxiv_downloader import cli
+
+
+def test_batch_downloads_every_item_in_order(nmrxiv, mock_api, tmp_path):
+    result = nmrxiv("download", "P3", "P1", "P2", "-o", str(tmp_path / "out"), "--jobs", "2")
+    assert result.exit_code == 0, result.output
+    summary = json.loads(result.stdout)
+    assert [r["id"] for r in summary["results"]] == ["P3", "P1", "P2"]
+    assert summary["succeeded"] == 3
+    archive = mock_api.archive(mock_api.zip_size)
+    for name in ("P1.zip", "P2.zip", "P3.zip"):
+        assert (tmp_path / "out" / name).read_bytes() == archive
+
+
+def test_failed_item_does_not_stop_the_batch(nmrxiv, tmp_path):
+    result = nmrxiv("download", "P1", "nope", "-o", str(tmp_path / "out"))
+    assert result.exit_code == 1
+    summary = json.loads(result.stdout)
+    assert summary["status"] == "partial"
+    assert [r["status"] for r in summary["results"]] == ["success", "error"]
+
+
+def test_jobs_bounds_concurrent_transfers(nmrxiv, tmp_path, monkeypatch):
+    lock = threading.Lock()
+    running = peak = 0
+
+    def fake_item(client, item_id, options, progress_callback=None, on_start=None):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return {"status": "success", "id": item_id, "size": 0}
+
+    monkeypatch.setattr(cli, "_download_item", fake_item)
+    ids = [f"P{n}" for n in range(1, 9)]
+    result = nmrxiv("download", *ids, "-o", str(tmp_path), "--jobs", "3", "--no-space-check")
+    assert result.exit_code == 0, result.output
+    assert peak == 3
+
+
+def test_interrupt_drops_queued_items(tmp_path, monkeypatch):
+    started = []
+
+    def fake_item(client, item_id, options, progress_callback=None, on_start=None):
+        started.append(item_id)
+        if item_id == "P1":
+            raise KeyboardInterrupt
+        # A long transfer that stops at its next progress report
+        for _ in range(100):
+            time.sleep(0.05)
+            progress_callback(1, 2)
+        return {"status": "success", "id": item_id}
+
+    monkeypatch.setattr(cli, "_download_item", fake_item)
+    options = cli._DownloadOptions(out_path=tmp_path)
+    begin = time.monotonic()
+    with pytest.raises(KeyboardInterrupt):
+        for _ in cli._download_stream(None, [f"P{n}" for n in range(1, 10)], options, jobs=2):
+            pass
+    assert time.monotonic() - begin < 2
+    assert len(started) <= 3
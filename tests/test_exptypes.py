@@ -0,0 +1,76 @@
+from nmrxiv_downloader.exptypes import (
+    TypeIndex,
+    index_types,
+    normalize_type,
+    query_terms,
+    type_terms,
+)
+
+
+def test_normalize_type():
+    assert normalize_type("1D-13C") == "1d 13c"
+    assert normalize_type("2D [1H,13C] HSQC") == "2d 1h 13c hsqc"
+    assert normalize_type("C13 dept_135") == "13c dept 135"
+
+
+def test_type_terms_expand_aliases():
+    assert type_terms("HSQC") == {"hsqc", "2d", "1h", "13c"}
+    assert type_terms("13C") == {"13c", "1d"}
+    assert type_terms("") == frozenset()
+
+
+def test_query_terms_keep_order_without_duplicates():
+    assert query_terms("13C carbon DEPT") == ["13c", "dept"]
+
+
+def index() -> TypeIndex:
+    return TypeIndex.from_items(
+        [
+            ("a", "2D 1H-13C HSQC"),
+            ("b", "HSQC"),
+            ("c", "1D 13C"),
+            ("d", "1H"),
+            ("e", "2D 1H-1H COSY"),
+            ("f", None),
+        ]
+    )
+
+
+def test_lookup_matches_all_terms_and_aliases():
+    types = index()
+    assert types.lookup("hsqc") == {"a", "b"}
+    assert types.lookup("13c") == {"a", "b", "c"}
+    assert types.lookup("1d 13c") == {"c"}
+    assert types.lookup("nothing") == set()
+    assert types.lookup("") == set()
+
+
+def test_lookup_last_term_is_a_prefix():
+    types = index()
+    assert types.lookup("hsq") == {"a", "b"}
+    assert types.lookup("2d co") == {"e"}
+    assert types.lookup("co 2d") == set()
+
+
+def test_match_any_or_all():
+    types = index()
+    assert types.match(["hsqc", "cosy"]) == {"a", "b", "e"}
+    assert types.match(["1h", "2d"], match_all=True) == {"a", "b", "e"}
+    assert types.match(["hsqc", "cosy"], match_all=True) == set()
+    assert types.match([]) == set()
+
+
+def test_vocabulary_is_rebuilt_after_add():
+    types = index()
+    assert "noesy" not in types.vocabulary
+    types.add("g", "NOESY")
+    assert "noesy" in types.vocabulary
+    assert types.lookup("noe") == {"g"}
+
+
+def test_index_types_is_shared_per_snapshot():
+    types = ("HSQC", "1D 13C", None)
+    index = index_types(types)
+    assert index.lookup("13c") == {0, 1}
+    assert index_types(tuple(types)) is index
+    assert index_types(("COSY",)) is not index
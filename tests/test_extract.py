@@ -0,0 +1,77 @@
+import io
+import json
+import zipfile
+
+import pytest
+
+from nmrxiv_downloader.extract import extract_archive, member_matches, safe_member_path
+
+
+@pytest.mark.parametrize(
+    "name, include, exclude, expected",
+    [
+        ("p/s/1/fid", None, None, True),
+        ("p/s/1/fid", ["fid"], None, True),
+        ("p/s/1/acqus", ["fid"], None, False),
+        ("p/s/1/pdata/1/1r", ["*/pdata/1/1r"], None, True),
+        ("p/s/1/fid", None, ["fid"], False),
+        ("p/s/1/fid", ["*"], ["*/1/*"], False),
+    ],
+)
+def test_member_matches(name, include, exclude, expected):
+    assert member_matches(name, include, exclude) is expected
+
+
+def test_safe_member_path(tmp_path):
+    assert safe_member_path(tmp_path, "a/b/fid") == tmp_path / "a" / "b" / "fid"
+    assert safe_member_path(tmp_path, "/abs/fid") == tmp_path / "abs" / "fid"
+    assert safe_member_path(tmp_path, "C:\\data\\fid") == tmp_path / "data" / "fid"
+    assert safe_member_path(tmp_path, "../escape") is None
+    assert safe_member_path(tmp_path, "a/../../escape") is None
+
+
+@pytest.fixture
+def archive(tmp_path):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for n in range(1, 4):
+            zf.writestr(f"project/{n}/", b"")
+            zf.writestr(f"project/{n}/acqus", f"##$NS= {n}\n" * 100)
+            zf.writestr(f"project/{n}/fid", bytes([n]) * 50_000)
+        zf.writestr("../outside", b"nope")
+    path = tmp_path / "P1.zip"
+    path.write_bytes(buffer.getvalue())
+    return path
+
+
+def test_extract_archive(archive, tmp_path):
+    dest = tmp_path / "out"
+    names = extract_archive(archive, dest, workers=3)
+    assert names == [f"project/{n}/{f}" for n in range(1, 4) for f in ("acqus", "fid")]
+    assert (dest / "project" / "2" / "fid").read_bytes() == b"\x02" * 50_000
+    assert not (tmp_path / "outside").exists()
+
+
+def test_extract_archive_filters(archive, tmp_path):
+    dest = tmp_path / "out"
+    names = extract_archive(archive, dest, include=["fid"], exclude=["project/3/*"])
+    assert names == ["project/1/fid", "project/2/fid"]
+    assert not (dest / "project" / "3").exists()
+
+
+def test_download_extracts_selected_members(nmrxiv, tmp_path):
+    out = tmp_path / "out"
+    result = nmrxiv("download", "P1", "-x", "--include", "acqus", "--delete-archive", "-o", str(out))
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.stdout)
+    assert data["archive_deleted"] is True
+    files = sorted(p for p in (out / "P1").rglob("*") if p.is_file())
+    assert files and all(p.name == "acqus" for p in files)
+    assert data["total_files"] == len(files)
+    assert not (out / "P1.zip").exists()
+
+
+def test_filters_require_extract(nmrxiv, tmp_path):
+    result = nmrxiv("download", "P1", "--include", "acqus", "-o", str(tmp_path))
+    assert result.exit_code == 1
+    assert "require --extract" in result.stderr
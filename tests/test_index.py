@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from nmrxiv_downloader.errors import NmrXivError
+from nmrxiv_downloader.index import CatalogIndex, fts_query, parent_project, short_id
+from nmrxiv_downloader.models import Dataset, Project
+
+
+class FakeClient:
+    """The parts of AsyncNmrXivClient that CatalogIndex.refresh uses."""
+
+    def __init__(self, projects: list[dict], datasets: list[dict]):
+        self.projects = projects
+        self.datasets = datasets
+
+    async def iter_all_projects(self):
+        for project in self.projects:
+            yield Project(**project)
+
+    async def list_studies(self):
+        raise NmrXivError("Forbidden", status_code=403)
+
+    async def iter_all_datasets(self):
+        for dataset in self.datasets:
+            yield Dataset(**dataset)
+
+
+DATASETS = [
+    {"id": 1, "name": "Kaempferol HSQC", "type": "2D 1H-13C HSQC", "updated_at": "2024-01-01T00:00:00Z"},
+    {"id": 2, "name": "Kaempferol carbon", "type": "1D 13C", "updated_at": "2024-01-02T00:00:00Z"},
+    {"id": 3, "name": "Quercetin", "description": "flavonol from onions", "type": "HSQC"},
+    {"id": 4, "name": "Quercetin COSY", "type": "2D 1H-1H COSY"},
+]
+PROJECTS = [{"id": 1, "name": "Flavonoids", "identifier": "NMRXIV:P1"}]
+
+
+@pytest.fixture
+def index(tmp_path):
+    with CatalogIndex(tmp_path / "catalog.sqlite3") as index:
+        asyncio.run(index.refresh(FakeClient(PROJECTS, DATASETS)))
+        yield index
+
+
+def ids(response) -> list[int]:
+    return [item["id"] if isinstance(item, dict) else item.id for item in response.items]
+
+
+def test_fts_query():
+    assert fts_query("kaempferol hs") == '"kaempferol" "hs"*'
+    assert fts_query('say "hi"') == '"say" """hi"""*'
+    assert fts_query("  ") == ""
+
+
+def test_ids():
+    assert short_id("NMRXIV:P5") == "P5"
+    assert short_id("D12") == "D12"
+    assert parent_project({"project": {"identifier": "NMRXIV:P11"}}) == "P11"
+    assert parent_project({"project": {"public_url": "https://nmrxiv.org/project/P7/"}}) == "P7"
+    assert parent_project({"project": "P1"}) is None
+
+
+def test_text_search_matches_all_words_with_prefix(index):
+    assert sorted(ids(index.search(text="kaempferol"))) == [1, 2]
+    assert ids(index.search(text="kaempferol carb")) == [2]
+    assert ids(index.search(text="onion")) == [3]
+    assert ids(index.search(text="nothing")) == []
+    assert ids(index.search(kind="project", text="flavo")) == [1]
+
+
+def test_type_search(index):
+    assert ids(index.search(experiment_type="hsqc")) == [1, 3]
+    assert ids(index.search(experiment_type=["hsqc", "cosy"])) == [1, 3, 4]
+    assert ids(index.search(experiment_type=["13c", "2d"], match_all=True)) == [1, 3]
+    assert ids(index.search(text="quercetin", experiment_type="cos")) == [4]
+
+
+def test_search_pages(index):
+    response = index.search(per_page=3, page=2)
+    assert (response.total, response.last_page, ids(response)) == (4, 2, [4])
+
+
+def test_refresh_reports_changes(index):
+    datasets = [dict(DATASETS[0], updated_at="2024-03-01T00:00:00Z"), *DATASETS[1:3]]
+    changes = asyncio.run(index.refresh(FakeClient(PROJECTS, datasets)))
+    summary = {change: counts["dataset"] for change, counts in changes.summary().items()}
+    assert summary == {"added": 0, "updated": 1, "removed": 1, "unchanged": 2}
+    assert index.watermarks()["dataset"] == "2024-03-01T00:00:00Z"
+    assert ids(index.search(text="cosy")) == []
+
+
+class FailingClient(FakeClient):
+    async def iter_all_datasets(self):
+        yield Dataset(**DATASETS[0])
+        raise NmrXivError("Request failed: connection refused")
+
+
+def test_failed_rebuild_keeps_the_index(index):
+    before = index.info()
+    with pytest.raises(NmrXivError):
+        asyncio.run(index.refresh(FailingClient(PROJECTS, DATASETS), rebuild=True))
+    assert index.info() == before
+    assert sorted(ids(index.search(text="quercetin"))) == [3, 4]
+
+
+def test_rebuild_replaces_the_contents(index):
+    changes = asyncio.run(index.refresh(FakeClient(PROJECTS, DATASETS[:1]), rebuild=True))
+    assert changes.summary()["added"]["dataset"] == 1
+    assert ids(index.search()) == [1]
+
+
+def test_sync_cursor_is_separate_from_refreshes(index):
+    first = index.sync_changes()
+    assert first.summary()["added"]["dataset"] == 4
+    assert index.sync_watermarks()["dataset"] == "2024-01-02T00:00:00Z"
+
+    # An index update between two syncs must not hide its changes from the second
+    datasets = [dict(DATASETS[0], updated_at="2024-03-01T00:00:00Z"), *DATASETS[1:3]]
+    asyncio.run(index.refresh(FakeClient(PROJECTS, datasets)))
+    asyncio.run(index.refresh(FakeClient(PROJECTS, datasets)))
+    changes = index.sync_changes()
+    summary = {change: counts["dataset"] for change, counts in changes.summary().items()}
+    assert summary == {"added": 0, "updated": 1, "removed": 1, "unchanged": 2}
+    assert [entry["id"] for entry in changes.removed["dataset"]] == [4]
+    assert index.sync_watermarks()["dataset"] == "2024-03-01T00:00:00Z"
+    assert not any(index.sync_changes().records())
+
+
+def test_search_records_match_models(index):
+    raw = index.search(text="kaempferol hsqc", raw=True).items[0]
+    model = index.search(text="kaempferol hsqc").items[0]
+    assert raw == model.model_dump(mode="json")
+    assert raw["updated_at"] == "2024-01-01T00:00:00Z"
@@ -0,0 +1,75 @@
+import json
+
+from nmrxiv_downloader.mirror import MirrorProgress, MirrorQueue
+
+
+def project(n: int, updated_at: str = "2024-01-01T00:00:00Z") -> dict:
+    return {"identifier": f"NMRXIV:P{n}", "name": f"Project {n}", "updated_at": updated_at}
+
+
+def test_queue_state_transitions(tmp_path):
+    with MirrorQueue(tmp_path) as queue:
+        assert queue.add([project(1), project(2), project(3), {"name": "no id"}]) == {
+            "added": 3,
+            "updated": 0,
+            "unchanged": 0,
+        }
+        assert queue.todo() == ["P1", "P2", "P3"]
+
+        queue.record({"status": "success", "id": "P1", "file": "P1.zip", "size": 10})
+        queue.record({"status": "error", "id": "P2", "message": "boom"})
+        assert queue.todo() == ["P2", "P3"]
+        assert queue.todo(retry_failed=False) == ["P3"]
+        assert queue.counts() == {"pending": 1, "done": 1, "failed": 1, "total": 3, "bytes": 10}
+
+        # Only a changed updated_at queues a mirrored project again
+        changed = [project(1, "2024-02-01T00:00:00Z"), project(2), project(3)]
+        assert queue.add(changed) == {"added": 0, "updated": 1, "unchanged": 2}
+        assert queue.todo() == ["P1", "P2", "P3"]
+        assert queue.counts()["bytes"] == 0
+
+
+def test_queue_survives_reopening(tmp_path):
+    with MirrorQueue(tmp_path) as queue:
+        queue.add([project(1), project(2)])
+        queue.record({"status": "success", "id": "P1", "size": 5})
+    with MirrorQueue(tmp_path) as queue:
+        assert queue.todo() == ["P2"]
+        assert queue.counts()["done"] == 1
+
+
+def test_progress_eta():
+    progress = MirrorProgress(total=4, started=0.0)
+    assert progress.to_dict()["eta_s"] is None
+    progress.add({"status": "success", "size": 1000})
+    progress.add({"status": "error"})
+    report = progress.to_dict()
+    assert (report["done"], report["failed"], report["remaining"]) == (1, 1, 2)
+    assert report["bytes"] == 1000
+    # Two items took the whole elapsed time, so two more take as long again
+    assert abs(report["eta_s"] - report["elapsed_s"]) <= 0.1
+
+
+def records(result) -> list[dict]:
+    return [json.loads(line) for line in result.stdout.splitlines()]
+
+
+def test_mirror_command_resumes_its_queue(nmrxiv, mock_api, tmp_path):
+    dest = tmp_path / "mirror"
+    first = records(nmrxiv("mirror", str(dest), "--limit", "2"))
+    assert first[0] == {"event": "walk", "added": 5, "updated": 0, "unchanged": 0}
+    assert sorted(r["id"] for r in first if r["event"] == "item") == ["P1", "P2"]
+    assert first[-1]["queue"]["pending"] == 3
+
+    result = nmrxiv("mirror", str(dest), "--no-refresh")
+    assert result.exit_code == 0, result.output
+    items = records(result)[:-1]
+    assert sorted(r["id"] for r in items) == ["P3", "P4", "P5"]
+    assert all(r["verified"] for r in items)
+    archive = mock_api.archive(mock_api.zip_size)
+    assert all((dest / f"P{n}.zip").read_bytes() == archive for n in range(1, 6))
+    assert nmrxiv("verify", str(dest)).exit_code == 0
+
+    again = records(nmrxiv("mirror", str(dest)))
+    assert again[0] == {"event": "walk", "added": 0, "updated": 0, "unchanged": 5}
+    assert again[-1]["queue"]["pending"] == 0
@@ -0,0 +1,21 @@
+import json
+
+import pytest
+
+from conftest import ROOT
+from nmrxiv_downloader.client import _paginated
+from nmrxiv_downloader.models import Dataset, Project
+
+
+@pytest.mark.parametrize("name, model", [("projects", Project), ("datasets", Dataset)])
+def test_records_match_models(name, model):
+    body = json.loads((ROOT / "benchmarks" / "fixtures" / f"{name}.json").read_text())
+    records = _paginated(body, model, 1, raw=True)
+    models = _paginated(body, model, 1)
+    assert (records.total, records.last_page) == (models.total, models.last_page)
+    for record, item, source in zip(records.items, models.items, body["data"]):
+        assert [*record] == [*model.model_fields]
+        assert record["id"] == item.id
+        assert record["name"] == item.name
+        # Records keep the API's values as sent instead of re-serializing them
+        assert record["updated_at"] == source.get("updated_at")
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from conftest import MockNmrXiv
+from nmrxiv_downloader.client import AsyncNmrXivClient
+from nmrxiv_downloader.models import Project
+from nmrxiv_downloader.output import output_ndjson, output_ndjson_items
+
+
+def test_ndjson_writes_one_compact_line_per_record(capsys):
+    output_ndjson_items([{"id": 1, "name": "a b"}, Project(id=2, name="P")])
+    output_ndjson_items([])
+    output_ndjson({"event": "summary"})
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == '{"id":1,"name":"a b"}'
+    assert json.loads(lines[1])["name"] == "P"
+    assert lines[2] == '{"event":"summary"}'
+    assert len(lines) == 3
+
+
+def test_list_ndjson(nmrxiv, mock_api):
+    result = nmrxiv("list", "--type", "dataset", "--format", "ndjson")
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert len(records) == mock_api.per_page
+    assert all(r["identifier"].startswith("NMRXIV:D") for r in records)
+
+
+@pytest.fixture
+def paged_api(nmrxiv, monkeypatch):
+    with MockNmrXiv(pages=3, per_page=4) as mock:
+        monkeypatch.setattr(AsyncNmrXivClient, "BASE_URL", mock.url)
+        yield mock
+
+
+def test_list_all_streams_every_page(nmrxiv, paged_api):
+    result = nmrxiv("list", "--all", "--format", "ndjson")
+    assert result.exit_code == 0, result.output
+    ids = [json.loads(line)["identifier"] for line in result.stdout.splitlines()]
+    assert len(ids) == len(set(ids)) == 12
+
+    result = nmrxiv("list", "--all")
+    assert json.loads(result.stdout)["count"] == 12
+
+
+def test_unknown_format(nmrxiv):
+    result = nmrxiv("list", "--format", "xml")
+    assert result.exit_code == 1
+    assert "Unknown format" in result.stderr
@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+
+from nmrxiv_downloader.client import _partial_path, _partial_state_path, resumable_bytes
+from nmrxiv_downloader.plan import DownloadPlan, PlannedDownload
+
+URL = "http://files.test/P1.zip"
+
+
+def leave_partial(dest: Path, size: int, url: str, validator: str) -> None:
+    _partial_path(dest).write_bytes(b"x" * size)
+    _partial_state_path(dest).write_text(json.dumps({"url": url, "validator": validator}))
+
+
+def test_resumable_bytes(tmp_path):
+    dest = tmp_path / "P1.zip"
+    assert resumable_bytes(dest, URL, ('"v1"', None)) == 0
+    leave_partial(dest, 1000, URL, '"v1"')
+    assert resumable_bytes(dest, URL, ('"v1"', None)) == 1000
+    assert resumable_bytes(dest, URL, ('"v2"', None)) == 0
+    assert resumable_bytes(dest, "http://files.test/P2.zip", ('"v1"', None)) == 0
+
+
+def test_unknown_sizes_make_the_estimate_a_lower_bound(tmp_path):
+    entries = [
+        PlannedDownload("P1", url=URL, file=tmp_path / "P1.zip", size=100),
+        PlannedDownload("P2", url=URL, file=tmp_path / "P2.zip", size=50, resumable=20),
+        PlannedDownload("D3", url=URL, file=tmp_path / "D3", slice_of="P1"),
+    ]
+    plan = DownloadPlan(entries, tmp_path, free=150, extract=True)
+    assert (plan.download_bytes, plan.required_bytes) == (130, 280)
+    assert plan.unknown == ["D3"]
+    assert not plan.fits
+
+    plan = DownloadPlan(entries[:2], tmp_path, free=300)
+    assert plan.fits and not plan.lower_bound
+    assert "lower_bound" not in plan.to_dict()
+    plan = DownloadPlan(entries, tmp_path, free=300)
+    record = plan.to_dict()
+    assert (record["status"], record["lower_bound"], record["unknown_size"]) == ("ok", True, ["D3"])
+
+
+def test_plan_command(nmrxiv, mock_api, tmp_path):
+    size = len(mock_api.archive(mock_api.zip_size))
+    etag = f'"zip-{mock_api.zip_size}"'
+    leave_partial(tmp_path / "P2.zip", 1000, f"{mock_api.files_url}/P2.zip", etag)
+    result = nmrxiv("plan", "P1", "P2", "D3", "nope", "--priority", "D3", "-o", str(tmp_path))
+    assert result.exit_code == 0, result.output
+    plan = json.loads(result.stdout)
+    assert [entry["id"] for entry in plan["queue"]] == ["D3", "P1", "P2", "nope"]
+    assert plan["total_bytes"] == 2 * size
+    assert plan["download_bytes"] == 2 * size - 1000
+    assert plan["queue"][0]["slice_of"] == "P1"
+    assert plan["queue"][2]["resumable"] == 1000
+    assert plan["unknown_size"] == ["D3"]
+    assert plan["lower_bound"] is True
+    assert plan["errors"] == ["nope"]
+
+    table = nmrxiv("plan", "P1", "D3", "--no-json", "-o", str(tmp_path)).stdout
+    assert "at least" in table
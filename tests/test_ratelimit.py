@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from nmrxiv_downloader import cli
+from nmrxiv_downloader import client as client_module
+from nmrxiv_downloader.client import NmrXivClient
+from nmrxiv_downloader.ratelimit import ConcurrencyGovernor, RateLimiter, parse_size
+from nmrxiv_downloader.retry import RetryPolicy
+
+
+class CountingLimiter(RateLimiter):
+    """A limiter recording the most slots held at once."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._count_lock = threading.Lock()
+        self.active = self.peak = self.taken = 0
+
+    @contextmanager
+    def slot(self):
+        with super().slot():
+            with self._count_lock:
+                self.active += 1
+                self.taken += 1
+                self.peak = max(self.peak, self.active)
+            try:
+                time.sleep(0.02)
+                yield
+            finally:
+                with self._count_lock:
+                    self.active -= 1
+
+
+@pytest.mark.parametrize("value, expected", [("500", 500), ("10k", 10240), ("1.5M", 1572864)])
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
+
+
+def test_governor_slots_across_processes(tmp_path):
+    first = ConcurrencyGovernor(1, lock_dir=tmp_path)
+    second = ConcurrencyGovernor(1, lock_dir=tmp_path)
+    token = first.try_acquire()
+    assert token is not None
+    # The slot file is locked, so another governor on the same directory waits
+    assert second.try_acquire() is None
+    first.release(token)
+    second.release(second.try_acquire())
+
+
+def test_async_slot_bounds_concurrent_requests():
+    limiter = RateLimiter(max_connections=2)
+    active = peak = 0
+
+    async def request():
+        nonlocal active, peak
+        async with limiter.async_slot():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    async def main():
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+
+
+@pytest.mark.parametrize("max_connections", [1, 2])
+def test_each_segment_holds_a_slot(range_server, tmp_path, monkeypatch, max_connections):
+    monkeypatch.setattr(client_module, "MIN_SEGMENT_SIZE", 256 * 1024)
+    monkeypatch.setattr(client_module, "_download_http_client", range_server.client)
+    limiter = CountingLimiter(max_connections=max_connections)
+    dest = tmp_path / "P1.zip"
+    with NmrXivClient(retry=RetryPolicy(max_attempts=1), rate_limiter=limiter) as client:
+        client.download_file("http://files.test/P1.zip", dest, segments=4)
+    assert dest.read_bytes() == range_server.data
+    assert limiter.taken == 1 + 4  # The probe, then every segment
+    assert limiter.peak == max_connections
+
+
+def test_async_client_gets_every_limit(tmp_path, monkeypatch):
+    monkeypatch.setenv("NMRXIV_CACHE_DIR", str(tmp_path))
+    monkeypatch.setitem(cli._settings, "bandwidth", 1024)
+    monkeypatch.setitem(cli._settings, "max_connections", 2)
+    client = cli._make_async_client(concurrency=8)
+    assert client._concurrency == 2
+    assert client._limiter._bytes.rate == 1024
+    assert client._limiter._governor.slots == 2
@@ -0,0 +1,137 @@
+import io
+import json
+import zipfile
+
+import pytest
+
+from conftest import RangeServer
+from nmrxiv_downloader.client import NmrXivClient
+from nmrxiv_downloader.errors import NmrXivError
+from nmrxiv_downloader.remotezip import RemoteZip, _name_key
+
+URL = "http://files.test/P1.zip"
+
+MEMBERS = {
+    "Flavonoids/Sample_1/10/acqus": b"##TITLE= acqus\n" * 100,
+    "Flavonoids/Sample_1/10/fid": bytes(range(256)) * 4096,
+    "Flavonoids/Sample_1/10/pdata/1/procs": b"##TITLE= procs\n" * 100,
+    "Flavonoids/sample-2/HSQC/fid": bytes(range(256)) * 4096,
+    "Other/10/fid": b"fid",
+    "Spare/10/fid": b"fid",
+}
+
+
+def build_zip(comment: bytes = b"") -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in MEMBERS.items():
+            # Stored, so the large members really are large on the server
+            archive.writestr(name, data, compress_type=zipfile.ZIP_STORED)
+        archive.comment = comment
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def server() -> RangeServer:
+    return RangeServer(build_zip(comment=b"x" * 1000))
+
+
+@pytest.fixture
+def remote(server):
+    with NmrXivClient(http_client=server.client()) as client, RemoteZip(client, URL) as remote:
+        yield remote
+
+
+def test_name_key():
+    assert _name_key("Sample_1-HSQC") == "sample 1 hsqc"
+    assert _name_key("  A  b ") == "a b"
+
+
+def test_central_directory_is_read_from_the_tail(remote, server):
+    assert remote.size == len(server.data)
+    assert sorted(m.info.filename for m in remote.members) == sorted(MEMBERS)
+    # Tail and central directory only: the two 1 MiB fids are not fetched
+    assert remote.transferred < 100_000
+    for member in remote.members:
+        assert member.start < member.end
+        assert member.end - member.start >= member.info.compress_size
+
+
+def test_select_and_directories(remote):
+    names = [m.info.filename for m in remote.select(prefix="Flavonoids/Sample_1/10/")]
+    assert len(names) == 3
+    fids = remote.select(include=["*/fid"], exclude=["Other/*", "Spare/*"])
+    assert sorted(m.info.filename for m in fids) == [
+        "Flavonoids/Sample_1/10/fid",
+        "Flavonoids/sample-2/HSQC/fid",
+    ]
+    assert "Flavonoids/Sample_1/10/pdata/1/" in remote.directories()
+
+
+def test_locate(remote):
+    assert remote.locate(["hsqc"]) == "Flavonoids/sample-2/HSQC/"
+    # Below a named parent beats shallower directories elsewhere
+    assert remote.locate(["10"], parents=["sample 1"]) == "Flavonoids/Sample_1/10/"
+    assert remote.locate(["sample 1"]) == "Flavonoids/Sample_1/"
+    with pytest.raises(NmrXivError, match="Several directories"):
+        remote.locate(["10"])
+    with pytest.raises(NmrXivError, match="No directory"):
+        remote.locate(["cosy"])
+
+
+def test_extract_fetches_only_selected_members(remote, tmp_path):
+    before = remote.transferred
+    members = remote.select(prefix="Flavonoids/Sample_1/10/", exclude=["*/fid"])
+    extracted = remote.extract(members, tmp_path)
+    assert sorted(extracted) == sorted(m.info.filename for m in members)
+    for name in extracted:
+        assert (tmp_path / name).read_bytes() == MEMBERS[name]
+    assert remote.transferred - before < 100_000
+
+
+def test_server_without_ranges_is_refused(server):
+    server.accept_ranges = False
+    with NmrXivClient(http_client=server.client()) as client:
+        with pytest.raises(NmrXivError, match="byte ranges"):
+            RemoteZip(client, URL)
+
+
+def test_not_a_zip_is_refused():
+    server = RangeServer(b"not a zip" * 100)
+    with NmrXivClient(http_client=server.client()) as client:
+        with pytest.raises(NmrXivError, match="Not a valid ZIP"):
+            RemoteZip(client, URL)
+
+
+def test_ls_and_get(nmrxiv, mock_api, tmp_path):
+    result = nmrxiv("ls", "P1", "--include", "acqus", "--format", "ndjson")
+    assert result.exit_code == 0, result.output
+    names = [json.loads(line)["name"] for line in result.stdout.splitlines()]
+    assert names and all(name.endswith("/acqus") for name in names)
+
+    result = nmrxiv("get", "P1", "--include", "acqus", "-o", str(tmp_path))
+    assert result.exit_code == 0, result.output
+    with zipfile.ZipFile(io.BytesIO(mock_api.archive(mock_api.zip_size))) as archive:
+        for name in names:
+            assert (tmp_path / "P1" / name).read_bytes() == archive.read(name)
+
+
+def test_dataset_download_filters_without_extract(nmrxiv, tmp_path):
+    result = nmrxiv("download", "D1", "--include", "acqus", "-o", str(tmp_path))
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.stdout)
+    assert data["total_files"] == 1 and data["files"][0].endswith("/acqus")
+    assert data["manifest"] == str((tmp_path / "D1.sha256").absolute())
+
+    result = nmrxiv("verify", str(tmp_path))
+    assert result.exit_code == 0, result.output
+    assert [r["status"] for r in json.loads(result.stdout)["results"]] == ["ok"]
+    (tmp_path / "D1" / data["files"][0]).write_bytes(b"changed")
+    assert nmrxiv("verify", str(tmp_path)).exit_code == 1
+
+
+def test_dataset_download_rejects_the_store(nmrxiv, tmp_path):
+    result = nmrxiv("download", "D2", "--store", "-o", str(tmp_path))
+    assert result.exit_code == 1
+    assert "--no-store" in result.stderr
+    assert not (tmp_path / "D2").exists()
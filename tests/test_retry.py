@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from nmrxiv_downloader.client import NmrXivClient
+from nmrxiv_downloader.errors import NmrXivError
+from nmrxiv_downloader.retry import RetryPolicy, parse_retry_after
+
+
+@pytest.mark.parametrize("value", [None, "", "soon", "-5", "1.5"])
+def test_parse_retry_after_rejects_garbage(value):
+    assert parse_retry_after(value) is None
+
+
+def test_parse_retry_after_seconds():
+    assert parse_retry_after(" 120 ") == 120.0
+
+
+def test_parse_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=60)
+    delay = parse_retry_after(format_datetime(when, usegmt=True))
+    assert 55 <= delay <= 61
+
+
+def test_parse_retry_after_date_in_the_past():
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_should_retry():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.should_retry(1, None)
+    assert policy.should_retry(2, 503)
+    assert not policy.should_retry(1, 404)
+    assert not policy.should_retry(3, 503)
+
+
+def test_allows_only_safe_requests():
+    policy = RetryPolicy()
+    assert policy.allows("get", "/P5")
+    assert policy.allows("POST", "/search?page=2")
+    assert not policy.allows("POST", "/upload")
+
+
+def test_delay_honours_retry_after_up_to_the_cap():
+    policy = RetryPolicy(backoff=1.0, max_backoff=4.0, max_retry_after=10.0)
+    assert policy.delay(1, retry_after=3.0) == 3.0
+    assert policy.delay(1, retry_after=600.0) == 10.0
+    assert all(0 <= policy.delay(5) <= 4.0 for _ in range(50))
+
+
+def flaky_api(*statuses: int):
+    """An API answering with the given statuses, then 200."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) <= len(statuses):
+            return httpx.Response(statuses[len(requests) - 1], headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"data": {"name": "ok"}})
+
+    http = httpx.Client(base_url="http://api.test", transport=httpx.MockTransport(handler))
+    return http, requests
+
+
+def test_client_retries_transient_errors():
+    http, requests = flaky_api(503, 429)
+    with NmrXivClient(retry=RetryPolicy(max_attempts=3), http_client=http) as client:
+        assert client.get_item("P5") == {"name": "ok"}
+        assert client.retries == 2
+    assert len(requests) == 3
+
+
+def test_client_gives_up_after_max_attempts():
+    http, requests = flaky_api(503, 503, 503)
+    with NmrXivClient(retry=RetryPolicy(max_attempts=2), http_client=http) as client:
+        with pytest.raises(NmrXivError) as info:
+            client.get_item("P5")
+    assert info.value.status_code == 503
+    assert len(requests) == 2
+
+
+def test_client_does_not_retry_client_errors():
+    http, requests = flaky_api(404)
+    with NmrXivClient(retry=RetryPolicy(max_attempts=3), http_client=http) as client:
+        with pytest.raises(NmrXivError):
+            client.get_item("P5")
+    assert len(requests) == 1
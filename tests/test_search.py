@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from conftest import MockNmrXiv
+from nmrxiv_downloader import exptypes
+from nmrxiv_downloader.client import AsyncNmrXivClient
+
+
+@pytest.fixture
+def search_api(nmrxiv, monkeypatch):
+    with MockNmrXiv(pages=3) as mock:
+        monkeypatch.setattr(AsyncNmrXivClient, "BASE_URL", mock.url)
+        yield mock
+
+
+def unique_hits(mock) -> int:
+    """Distinct molecules on all of the mock's search pages (some repeat across pages)."""
+    pages = [json.loads(mock.search(page))["data"] for page in range(1, mock.pages + 1)]
+    hits = {hit["inchi_key"] for page in pages for hit in page}
+    assert len(hits) < sum(len(page) for page in pages)
+    return len(hits)
+
+
+def keys(result) -> list[str]:
+    return [json.loads(line)["inchi_key"] for line in result.stdout.splitlines()]
+
+
+def test_search_all_deduplicates_across_pages(nmrxiv, search_api):
+    result = nmrxiv("search", "--query", "kaempferol", "--all", "--format", "ndjson")
+    assert result.exit_code == 0, result.output
+    hits = keys(result)
+    assert len(hits) == len(set(hits)) == unique_hits(search_api)
+
+    result = nmrxiv("search", "--smiles", "c1ccccc1", "--all")
+    data = json.loads(result.stdout)
+    assert data["count"] == data["total"] == unique_hits(search_api)
+
+
+def test_max_results_stops_early(nmrxiv, search_api):
+    result = nmrxiv("search", "--query", "kaempferol", "--max-results", "30", "--format", "ndjson")
+    assert result.exit_code == 0, result.output
+    hits = keys(result)
+    assert len(hits) == len(set(hits)) == 30
+
+
+def test_all_needs_a_molecule_search_or_a_type(nmrxiv):
+    result = nmrxiv("search", "--text", "kaempferol", "--all")
+    assert result.exit_code == 1
+    assert "--all applies to" in result.stderr
+
+
+def test_online_type_filter_reuses_the_page_index(nmrxiv):
+    exptypes.index_types.cache_clear()
+    for _ in range(2):
+        result = nmrxiv("search", "--type", "1d", "--online", "--format", "ndjson")
+        assert result.exit_code == 0, result.output
+    assert exptypes.index_types.cache_info().hits == 1
@@ -0,0 +1,37 @@
+import json
+
+
+def test_show_several_items_in_input_order(nmrxiv, mock_api):
+    requests = mock_api.requests
+    result = nmrxiv("show", "P3", "P1", "P3", "D2")
+    assert result.exit_code == 0, result.output
+    summary = json.loads(result.stdout)
+    assert [r["id"] for r in summary["results"]] == ["P3", "P1", "D2"]
+    assert summary["results"][0]["item"]["identifier"] == "NMRXIV:P3"
+    # Repeated identifiers are fetched once
+    assert mock_api.requests - requests == 3
+
+
+def test_failed_item_is_reported_with_the_rest(nmrxiv):
+    result = nmrxiv("show", "P1", "nope", "--format", "ndjson")
+    assert result.exit_code == 1
+    records = {r["id"]: r for r in map(json.loads, result.stdout.splitlines())}
+    assert records["P1"]["item"]["identifier"] == "NMRXIV:P1"
+    assert records["nope"]["error"] is True
+    assert records["nope"]["code"] == 404
+
+
+def test_ids_from_a_file(nmrxiv, tmp_path):
+    ids = tmp_path / "ids.txt"
+    ids.write_text("P1 P2  # two projects\n\n# done\nP1\n")
+    result = nmrxiv("show", "--from-file", str(ids), "P4")
+    assert result.exit_code == 0, result.output
+    assert [r["id"] for r in json.loads(result.stdout)["results"]] == ["P4", "P1", "P2"]
+
+
+def test_no_ids(nmrxiv, tmp_path):
+    empty = tmp_path / "ids.txt"
+    empty.write_text("# nothing yet\n")
+    result = nmrxiv("show", "--from-file", str(empty))
+    assert result.exit_code == 1
+    assert "at least one item identifier" in result.stderr
@@ -0,0 +1,59 @@
+"""Cold start: commands must not import modules they do not need.
+
+Checks the modules reported by `python -X importtime`, which does not
+depend on the speed of the machine; benchmarks/startup.py enforces the
+timing budgets.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+# Only commands that talk to the API, open a database or run concurrently need these
+HEAVY = {"httpx", "pydantic", "sqlite3", "asyncio", "rich.progress"}
+
+
+def imported_modules(args: list[str], env: dict[str, str] | None = None) -> set[str]:
+    """Names of the modules imported by `python -m nmrxiv_downloader <args>`."""
+    base = {k: v for k, v in os.environ.items() if not k.startswith("NMRXIV_")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "nmrxiv_downloader", *args],
+        env={**base, "NMRXIV_NO_DAEMON": "1", **(env or {})},
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.add(line.rsplit("|", 1)[1].strip())
+    return modules
+
+
+@pytest.mark.parametrize("args", [["--help"], ["--version"], ["download", "--help"]])
+def test_help_and_version_stay_light(args):
+    modules = imported_modules(args)
+    assert "nmrxiv_downloader.cli" in modules
+    assert not modules & HEAVY
+
+
+def test_version_does_not_render_tables():
+    # --help renders with rich.table (typer's formatter); --version prints one line
+    assert "rich.table" not in imported_modules(["--version"])
+
+
+def test_show_json_imports_only_the_http_stack(mock_api, tmp_path):
+    env = {
+        "NMRXIV_API_URL": mock_api.url,
+        "NMRXIV_CACHE": "false",
+        "NMRXIV_CACHE_DIR": str(tmp_path),
+    }
+    modules = imported_modules(["show", "P5", "--json"], env)
+    assert "httpx" in modules
+    assert not modules & {"pydantic", "sqlite3", "rich.table", "rich.progress", "asyncio"}
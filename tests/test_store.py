@@ -0,0 +1,103 @@
+import hashlib
+import json
+
+import pytest
+
+from nmrxiv_downloader.store import (
+    ContentStore,
+    hash_file,
+    manifest_path,
+    read_manifest,
+    verify_manifest,
+    write_manifest,
+)
+
+URL = "http://files.test/P1.zip"
+
+
+def test_manifests(tmp_path):
+    archive = tmp_path / "P1.zip"
+    archive.write_bytes(b"data")
+    digest = hash_file(archive)
+    assert digest == hashlib.sha256(b"data").hexdigest()
+    manifest = write_manifest(archive, digest)
+    assert manifest == manifest_path(archive) == tmp_path / "P1.zip.sha256"
+    assert read_manifest(manifest) == [(digest, archive)]
+    assert [r["status"] for r in verify_manifest(manifest)] == ["ok"]
+
+    archive.write_bytes(b"changed")
+    assert [r["status"] for r in verify_manifest(manifest)] == ["mismatch"]
+    archive.unlink()
+    assert [r["status"] for r in verify_manifest(manifest)] == ["missing"]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ContentStore(tmp_path / "store")
+    yield store
+    store.close()
+
+
+def test_store_deduplicates_and_links(store, tmp_path):
+    first = tmp_path / "a" / "P1.zip"
+    first.parent.mkdir()
+    first.write_bytes(b"archive")
+    digest = hash_file(first)
+    obj = store.add(first, digest, URL, etag='"v1"')
+    assert obj == store.object_path(digest)
+    assert first.read_bytes() == obj.read_bytes() == b"archive"
+
+    second = tmp_path / "b" / "P1.zip"
+    second.parent.mkdir()
+    assert store.link(digest, second) in ("reflink", "hardlink", "copy")
+    assert second.read_bytes() == b"archive"
+    assert [*(store.root / "sha256").rglob("*")] == [obj.parent, obj]
+
+
+def test_store_lookup_needs_an_unchanged_remote(store, tmp_path):
+    path = tmp_path / "P1.zip"
+    path.write_bytes(b"archive")
+    digest = hash_file(path)
+    store.add(path, digest, URL, etag='"v1"')
+    assert store.lookup(URL, '"v1"', None) == digest
+    assert store.lookup(URL, '"v2"', None) is None
+    assert store.lookup("http://files.test/P2.zip", '"v1"', None) is None
+
+    # Without ETags the size has to match
+    store.add(tmp_path / "P1.zip", digest, URL)
+    assert store.lookup(URL, None, 7) == digest
+    assert store.lookup(URL, None, 8) is None
+
+
+def test_download_reuses_the_stored_copy(nmrxiv, mock_api, tmp_path):
+    first = json.loads(nmrxiv("download", "P1", "--store", "-o", str(tmp_path / "a")).stdout)
+    assert first["store"] == "added"
+    requests = mock_api.requests
+    second = json.loads(nmrxiv("download", "P1", "--store", "-o", str(tmp_path / "b")).stdout)
+    assert second["store"] == "hit"
+    assert second["sha256"] == first["sha256"]
+    # Only the API lookup and the HEAD request, no second transfer
+    assert mock_api.requests - requests <= 2
+    archive = mock_api.archive(mock_api.zip_size)
+    assert (tmp_path / "b" / "P1.zip").read_bytes() == archive
+
+    result = nmrxiv("verify", str(tmp_path / "a"), str(tmp_path / "b"))
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout)["ok"] == 2
+
+
+def test_verify_reports_damaged_archives(nmrxiv, tmp_path):
+    out = tmp_path / "out"
+    assert nmrxiv("download", "P1", "-o", str(out)).exit_code == 0
+    with open(out / "P1.zip", "r+b") as f:
+        f.write(b"PK\x00\x00")
+    result = nmrxiv("verify", str(out / "P1.zip"))
+    assert result.exit_code == 1
+    assert json.loads(result.stdout)["results"][0]["status"] == "mismatch"
+
+
+def test_deleted_archive_takes_its_manifest(nmrxiv, tmp_path):
+    out = tmp_path / "out"
+    assert nmrxiv("download", "P1", "-x", "--delete-archive", "-o", str(out)).exit_code == 0
+    assert not (out / "P1.zip").exists()
+    assert not (out / "P1.zip.sha256").exists()
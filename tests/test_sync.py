@@ -0,0 +1,31 @@
+import json
+
+
+def lines(result) -> list[dict]:
+    return [json.loads(line) for line in result.stdout.splitlines()]
+
+
+def test_sync_reports_changes_since_the_last_sync(nmrxiv, mock_api):
+    first = lines(nmrxiv("sync"))
+    changes, summary = first[:-1], first[-1]
+    assert {(c["change"], c["kind"]) for c in changes} == {("added", "project"), ("added", "dataset")}
+    assert summary["event"] == "summary"
+    assert summary["since"]["project"] is None
+    assert summary["added"]["project"] == len([c for c in changes if c["kind"] == "project"])
+
+    assert nmrxiv("index", "update").exit_code == 0
+    second = lines(nmrxiv("sync"))
+    assert len(second) == 1
+    assert second[0]["since"] == summary["watermarks"]
+    assert second[0]["unchanged"] == summary["added"]
+
+
+def test_sync_downloads_changed_projects(nmrxiv, mock_api, tmp_path):
+    result = nmrxiv("sync", "--download", str(tmp_path / "mirror"))
+    assert result.exit_code == 0, result.output
+    records = lines(result)
+    downloads = [r for r in records if r["event"] == "download"]
+    assert downloads and all(r["status"] == "success" for r in downloads)
+    assert records[-1]["downloads"] == {"succeeded": len(downloads), "failed": 0}
+    archive = mock_api.archive(mock_api.zip_size)
+    assert (tmp_path / "mirror" / "P1.zip").read_bytes() == archive
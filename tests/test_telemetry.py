@@ -0,0 +1,52 @@
+import json
+import time
+
+import pytest
+
+from nmrxiv_downloader import telemetry
+
+
+@pytest.fixture(autouse=True)
+def restore(monkeypatch):
+    """Leave telemetry off for other tests, whatever a test enables."""
+    monkeypatch.setattr(telemetry, "_active", None)
+
+
+def test_disabled_hooks_do_nothing():
+    with telemetry.span("api.request"):
+        telemetry.count("http.requests")
+        telemetry.add_time("disk.write", 1.0)
+    assert telemetry.active() is None
+
+
+def test_summary_and_exports():
+    recorder = telemetry.enable(timeline=True)
+    with telemetry.span("api.request", path="/P1"):
+        time.sleep(0.01)
+    telemetry.count("http.requests")
+    telemetry.count("download.bytes", 100)
+    telemetry.add_time("disk.write", 0.5, calls=4)
+
+    summary = recorder.summary()
+    assert summary["phases"]["disk.write"] == {"calls": 4, "seconds": 0.5}
+    assert summary["phases"]["api.request"]["seconds"] >= 0.01
+    assert summary["counters"] == {"download.bytes": 100, "http.requests": 1}
+
+    trace = recorder.chrome_trace()
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert [(e["name"], e["args"]) for e in spans] == [("api.request", {"path": "/P1"})]
+    assert spans[0]["dur"] >= 10_000
+
+    metrics = recorder.prometheus()
+    assert 'nmrxiv_phase_calls_total{phase="disk.write"} 4' in metrics
+    assert "nmrxiv_download_bytes_total 100" in metrics
+
+
+def test_cli_writes_trace_and_metrics(nmrxiv, tmp_path):
+    trace, metrics = tmp_path / "trace.json", tmp_path / "out" / "metrics.prom"
+    result = nmrxiv("--trace", str(trace), "--metrics", str(metrics), "show", "P1")
+    assert result.exit_code == 0, result.output
+    events = json.loads(trace.read_text())["traceEvents"]
+    names = {e["name"] for e in events}
+    assert {"api.request", "http.wait"} <= names
+    assert "nmrxiv_http_requests_total 1" in metrics.read_text()